@@ -0,0 +1,30 @@
+"""
+Preámbulo común de los scripts de diagnóstico.
+
+Agrega src al path una sola vez y expone la carga del tablero reutilizando
+la caché en disco del cargador.
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+SRC_DIR = str(Path(__file__).parent / 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from data_processing.excel_loader import load_and_process_excel_cached
+
+# Ruta al archivo Excel
+ARCHIVO_EXCEL = r"C:\Users\santi\TableroIndicadores\RE-SM-01 Tablero de Control de Indicadores 2025.xls"
+
+
+@lru_cache(maxsize=1)
+def cargar_datos():
+    """
+    Carga el tablero de indicadores una sola vez por proceso.
+    
+    Returns:
+        Tuple: (dataframe_procesado, lista_indicadores, resumen)
+    """
+    return load_and_process_excel_cached(ARCHIVO_EXCEL)
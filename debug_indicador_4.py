@@ -2,19 +2,13 @@
 Debug específico del indicador 4 (PQRS Vencidos)
 """
 
-import sys
-from pathlib import Path
 import pandas as pd
 import numpy as np
 
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
-
-from data_processing.excel_loader import load_and_process_excel
+from debug_common import cargar_datos
 from analysis.indicator_analyzer import IndicatorAnalyzer
 
-archivo_excel = r"C:\Users\santi\TableroIndicadores\RE-SM-01 Tablero de Control de Indicadores 2025.xls"
-
-df, indicadores, resumen = load_and_process_excel(archivo_excel)
+df, indicadores, resumen = cargar_datos()
 
 # Indicador 4 (index 3)
 ind = indicadores[3]
@@ -34,15 +28,10 @@ print(f"Promedio: {ind.get('promedio')}")
 analyzer = IndicatorAnalyzer()
 
 valores_mensuales = ind.get('valores_mensuales', {})
-ultimo_valor = None
-meses_orden = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-              'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
-
-for mes in reversed(meses_orden):
-    if mes in valores_mensuales and pd.notna(valores_mensuales[mes]):
-        ultimo_valor = valores_mensuales[mes]
-        print(f"\nÚltimo valor encontrado en {mes}: {ultimo_valor}")
-        break
+mes = ind.get('ultimo_mes')
+ultimo_valor = ind.get('ultimo_valor') if mes is not None else None
+if mes is not None:
+    print(f"\nÚltimo valor encontrado en {mes}: {ultimo_valor}")
 
 if ultimo_valor is None and valores_mensuales:
     valores_lista = [v for v in valores_mensuales.values() if pd.notna(v)]
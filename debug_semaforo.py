@@ -2,20 +2,14 @@
 Script para diagnosticar el problema de semaforización
 """
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
-
-from data_processing.excel_loader import load_and_process_excel
+from debug_common import cargar_datos
 from analysis.indicator_analyzer import analizar_todos_indicadores
-
-archivo_excel = r"C:\Users\santi\TableroIndicadores\RE-SM-01 Tablero de Control de Indicadores 2025.xls"
+from utils.helpers import contar_semaforos
 
 print("Cargando y analizando indicadores...")
 print("=" * 80)
 
-df, indicadores, resumen = load_and_process_excel(archivo_excel)
+df, indicadores, resumen = cargar_datos()
 analisis_list = analizar_todos_indicadores(indicadores)
 
 print(f"\nTotal de indicadores: {len(indicadores)}")
@@ -24,12 +18,11 @@ print("ANÁLISIS DE SEMAFORIZACIÓN:")
 print("=" * 80)
 
 # Contar por color
-conteo = {'Verde': 0, 'Amarillo': 0, 'Rojo': 0, 'Gris': 0}
-for anal in analisis_list:
-    conteo[anal['semaforo']] += 1
+conteo = contar_semaforos(analisis_list)
 
 print(f"\nDistribución de semáforos:")
-for color, cantidad in conteo.items():
+for color in ('Verde', 'Amarillo', 'Rojo', 'Gris'):
+    cantidad = conteo[color]
     porcentaje = (cantidad / len(analisis_list) * 100) if analisis_list else 0
     print(f"  {color}: {cantidad} ({porcentaje:.1f}%)")
 
@@ -50,15 +43,8 @@ for i in range(min(5, len(indicadores))):
     print(f"   Valores mensuales: {len(ind.get('valores_mensuales', {}))}")
     
     # Último valor
-    valores_mensuales = ind.get('valores_mensuales', {})
-    ultimo_valor = None
-    if valores_mensuales:
-        meses_orden = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-                      'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
-        for mes in reversed(meses_orden):
-            if mes in valores_mensuales:
-                ultimo_valor = valores_mensuales[mes]
-                print(f"   Último valor ({mes}): {ultimo_valor}")
-                break
+    mes = ind.get('ultimo_mes')
+    if mes is not None:
+        print(f"   Último valor ({mes}): {ind['ultimo_valor']}")
     
     print(f"   → SEMÁFORO: {anal['semaforo']}")
@@ -4,16 +4,17 @@ Script de ejemplo de uso del sistema.
 Demuestra las principales funcionalidades del sistema de indicadores MIPG.
 """
 
+import logging
 import sys
 from pathlib import Path
 
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from data_processing.excel_loader import load_and_process_excel
+from data_processing.excel_loader import load_and_process_excel_cached
 from analysis.indicator_analyzer import analizar_todos_indicadores, IndicatorAnalyzer
-from visualization.chart_generator import ChartGenerator
-from utils.helpers import format_percentage
+from visualization.chart_generator import ChartGenerator, guardar_graficos_concurrente
+from utils.helpers import format_percentage, contar_semaforos
 
 
 def ejemplo_basico():
@@ -25,7 +26,7 @@ def ejemplo_basico():
     # 1. Cargar datos
     print("\n1. Cargando datos del Excel...")
     archivo = "RE-SM-01 Tablero de Control de Indicadores 2025.xls"
-    df, indicadores, resumen = load_and_process_excel(archivo)
+    df, indicadores, resumen = load_and_process_excel_cached(archivo)
     
     print(f"   ✓ Indicadores cargados: {len(indicadores)}")
     print(f"   ✓ Dimensiones: {df.shape}")
@@ -38,9 +39,8 @@ def ejemplo_basico():
     
     # 3. Mostrar resumen
     print("\n3. Resumen de Estados:")
-    verdes = sum(1 for a in analisis if a.get('semaforo') == 'Verde')
-    amarillos = sum(1 for a in analisis if a.get('semaforo') == 'Amarillo')
-    rojos = sum(1 for a in analisis if a.get('semaforo') == 'Rojo')
+    conteo = contar_semaforos(analisis)
+    verdes, amarillos, rojos = conteo['Verde'], conteo['Amarillo'], conteo['Rojo']
     
     print(f"   🟢 Verde (Satisfactorio): {verdes}")
     print(f"   🟡 Amarillo (Alerta): {amarillos}")
@@ -88,11 +88,15 @@ def ejemplo_filtrado(indicadores, analisis):
     print("EJEMPLO: Filtrado de Indicadores")
     print("=" * 80)
     
-    # Filtrar indicadores críticos
-    print("\n🔴 Indicadores en Estado Crítico:")
-    criticos = [(ind, anal) for ind, anal in zip(indicadores, analisis) 
-                if anal['semaforo'] == 'Rojo']
+    # Filtrar indicadores críticos y en retroceso en un solo recorrido
+    criticos, retrocesos = [], []
+    for ind, anal in zip(indicadores, analisis):
+        if anal['semaforo'] == 'Rojo':
+            criticos.append((ind, anal))
+        if anal['tendencia'] == 'Retroceso':
+            retrocesos.append((ind, anal))
     
+    print("\n🔴 Indicadores en Estado Crítico:")
     if criticos:
         for ind, anal in criticos[:5]:  # Mostrar máximo 5
             print(f"   - {ind['nombre']}")
@@ -101,11 +105,7 @@ def ejemplo_filtrado(indicadores, analisis):
     else:
         print("   ✓ No hay indicadores en estado crítico")
     
-    # Filtrar por tendencia
     print("\n📉 Indicadores en Retroceso:")
-    retrocesos = [(ind, anal) for ind, anal in zip(indicadores, analisis) 
-                  if anal['tendencia'] == 'Retroceso']
-    
     if retrocesos:
         for ind, anal in retrocesos[:5]:
             print(f"   - {ind['nombre']}")
@@ -124,11 +124,7 @@ def ejemplo_generacion_grafico(indicadores, analisis):
     
     print("\n1. Generando gráfico de tendencia individual...")
     fig = generator.grafico_tendencia_indicador(indicadores[0], analisis[0])
-    
-    # Guardar
     ruta_salida = "output/charts/ejemplo_tendencia.html"
-    generator.guardar_grafico(fig, ruta_salida)
-    print(f"   ✓ Gráfico guardado en: {ruta_salida}")
     
     print("\n2. Generando gráfico comparativo...")
     fig_comp = generator.grafico_comparativo_indicadores(
@@ -136,17 +132,17 @@ def ejemplo_generacion_grafico(indicadores, analisis):
         analisis[:10], 
         top_n=10
     )
-    
     ruta_comp = "output/charts/ejemplo_comparativo.html"
-    generator.guardar_grafico(fig_comp, ruta_comp)
-    print(f"   ✓ Gráfico guardado en: {ruta_comp}")
     
     print("\n3. Generando gráfico de semaforización...")
     fig_sem = generator.grafico_semaforizacion_general(analisis)
-    
     ruta_sem = "output/charts/ejemplo_semaforo.html"
-    generator.guardar_grafico(fig_sem, ruta_sem)
-    print(f"   ✓ Gráfico guardado en: {ruta_sem}")
+    
+    # Guardar los tres gráficos a la vez
+    graficos = [(fig, ruta_salida), (fig_comp, ruta_comp), (fig_sem, ruta_sem)]
+    guardar_graficos_concurrente(generator, graficos)
+    for _, ruta in graficos:
+        print(f"   ✓ Gráfico guardado en: {ruta}")
 
 
 def ejemplo_analisis_personalizado():
@@ -208,36 +204,34 @@ def main():
     print("║" + " " * 15 + "Tablero de Control de Indicadores MIPG" + " " * 25 + "║")
     print("╚" + "=" * 78 + "╝")
     
-    try:
-        # Ejemplo 1: Básico
-        indicadores, analisis = ejemplo_basico()
-        
-        # Ejemplo 2: Indicador específico
-        ejemplo_indicador_especifico(indicadores, analisis)
-        
-        # Ejemplo 3: Filtrado
-        ejemplo_filtrado(indicadores, analisis)
-        
-        # Ejemplo 4: Generación de gráficos
-        ejemplo_generacion_grafico(indicadores, analisis)
-        
-        # Ejemplo 5: Análisis personalizado
-        ejemplo_analisis_personalizado()
-        
-        print("\n" + "=" * 80)
-        print("✅ EJEMPLOS COMPLETADOS EXITOSAMENTE")
-        print("=" * 80)
-        print("\nRevise los archivos generados en:")
-        print("  - output/charts/ejemplo_*.html")
-        print("\nPara ver el dashboard interactivo, ejecute:")
-        print("  streamlit run src/dashboard.py")
-        print("=" * 80 + "\n")
-        
-    except Exception as e:
-        print(f"\n❌ Error durante la ejecución de ejemplos: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    # Ejemplo 1: Básico
+    indicadores, analisis = ejemplo_basico()
+    
+    # Ejemplo 2: Indicador específico
+    ejemplo_indicador_especifico(indicadores, analisis)
+    
+    # Ejemplo 3: Filtrado
+    ejemplo_filtrado(indicadores, analisis)
+    
+    # Ejemplo 4: Generación de gráficos
+    ejemplo_generacion_grafico(indicadores, analisis)
+    
+    # Ejemplo 5: Análisis personalizado
+    ejemplo_analisis_personalizado()
+    
+    print("\n" + "=" * 80)
+    print("✅ EJEMPLOS COMPLETADOS EXITOSAMENTE")
+    print("=" * 80)
+    print("\nRevise los archivos generados en:")
+    print("  - output/charts/ejemplo_*.html")
+    print("\nPara ver el dashboard interactivo, ejecute:")
+    print("  streamlit run src/dashboard.py")
+    print("=" * 80 + "\n")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except Exception:
+        logging.exception("❌ Error durante la ejecución de ejemplos")
+        sys.exit(1)
@@ -2,16 +2,18 @@
 Script para inspeccionar el archivo de batería de indicadores sectoriales
 """
 
-import pandas as pd
+from itertools import islice
+
+from openpyxl import load_workbook
 
 archivo = r"C:\Users\santi\TableroIndicadores\63721_bateria-indicadores-sectoriales.xlsx"
 
 print("Analizando archivo de batería de indicadores...")
 print("=" * 80)
 
-# Obtener todas las hojas
-xl_file = pd.ExcelFile(archivo)
-hojas = xl_file.sheet_names
+# Abrir en modo solo lectura: las filas se leen bajo demanda, sin cargar el libro completo
+wb = load_workbook(archivo, read_only=True, data_only=True)
+hojas = wb.sheetnames
 
 print(f"\n✅ Archivo encontrado con {len(hojas)} hojas\n")
 print("=" * 80)
@@ -31,15 +33,16 @@ for hoja in hojas:
     print('='*80)
     
     try:
-        # Leer sin encabezados para ver la estructura
-        df = pd.read_excel(archivo, sheet_name=hoja, header=None, nrows=10)
+        # Leer solo las primeras filas, sin encabezados, para ver la estructura
+        filas = list(islice(wb[hoja].iter_rows(values_only=True), 10))
+        num_columnas = max((len(fila) for fila in filas), default=0)
         
-        print(f"Dimensiones: {df.shape[0]} filas × {df.shape[1]} columnas")
+        print(f"Dimensiones: {len(filas)} filas × {num_columnas} columnas")
         print("\nPrimeras 5 filas:")
         
-        for i in range(min(5, len(df))):
+        for i in range(min(5, len(filas))):
             print(f"\nFila {i}:")
-            valores = df.iloc[i].tolist()
+            valores = list(filas[i])
             # Mostrar solo primeros 5 valores para no saturar
             print(valores[:min(5, len(valores))])
             if len(valores) > 5:
@@ -48,6 +51,8 @@ for hoja in hojas:
     except Exception as e:
         print(f"Error al leer hoja: {e}")
 
+wb.close()
+
 print("\n" + "=" * 80)
 print("ANÁLISIS COMPLETO")
 print("=" * 80)
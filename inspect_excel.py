@@ -4,31 +4,41 @@ Script para inspeccionar las primeras filas del Excel y encontrar los encabezado
 
 import pandas as pd
 
-archivo_excel = r"C:\Users\santi\TableroIndicadores\RE-SM-01 Tablero de Control de Indicadores 2025.xls"
+from debug_common import ARCHIVO_EXCEL as archivo_excel
+from data_processing.excel_loader import find_header_row, save_header_row
 
 print("Leyendo archivo sin procesar...")
 print("=" * 80)
 
-# Leer sin asumir encabezados
-df_raw = pd.read_excel(archivo_excel, header=None, engine='xlrd')
+# Leer sin asumir encabezados; solo se necesitan las primeras filas
+df_raw = pd.read_excel(archivo_excel, header=None, engine='xlrd', nrows=15)
 
 print(f"Dimensiones: {df_raw.shape}")
+
+# Matriz de objetos creada una sola vez; las filas se recorren sin construir Series
+filas = df_raw.to_numpy(dtype=object)
 print("\nPrimeras 10 filas del archivo:")
 print("=" * 80)
 
-for i in range(min(10, len(df_raw))):
+for i, fila in enumerate(filas[:10]):
     print(f"\nFila {i}:")
-    print(df_raw.iloc[i].tolist())
+    print(fila.tolist())
 
 print("\n" + "=" * 80)
 print("Buscando fila con encabezados...")
 print("=" * 80)
 
 # Buscar la fila que tiene "Nombre del Indicador" o similar
-for i in range(min(15, len(df_raw))):
-    row_values = df_raw.iloc[i].astype(str).tolist()
-    row_text = ' '.join(row_values).lower()
+claves = ('indicador', 'meta', 'enero')
+for i, fila in enumerate(filas[:15]):
+    row_text = ' '.join(str(val) for val in fila).lower()
     
-    if 'indicador' in row_text or 'meta' in row_text or 'enero' in row_text:
+    if any(clave in row_text for clave in claves):
         print(f"\n✅ Posible fila de encabezados encontrada en fila {i}:")
-        print(df_raw.iloc[i].tolist())
+        print(fila.tolist())
+
+# Guardar la fila detectada para que el cargador no tenga que volver a buscarla
+header_row = find_header_row(df_raw)
+if header_row is not None:
+    save_header_row(archivo_excel, header_row)
+    print(f"\nFila de encabezados {header_row} guardada en caché")
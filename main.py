@@ -14,18 +14,21 @@ Uso:
 
 import sys
 import os
+import json
 import logging
+from datetime import date
 from pathlib import Path
 
 # Agregar src al path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from data_processing.excel_loader import load_and_process_excel
+from data_processing.excel_loader import load_and_process_excel_cached
 from analysis.indicator_analyzer import analizar_todos_indicadores
 from visualization.chart_generator import generar_todos_graficos
 from reporting.report_generator import generar_informe_pdf
 from utils.config import *
-from utils.helpers import create_output_filename
+from utils.helpers import create_output_filename, contar_semaforos
+from utils.cache import payload_digest
 
 # Configuración de logging
 logging.basicConfig(
@@ -39,16 +42,53 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+SEPARADOR = "=" * 80
+
+# Registro del último informe generado (hash del contenido y ruta del PDF)
+REGISTRO_ULTIMO_INFORME = Path(REPORTS_DIR) / 'ultimo_informe.json'
+
+# Módulos de los que depende el contenido del informe (textos de portada, meses, configuración)
+MODULOS_INFORME = ('reporting.report_generator', 'utils.helpers', 'utils.config')
+
+
+def _digest_informe(indicadores_list, analisis_list) -> str:
+    """
+    Calcula el hash de todo lo que determina el contenido del informe PDF.
+    
+    Se excluye la marca de tiempo de cada análisis y se incluyen la fecha del día
+    (aparece en la portada) y la versión de los módulos que arman el informe.
+    """
+    analisis_sin_marca = [
+        {k: v for k, v in analisis.items() if k != 'ultima_actualizacion'}
+        for analisis in analisis_list
+    ]
+    versiones = [os.path.getmtime(sys.modules[modulo].__file__) for modulo in MODULOS_INFORME]
+    return payload_digest(
+        indicadores_list, analisis_sin_marca, ENTITY_NAME, date.today().isoformat(), versiones
+    )
+
+
+def _informe_previo(digest: str):
+    """Retorna la ruta del último informe si fue generado con el mismo contenido y aún existe."""
+    try:
+        registro = json.loads(REGISTRO_ULTIMO_INFORME.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    
+    if registro.get('digest') == digest and os.path.exists(registro.get('ruta', '')):
+        return registro['ruta']
+    return None
+
 
 def main():
     """
     Función principal del sistema.
     Ejecuta el flujo completo de análisis de indicadores.
     """
-    logger.info("=" * 80)
+    logger.info(SEPARADOR)
     logger.info("SISTEMA DE TABLERO DE CONTROL DE INDICADORES MIPG")
     logger.info("Secretaría de Planeación")
-    logger.info("=" * 80)
+    logger.info(SEPARADOR)
     
     try:
         # 1. CARGA DE DATOS
@@ -57,30 +97,30 @@ def main():
         archivo_excel = DEFAULT_EXCEL_FILE
         
         if not os.path.exists(archivo_excel):
-            logger.error(f"No se encontró el archivo: {archivo_excel}")
+            logger.error("No se encontró el archivo: %s", archivo_excel)
             logger.error("Por favor, coloque el archivo Excel en el directorio raíz del proyecto.")
             return False
         
-        df_procesado, indicadores_list, resumen = load_and_process_excel(archivo_excel)
+        df_procesado, indicadores_list, resumen = load_and_process_excel_cached(archivo_excel)
         
-        logger.info(f"✓ Datos cargados exitosamente")
-        logger.info(f"  - Total indicadores procesados: {len(indicadores_list)}")
-        logger.info(f"  - Dimensiones DataFrame: {df_procesado.shape}")
+        logger.info("✓ Datos cargados exitosamente")
+        logger.info("  - Total indicadores procesados: %d", len(indicadores_list))
+        logger.info("  - Dimensiones DataFrame: %s", df_procesado.shape)
         
         # 2. ANÁLISIS DE INDICADORES
         logger.info("\n[PASO 2/5] Analizando indicadores...")
         
-        analisis_list = analizar_todos_indicadores(indicadores_list)
+        # El informe no usa el texto de interpretación
+        analisis_list = analizar_todos_indicadores(indicadores_list, incluir_interpretacion=False)
         
         # Estadísticas del análisis
-        verdes = sum(1 for a in analisis_list if a.get('semaforo') == 'Verde')
-        amarillos = sum(1 for a in analisis_list if a.get('semaforo') == 'Amarillo')
-        rojos = sum(1 for a in analisis_list if a.get('semaforo') == 'Rojo')
+        conteo = contar_semaforos(analisis_list)
+        verdes, amarillos, rojos = conteo['Verde'], conteo['Amarillo'], conteo['Rojo']
         
-        logger.info(f"✓ Análisis completado")
-        logger.info(f"  - Indicadores en estado satisfactorio (Verde): {verdes}")
-        logger.info(f"  - Indicadores en estado alerta (Amarillo): {amarillos}")
-        logger.info(f"  - Indicadores en estado crítico (Rojo): {rojos}")
+        logger.info("✓ Análisis completado")
+        logger.info("  - Indicadores en estado satisfactorio (Verde): %d", verdes)
+        logger.info("  - Indicadores en estado alerta (Amarillo): %d", amarillos)
+        logger.info("  - Indicadores en estado crítico (Rojo): %d", rojos)
         
         # 3. GENERACIÓN DE GRÁFICOS
         logger.info("\n[PASO 3/5] Generando gráficos...")
@@ -94,9 +134,10 @@ def main():
             str(CHARTS_DIR)
         )
         
-        logger.info(f"✓ Gráficos generados: {len(rutas_graficos)}")
-        for nombre, ruta in rutas_graficos.items():
-            logger.info(f"  - {nombre}: {ruta}")
+        logger.info("✓ Gráficos generados: %d", len(rutas_graficos))
+        if logger.isEnabledFor(logging.INFO):
+            for nombre, ruta in rutas_graficos.items():
+                logger.info("  - %s: %s", nombre, ruta)
         
         # 4. GENERACIÓN DE REPORTE PDF
         logger.info("\n[PASO 4/5] Generando informe PDF...")
@@ -104,39 +145,51 @@ def main():
         # Crear directorio si no existe
         os.makedirs(REPORTS_DIR, exist_ok=True)
         
-        nombre_reporte = create_output_filename('Informe_Indicadores_MIPG', 'pdf')
-        ruta_reporte = os.path.join(REPORTS_DIR, nombre_reporte)
-        
-        exito_pdf = generar_informe_pdf(
-            indicadores_list,
-            analisis_list,
-            ruta_reporte,
-            entidad=ENTITY_NAME
-        )
+        digest = _digest_informe(indicadores_list, analisis_list)
+        ruta_previa = _informe_previo(digest)
         
-        if exito_pdf:
-            logger.info(f"✓ Reporte PDF generado: {ruta_reporte}")
+        if ruta_previa:
+            # Mismo contenido que el último informe: no se vuelve a generar
+            ruta_reporte = ruta_previa
+            exito_pdf = True
+            logger.info("✓ Sin cambios desde el último informe, se reutiliza: %s", ruta_reporte)
         else:
-            logger.warning("⚠ No se pudo generar el reporte PDF")
+            nombre_reporte = create_output_filename('Informe_Indicadores_MIPG', 'pdf')
+            ruta_reporte = os.path.join(REPORTS_DIR, nombre_reporte)
+            
+            # None si el PDF no se pudo construir (y entonces no se escribe el archivo)
+            exito_pdf = generar_informe_pdf(
+                indicadores_list,
+                analisis_list,
+                ruta_reporte,
+                entidad=ENTITY_NAME
+            ) is not None
+            
+            if exito_pdf:
+                REGISTRO_ULTIMO_INFORME.write_text(
+                    json.dumps({'digest': digest, 'ruta': ruta_reporte}), encoding='utf-8'
+                )
+                logger.info("✓ Reporte PDF generado: %s", ruta_reporte)
+            else:
+                logger.warning("⚠ No se pudo generar el reporte PDF")
         
         # 5. RESUMEN FINAL
         logger.info("\n[PASO 5/5] Proceso completado exitosamente")
-        logger.info("\n" + "=" * 80)
+        logger.info("\n%s", SEPARADOR)
         logger.info("RESUMEN DE EJECUCIÓN")
-        logger.info("=" * 80)
-        logger.info(f"✓ Indicadores analizados: {len(indicadores_list)}")
-        logger.info(f"✓ Gráficos generados: {len(rutas_graficos)}")
-        logger.info(f"✓ Reporte PDF: {ruta_reporte if exito_pdf else 'No generado'}")
-        logger.info("=" * 80)
+        logger.info(SEPARADOR)
+        logger.info("✓ Indicadores analizados: %d", len(indicadores_list))
+        logger.info("✓ Gráficos generados: %d", len(rutas_graficos))
+        logger.info("✓ Reporte PDF: %s", ruta_reporte if exito_pdf else 'No generado')
+        logger.info(SEPARADOR)
         
         logger.info("\nPara visualizar el dashboard interactivo, ejecute:")
         logger.info("  streamlit run src/dashboard.py")
         
         return True
         
-    except Exception as e:
-        logger.error(f"\n❌ Error durante la ejecución: {str(e)}")
-        logger.exception("Detalles del error:")
+    except Exception:
+        logger.exception("\n❌ Error durante la ejecución")
         return False
 
 
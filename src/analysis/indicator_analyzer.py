@@ -12,12 +12,16 @@ Implementa:
 - Semaforización automática
 """
 
-import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
+from math import isnan
+from bisect import bisect_left
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,520 @@ class TendenciaIndicador(Enum):
     INSUFICIENTE = "Datos Insuficientes"
 
 
+# Texto de cada miembro de las enumeraciones (evita el descriptor .value en cada análisis)
+_VALOR_ENUM = {
+    miembro: miembro.value
+    for enumeracion in (Periodicidad, EstadoSemaforo, TendenciaIndicador)
+    for miembro in enumeracion
+}
+
+# Fragmentos fijos de la interpretación textual, armados una sola vez
+_PERIODICIDAD_MINUSCULA = {periodicidad: _VALOR_ENUM[periodicidad].lower() for periodicidad in Periodicidad}
+
+_TEXTO_TENDENCIA = {
+    TendenciaIndicador.CRECIMIENTO: "Se observa una tendencia de crecimiento positivo en los valores registrados.",
+    TendenciaIndicador.RETROCESO: "Se identifica una tendencia de retroceso que requiere atención.",
+    TendenciaIndicador.ESTABILIDAD: "Los valores se mantienen estables a lo largo del período analizado.",
+    TendenciaIndicador.VOLATIL: "Se presenta alta variabilidad en los valores, indicando comportamiento volátil."
+}
+
+_TEXTO_SEMAFORO = {
+    EstadoSemaforo.VERDE: "El estado actual es SATISFACTORIO, cumpliendo con las metas establecidas.",
+    EstadoSemaforo.AMARILLO: "El estado actual es ACEPTABLE, pero requiere seguimiento para evitar deterioro.",
+    EstadoSemaforo.ROJO: "El estado actual es CRÍTICO, no cumpliendo con los niveles mínimos esperados."
+}
+
+
+def _kernel_estadisticas(valores: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """
+    Núcleo numérico de las estadísticas descriptivas.
+    
+    Args:
+        valores (np.ndarray): Valores válidos (float64, sin NaN, al menos uno)
+        
+    Returns:
+        Tuple: (promedio, mediana, desviacion_estandar, minimo, maximo)
+    """
+    n = valores.size
+    promedio = valores.sum() / n
+    desvios = valores - promedio
+    desviacion = np.sqrt(desvios @ desvios / n)
+    
+    # Mediana por selección parcial (O(n)) en lugar de ordenar todo el arreglo
+    mitad = n // 2
+    if n % 2:
+        mediana = np.partition(valores, mitad)[mitad]
+    else:
+        parcial = np.partition(valores, (mitad - 1, mitad))
+        mediana = (parcial[mitad - 1] + parcial[mitad]) / 2
+    
+    return promedio, mediana, desviacion, valores.min(), valores.max()
+
+
+def _kernel_tendencia(valores: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Núcleo numérico del análisis de tendencia.
+    
+    Args:
+        valores (np.ndarray): Valores ordenados cronológicamente (float64, al menos dos)
+        
+    Returns:
+        Tuple: (pendiente de la regresión lineal, desviacion_estandar, promedio)
+    """
+    n = valores.size
+    
+    # Regresión lineal y = mx + b en forma cerrada: con x = 0..n-1 las sumas
+    # de x y x² son conocidas, así que no hace falta np.polyfit (lstsq/SVD)
+    suma_x = n * (n - 1) / 2
+    suma_x2 = (n - 1) * n * (2 * n - 1) / 6
+    suma_y = valores.sum()
+    suma_xy = np.arange(n) @ valores
+    pendiente = (n * suma_xy - suma_x * suma_y) / (n * suma_x2 - suma_x * suma_x)
+    
+    # La desviación reutiliza el promedio ya calculado (np.std lo volvería a calcular)
+    promedio = suma_y / n
+    desvios = valores - promedio
+    
+    return pendiente, np.sqrt(desvios @ desvios / n), promedio
+
+
+def _kernel_lote_estadisticas(matriz: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Estadísticas descriptivas por fila de una matriz (una fila por indicador).
+    
+    Args:
+        matriz (np.ndarray): Matriz (N, K) float64; los huecos se rellenan con NaN
+        
+    Returns:
+        Tuple: Arreglos de longitud N (conteo, promedio, mediana, desviacion_estandar,
+        minimo, maximo); NaN en las filas sin datos
+    """
+    mascara = ~np.isnan(matriz)
+    conteo = mascara.sum(axis=1)
+    vacias = conteo == 0
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        promedio = np.where(mascara, matriz, 0.0).sum(axis=1) / conteo
+        desvios = np.where(mascara, matriz - promedio[:, None], 0.0)
+        desviacion = np.sqrt((desvios * desvios).sum(axis=1) / conteo)
+    
+    # np.sort deja los NaN al final: la mediana sale de las posiciones centrales válidas
+    ordenada = np.sort(matriz, axis=1)
+    bajo = np.maximum((conteo - 1) // 2, 0)
+    alto = conteo // 2
+    mediana = (
+        np.take_along_axis(ordenada, bajo[:, None], axis=1)[:, 0] +
+        np.take_along_axis(ordenada, np.minimum(alto, matriz.shape[1] - 1)[:, None], axis=1)[:, 0]
+    ) / 2
+    
+    minimo = np.where(mascara, matriz, np.inf).min(axis=1)
+    maximo = np.where(mascara, matriz, -np.inf).max(axis=1)
+    
+    mediana[vacias] = np.nan
+    minimo[vacias] = np.nan
+    maximo[vacias] = np.nan
+    
+    return conteo, promedio, mediana, desviacion, minimo, maximo
+
+
+def _kernel_lote_tendencia(matriz: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Pendiente de la regresión lineal por fila, sobre los valores válidos en orden.
+    
+    Igual que _kernel_tendencia, x es la posición del valor entre los datos
+    disponibles (0, 1, 2, ...), no el número de mes.
+    
+    Args:
+        matriz (np.ndarray): Matriz (N, 12) float64 alineada con los meses
+        
+    Returns:
+        Tuple: Arreglos de longitud N (conteo, pendiente, desviacion_estandar, promedio)
+    """
+    conteo, promedio, _, desviacion, _, _ = _kernel_lote_estadisticas(matriz)
+    
+    mascara = ~np.isnan(matriz)
+    x = np.cumsum(mascara, axis=1) - 1
+    y = np.where(mascara, matriz, 0.0)
+    
+    # Mínimos cuadrados en forma cerrada: sumas de x y x² conocidas para x = 0..n-1
+    n = conteo.astype(np.float64)
+    suma_x = n * (n - 1) / 2
+    suma_x2 = (n - 1) * n * (2 * n - 1) / 6
+    suma_y = y.sum(axis=1)
+    suma_xy = np.where(mascara, x * y, 0.0).sum(axis=1)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pendiente = (n * suma_xy - suma_x * suma_y) / (n * suma_x2 - suma_x * suma_x)
+    
+    return conteo, pendiente, desviacion, promedio
+
+
+def _marca_tiempo() -> str:
+    """Fecha y hora actual con el formato de 'ultima_actualizacion'."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _es_nulo(valor) -> bool:
+    """Indica si un valor escalar falta (None o NaN), sin pasar por pd.isna."""
+    return valor is None or (isinstance(valor, float) and isnan(valor))
+
+
+# Anomalías del lote en formato columnar: una fila por valor atípico
+_DTYPE_ANOMALIA = np.dtype([
+    ('fila', np.int64),
+    ('columna', np.int64),
+    ('valor', np.float64),
+    ('z_score', np.float64),
+    ('desviacion_porcentual', np.float64)
+])
+
+
+def _kernel_lote_anomalias(
+    matriz: np.ndarray,
+    conteo: np.ndarray,
+    promedio: np.ndarray,
+    desviacion: np.ndarray
+) -> np.ndarray:
+    """
+    Detecta por Z-score los valores atípicos de todas las filas a la vez.
+    
+    Args:
+        matriz (np.ndarray): Matriz (N, K) float64 con NaN en los huecos
+        conteo, promedio, desviacion (np.ndarray): Resultados de _kernel_lote_estadisticas
+        
+    Returns:
+        np.ndarray: Arreglo estructurado (_DTYPE_ANOMALIA) ordenado por fila y columna
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_scores = (matriz - promedio[:, None]) / desviacion[:, None]
+        # Solo filas con al menos 3 datos y con variabilidad
+        atipicos = (np.abs(z_scores) > 2.5) & ((conteo >= 3) & (desviacion != 0))[:, None]
+        filas, columnas = np.nonzero(atipicos)
+        
+        anomalias = np.empty(filas.size, dtype=_DTYPE_ANOMALIA)
+        anomalias['fila'] = filas
+        anomalias['columna'] = columnas
+        anomalias['valor'] = matriz[filas, columnas]
+        anomalias['z_score'] = z_scores[filas, columnas]
+        anomalias['desviacion_porcentual'] = (
+            (anomalias['valor'] - promedio[filas]) / promedio[filas] * 100
+        )
+    
+    return anomalias
+
+
+def _clave_semaforo(valor):
+    """Normaliza un valor para usarlo como clave de caché (NaN no es igual a sí mismo)."""
+    return None if _es_nulo(valor) else valor
+
+
+@lru_cache(maxsize=4096)
+def _semaforo_cached(
+    valor_actual: Optional[float],
+    meta: Optional[float],
+    nivel_satisfactorio: Optional[float],
+    nivel_critico: Optional[float],
+    nivel_obtenido: Optional[float]
+) -> EstadoSemaforo:
+    """
+    Regla de semaforización memorizada por combinación de valores.
+    
+    Los valores faltantes llegan como None (ver _clave_semaforo); la lógica
+    se documenta en IndicatorAnalyzer.calcular_semaforo.
+    """
+    # Si no hay valor actual, devolver gris
+    if valor_actual is None:
+        return EstadoSemaforo.GRIS
+    
+    # Si no hay meta ni nivel_obtenido, usar valor actual vs 100%
+    if meta is None and nivel_obtenido is None:
+        # Clasificar por magnitud del valor actual
+        if valor_actual >= 80:
+            return EstadoSemaforo.VERDE
+        elif valor_actual >= 60:
+            return EstadoSemaforo.AMARILLO
+        else:
+            return EstadoSemaforo.ROJO
+    
+    # Determinar si es un indicador invertido (menor es mejor)
+    # Ejemplos: PQRS Vencidos, Ausentismo, Accidentalidad, etc.
+    es_invertido = False
+    if meta is not None and nivel_critico is not None:
+        es_invertido = nivel_critico > meta  # Si el nivel crítico es mayor que la meta, es invertido
+    
+    # Si no hay niveles definidos, usar valores de meta o nivel_obtenido
+    if nivel_satisfactorio is None:
+        if nivel_obtenido is not None:
+            nivel_satisfactorio = nivel_obtenido
+        elif meta is not None:
+            nivel_satisfactorio = meta
+        else:
+            nivel_satisfactorio = 0.80  # 80% como valor por defecto
+    
+    if nivel_critico is None:
+        if meta is not None:
+            if es_invertido:
+                nivel_critico = meta * 1.25  # 125% de la meta (peor)
+            else:
+                nivel_critico = meta * 0.75  # 75% de la meta
+        else:
+            if es_invertido:
+                nivel_critico = nivel_satisfactorio * 1.25
+            else:
+                nivel_critico = nivel_satisfactorio * 0.75
+    
+    # Normalizar valores si están en diferentes escalas
+    # Si la meta o niveles están en rango 0-1 y el valor actual está en 0-100, convertir
+    if valor_actual > 1 and nivel_satisfactorio <= 1:
+        valor_actual = valor_actual / 100
+    # Si el valor actual está en 0-1 y los niveles están en 0-100, convertir niveles
+    elif valor_actual <= 1 and nivel_satisfactorio > 1:
+        nivel_satisfactorio = nivel_satisfactorio / 100
+        nivel_critico = nivel_critico / 100 if nivel_critico is not None else nivel_critico
+    
+    # Determinar estado según si es indicador normal o invertido
+    if es_invertido:
+        # Para indicadores invertidos (menor es mejor): PQRS Vencidos, Ausentismo, etc.
+        if valor_actual <= nivel_satisfactorio:
+            return EstadoSemaforo.VERDE
+        elif valor_actual <= nivel_critico:
+            return EstadoSemaforo.AMARILLO
+        else:
+            return EstadoSemaforo.ROJO
+    else:
+        # Para indicadores normales (mayor es mejor)
+        if valor_actual >= nivel_satisfactorio:
+            return EstadoSemaforo.VERDE
+        elif valor_actual >= nivel_critico:
+            return EstadoSemaforo.AMARILLO
+        else:
+            return EstadoSemaforo.ROJO
+
+
+# Límites superiores (inclusivos) del intervalo promedio para cada periodicidad;
+# lo que supera el último límite es anual
+_LIMITES_INTERVALO = (1.5, 2.5, 3.5, 5, 7)
+_PERIODICIDAD_POR_INTERVALO = (
+    Periodicidad.MENSUAL,
+    Periodicidad.BIMESTRAL,
+    Periodicidad.TRIMESTRAL,
+    Periodicidad.CUATRIMESTRAL,
+    Periodicidad.SEMESTRAL,
+    Periodicidad.ANUAL,
+)
+
+
+def _periodicidad_por_intervalo(intervalo_promedio: float) -> Periodicidad:
+    """
+    Clasifica la periodicidad según el intervalo promedio (en meses) entre mediciones.
+    
+    Args:
+        intervalo_promedio (float): Separación promedio entre meses con datos
+        
+    Returns:
+        Periodicidad: Tipo de periodicidad identificada
+    """
+    return _PERIODICIDAD_POR_INTERVALO[bisect_left(_LIMITES_INTERVALO, intervalo_promedio)]
+
+
+def _periodicidad_por_conteo(meses_con_datos: int) -> Periodicidad:
+    """
+    Clasifica la periodicidad por la cantidad de valores cuando solo hay un mes con datos.
+    
+    Args:
+        meses_con_datos (int): Total de valores no nulos del indicador
+        
+    Returns:
+        Periodicidad: Tipo de periodicidad identificada
+    """
+    if meses_con_datos == 12:
+        return Periodicidad.MENSUAL
+    elif meses_con_datos == 6:
+        return Periodicidad.BIMESTRAL
+    elif meses_con_datos == 4:
+        return Periodicidad.TRIMESTRAL
+    elif meses_con_datos == 3:
+        return Periodicidad.CUATRIMESTRAL
+    elif meses_con_datos == 2:
+        return Periodicidad.SEMESTRAL
+    elif meses_con_datos == 1:
+        return Periodicidad.ANUAL
+    else:
+        return Periodicidad.INDETERMINADA
+
+
+def _construir_tabla_periodicidad() -> Tuple[Optional[Periodicidad], ...]:
+    """
+    Precalcula la periodicidad para cada combinación de meses con datos.
+    
+    El índice es una máscara de 12 bits (bit i = mes i con dato). Las máscaras
+    con un solo mes quedan en None porque dependen del conteo total de valores
+    (ver _periodicidad_por_conteo).
+    
+    Returns:
+        Tuple: 4096 entradas indexadas por máscara
+    """
+    tabla = [Periodicidad.INDETERMINADA]
+    # Meses con dato por máscara: los de la máscara desplazada un bit más el bit 0
+    cantidades = [0] * (1 << 12)
+    for mascara in range(1, 1 << 12):
+        cantidad = cantidades[mascara >> 1] + (mascara & 1)
+        cantidades[mascara] = cantidad
+        if cantidad == 1:
+            tabla.append(None)
+            continue
+        # El promedio de los intervalos es (último - primero) / (cantidad - 1)
+        primero = (mascara & -mascara).bit_length() - 1
+        ultimo = mascara.bit_length() - 1
+        tabla.append(_periodicidad_por_intervalo((ultimo - primero) / (cantidad - 1)))
+    return tuple(tabla)
+
+
+_PERIODICIDAD_POR_MASCARA = _construir_tabla_periodicidad()
+
+
+def _periodicidad_desde_mascara(mascara: int, meses_con_datos: int) -> Periodicidad:
+    """
+    Obtiene la periodicidad de la tabla precalculada.
+    
+    Args:
+        mascara (int): Máscara de 12 bits de los meses con datos
+        meses_con_datos (int): Total de valores no nulos del indicador
+        
+    Returns:
+        Periodicidad: Tipo de periodicidad identificada
+    """
+    periodicidad = _PERIODICIDAD_POR_MASCARA[mascara]
+    if periodicidad is None:
+        periodicidad = _periodicidad_por_conteo(meses_con_datos)
+    return periodicidad
+
+
+def _dict_estadisticas(
+    total: int,
+    promedio: float = np.nan,
+    mediana: float = np.nan,
+    desviacion: float = np.nan,
+    minimo: float = np.nan,
+    maximo: float = np.nan
+) -> Dict:
+    """
+    Arma el diccionario de estadísticas descriptivas de un indicador.
+    
+    Args:
+        total (int): Cantidad de valores válidos (0 si no hay datos)
+        promedio, mediana, desviacion, minimo, maximo (float): Resultados del núcleo numérico
+        
+    Returns:
+        Dict: Diccionario con estadísticas calculadas (NaN si no hay datos)
+    """
+    if total == 0:
+        return {
+            'promedio': np.nan,
+            'mediana': np.nan,
+            'desviacion_estandar': np.nan,
+            'minimo': np.nan,
+            'maximo': np.nan,
+            'rango': np.nan,
+            'coeficiente_variacion': np.nan,
+            'total_periodos': 0
+        }
+    
+    return {
+        'promedio': promedio,
+        'mediana': mediana,
+        'desviacion_estandar': desviacion,
+        'minimo': minimo,
+        'maximo': maximo,
+        'rango': maximo - minimo,
+        'coeficiente_variacion': (desviacion / promedio * 100) if promedio != 0 else 0,
+        'total_periodos': total
+    }
+
+
+# Estados indexados por el código que devuelve la semaforización vectorizada
+_ESTADOS_SEMAFORO = np.array(
+    [EstadoSemaforo.VERDE, EstadoSemaforo.AMARILLO, EstadoSemaforo.ROJO, EstadoSemaforo.GRIS],
+    dtype=object
+)
+
+
+def calcular_semaforo_lote(
+    valor_actual,
+    meta,
+    nivel_satisfactorio=None,
+    nivel_critico=None,
+    nivel_obtenido=None
+) -> np.ndarray:
+    """
+    Calcula el semáforo de muchos indicadores a la vez.
+    
+    Aplica la misma lógica que IndicatorAnalyzer.calcular_semaforo sobre arreglos
+    alineados (un elemento por indicador, NaN para los valores faltantes).
+    
+    Args:
+        valor_actual (array-like): Valor actual de cada indicador
+        meta (array-like): Meta de cada indicador
+        nivel_satisfactorio (array-like, optional): Umbral para verde
+        nivel_critico (array-like, optional): Umbral para rojo
+        nivel_obtenido (array-like, optional): Alternativa para nivel_satisfactorio
+        
+    Returns:
+        np.ndarray: Arreglo de EstadoSemaforo (dtype object)
+    """
+    valor = np.asarray(valor_actual, dtype=np.float64)
+    
+    def _arreglo(datos):
+        return np.full(valor.shape, np.nan) if datos is None else np.asarray(datos, dtype=np.float64)
+    
+    meta = _arreglo(meta)
+    satisfactorio = _arreglo(nivel_satisfactorio)
+    critico = _arreglo(nivel_critico)
+    obtenido = _arreglo(nivel_obtenido)
+    
+    hay_meta = ~np.isnan(meta)
+    hay_critico = ~np.isnan(critico)
+    hay_obtenido = ~np.isnan(obtenido)
+    
+    # Indicador invertido (menor es mejor): nivel crítico mayor que la meta
+    invertido = hay_meta & hay_critico & (critico > meta)
+    
+    # Niveles por defecto cuando no están definidos
+    satisfactorio = np.where(
+        np.isnan(satisfactorio),
+        np.where(hay_obtenido, obtenido, np.where(hay_meta, meta, 0.80)),
+        satisfactorio
+    )
+    critico = np.where(
+        hay_critico,
+        critico,
+        np.where(hay_meta, meta, satisfactorio) * np.where(invertido, 1.25, 0.75)
+    )
+    
+    # Normalizar escalas (0-1 frente a 0-100)
+    a_fraccion = (valor > 1) & (satisfactorio <= 1)
+    a_niveles = (valor <= 1) & (satisfactorio > 1)
+    valor_escalado = np.where(a_fraccion, valor / 100, valor)
+    satisfactorio = np.where(a_niveles, satisfactorio / 100, satisfactorio)
+    critico = np.where(a_niveles, critico / 100, critico)
+    
+    # 0 = verde, 1 = amarillo, 2 = rojo, 3 = gris
+    codigo = np.where(
+        invertido,
+        np.where(valor_escalado <= satisfactorio, 0, np.where(valor_escalado <= critico, 1, 2)),
+        np.where(valor_escalado >= satisfactorio, 0, np.where(valor_escalado >= critico, 1, 2))
+    )
+    # Sin meta ni nivel obtenido: escala fija sobre el valor original
+    codigo = np.where(
+        ~hay_meta & ~hay_obtenido,
+        np.where(valor >= 80, 0, np.where(valor >= 60, 1, 2)),
+        codigo
+    )
+    codigo = np.where(np.isnan(valor), 3, codigo)
+    
+    return _ESTADOS_SEMAFORO[codigo]
+
+
 class IndicatorAnalyzer:
     """
     Clase para análisis avanzado de indicadores MIPG.
@@ -64,6 +582,8 @@ class IndicatorAnalyzer:
             'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
             'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
         ]
+        # Posición (0-11) de cada mes, para no recorrer meses_orden en cada llamada
+        self._mes_idx = {mes: i for i, mes in enumerate(self.meses_orden)}
         logger.info("IndicatorAnalyzer inicializado")
     
     def clasificar_periodicidad(self, valores_mensuales: Dict[str, float]) -> Periodicidad:
@@ -85,52 +605,17 @@ class IndicatorAnalyzer:
         if not valores_mensuales:
             return Periodicidad.INDETERMINADA
         
-        # Contar meses con datos
-        meses_con_datos = len([v for v in valores_mensuales.values() if pd.notna(v)])
-        
-        # Identificar posiciones de meses con datos
-        posiciones = []
-        for i, mes in enumerate(self.meses_orden):
-            if mes in valores_mensuales and pd.notna(valores_mensuales[mes]):
-                posiciones.append(i)
-        
-        if len(posiciones) == 0:
-            return Periodicidad.INDETERMINADA
+        # Contar valores y marcar en una máscara de bits los meses con datos
+        meses_con_datos = 0
+        mascara = 0
+        for mes, valor in valores_mensuales.items():
+            if not _es_nulo(valor):
+                meses_con_datos += 1
+                i = self._mes_idx.get(mes)
+                if i is not None:
+                    mascara |= 1 << i
         
-        # Analizar intervalos entre mediciones
-        if len(posiciones) > 1:
-            intervalos = [posiciones[i+1] - posiciones[i] for i in range(len(posiciones)-1)]
-            intervalo_promedio = np.mean(intervalos)
-            
-            # Clasificar según intervalo promedio
-            if intervalo_promedio <= 1.5:
-                return Periodicidad.MENSUAL
-            elif 1.5 < intervalo_promedio <= 2.5:
-                return Periodicidad.BIMESTRAL
-            elif 2.5 < intervalo_promedio <= 3.5:
-                return Periodicidad.TRIMESTRAL
-            elif 3.5 < intervalo_promedio <= 5:
-                return Periodicidad.CUATRIMESTRAL
-            elif 5 < intervalo_promedio <= 7:
-                return Periodicidad.SEMESTRAL
-            else:
-                return Periodicidad.ANUAL
-        
-        # Si solo hay un dato, analizar por cantidad de meses
-        if meses_con_datos == 12:
-            return Periodicidad.MENSUAL
-        elif meses_con_datos == 6:
-            return Periodicidad.BIMESTRAL
-        elif meses_con_datos == 4:
-            return Periodicidad.TRIMESTRAL
-        elif meses_con_datos == 3:
-            return Periodicidad.CUATRIMESTRAL
-        elif meses_con_datos == 2:
-            return Periodicidad.SEMESTRAL
-        elif meses_con_datos == 1:
-            return Periodicidad.ANUAL
-        else:
-            return Periodicidad.INDETERMINADA
+        return _periodicidad_desde_mascara(mascara, meses_con_datos)
     
     def calcular_semaforo(
         self,
@@ -158,73 +643,13 @@ class IndicatorAnalyzer:
         - Amarillo: Entre nivel crítico y nivel satisfactorio
         - Rojo: Por debajo del nivel crítico
         """
-        # Si no hay valor actual, devolver gris
-        if pd.isna(valor_actual):
-            return EstadoSemaforo.GRIS
-        
-        # Si no hay meta ni nivel_obtenido, usar valor actual vs 100%
-        if pd.isna(meta) and pd.isna(nivel_obtenido):
-            # Clasificar por magnitud del valor actual
-            if valor_actual >= 80:
-                return EstadoSemaforo.VERDE
-            elif valor_actual >= 60:
-                return EstadoSemaforo.AMARILLO
-            else:
-                return EstadoSemaforo.ROJO
-        
-        # Determinar si es un indicador invertido (menor es mejor)
-        # Ejemplos: PQRS Vencidos, Ausentismo, Accidentalidad, etc.
-        es_invertido = False
-        if pd.notna(meta) and pd.notna(nivel_critico):
-            es_invertido = nivel_critico > meta  # Si el nivel crítico es mayor que la meta, es invertido
-        
-        # Si no hay niveles definidos, usar valores de meta o nivel_obtenido
-        if pd.isna(nivel_satisfactorio):
-            if pd.notna(nivel_obtenido):
-                nivel_satisfactorio = nivel_obtenido
-            elif pd.notna(meta):
-                nivel_satisfactorio = meta
-            else:
-                nivel_satisfactorio = 0.80  # 80% como valor por defecto
-        
-        if pd.isna(nivel_critico):
-            if pd.notna(meta):
-                if es_invertido:
-                    nivel_critico = meta * 1.25  # 125% de la meta (peor)
-                else:
-                    nivel_critico = meta * 0.75  # 75% de la meta
-            else:
-                if es_invertido:
-                    nivel_critico = nivel_satisfactorio * 1.25
-                else:
-                    nivel_critico = nivel_satisfactorio * 0.75
-        
-        # Normalizar valores si están en diferentes escalas
-        # Si la meta o niveles están en rango 0-1 y el valor actual está en 0-100, convertir
-        if valor_actual > 1 and nivel_satisfactorio <= 1:
-            valor_actual = valor_actual / 100
-        # Si el valor actual está en 0-1 y los niveles están en 0-100, convertir niveles
-        elif valor_actual <= 1 and nivel_satisfactorio > 1:
-            nivel_satisfactorio = nivel_satisfactorio / 100
-            nivel_critico = nivel_critico / 100 if pd.notna(nivel_critico) else nivel_critico
-        
-        # Determinar estado según si es indicador normal o invertido
-        if es_invertido:
-            # Para indicadores invertidos (menor es mejor): PQRS Vencidos, Ausentismo, etc.
-            if valor_actual <= nivel_satisfactorio:
-                return EstadoSemaforo.VERDE
-            elif valor_actual <= nivel_critico:
-                return EstadoSemaforo.AMARILLO
-            else:
-                return EstadoSemaforo.ROJO
-        else:
-            # Para indicadores normales (mayor es mejor)
-            if valor_actual >= nivel_satisfactorio:
-                return EstadoSemaforo.VERDE
-            elif valor_actual >= nivel_critico:
-                return EstadoSemaforo.AMARILLO
-            else:
-                return EstadoSemaforo.ROJO
+        return _semaforo_cached(
+            _clave_semaforo(valor_actual),
+            _clave_semaforo(meta),
+            _clave_semaforo(nivel_satisfactorio),
+            _clave_semaforo(nivel_critico),
+            _clave_semaforo(nivel_obtenido)
+        )
     
     def analizar_tendencia(self, valores_mensuales: Dict[str, float]) -> Tuple[TendenciaIndicador, float]:
         """
@@ -245,25 +670,57 @@ class IndicatorAnalyzer:
         if not valores_mensuales or len(valores_mensuales) < 2:
             return TendenciaIndicador.INSUFICIENTE, 0.0
         
-        # Ordenar valores por mes
-        valores_ordenados = []
-        for mes in self.meses_orden:
-            if mes in valores_mensuales and pd.notna(valores_mensuales[mes]):
-                valores_ordenados.append(valores_mensuales[mes])
+        return self._tendencia_desde_serie(self._serie_mensual(valores_mensuales))
+    
+    def _serie_mensual(self, valores_mensuales: Dict[str, float]) -> List[float]:
+        """
+        Obtiene los valores válidos de los meses en orden cronológico.
+        
+        Args:
+            valores_mensuales (Dict[str, float]): Valores por mes
+            
+        Returns:
+            List[float]: Valores ordenados por mes (el último es el valor más reciente)
+        """
+        return [
+            valor for _, valor in sorted(
+                (self._mes_idx[mes], valor) for mes, valor in valores_mensuales.items()
+                if mes in self._mes_idx and not _es_nulo(valor)
+            )
+        ]
+    
+    def _tendencia_desde_serie(self, valores_ordenados) -> Tuple[TendenciaIndicador, float]:
+        """
+        Calcula y clasifica la tendencia de una serie mensual ya ordenada.
         
+        Args:
+            valores_ordenados (List[float] | np.ndarray): Valores válidos en orden cronológico
+            
+        Returns:
+            Tuple[TendenciaIndicador, float]: (tipo_tendencia, pendiente_calculada)
+        """
         if len(valores_ordenados) < 2:
             return TendenciaIndicador.INSUFICIENTE, 0.0
         
-        # Calcular pendiente simple (regresión lineal)
-        x = np.arange(len(valores_ordenados))
-        y = np.array(valores_ordenados)
+        # Calcular pendiente (regresión lineal) y variabilidad
+        pendiente, desviacion, promedio = _kernel_tendencia(
+            np.asarray(valores_ordenados, dtype=np.float64)
+        )
         
-        # Regresión lineal: y = mx + b
-        pendiente = np.polyfit(x, y, 1)[0]
+        return self._clasificar_tendencia(pendiente, desviacion, promedio), pendiente
+    
+    def _clasificar_tendencia(self, pendiente: float, desviacion: float, promedio: float) -> TendenciaIndicador:
+        """
+        Clasifica la tendencia según la pendiente y el coeficiente de variación.
         
-        # Calcular variabilidad
-        desviacion = np.std(valores_ordenados)
-        promedio = np.mean(valores_ordenados)
+        Args:
+            pendiente (float): Pendiente de la regresión lineal
+            desviacion (float): Desviación estándar de los valores
+            promedio (float): Promedio de los valores
+            
+        Returns:
+            TendenciaIndicador: Tipo de tendencia
+        """
         coef_variacion = (desviacion / promedio * 100) if promedio != 0 else 0
         
         # Clasificar tendencia
@@ -271,13 +728,13 @@ class IndicatorAnalyzer:
         umbral_volatilidad = 15.0  # Coeficiente de variación alto
         
         if coef_variacion > umbral_volatilidad:
-            return TendenciaIndicador.VOLATIL, pendiente
+            return TendenciaIndicador.VOLATIL
         elif abs(pendiente) < umbral_estabilidad:
-            return TendenciaIndicador.ESTABILIDAD, pendiente
+            return TendenciaIndicador.ESTABILIDAD
         elif pendiente > 0:
-            return TendenciaIndicador.CRECIMIENTO, pendiente
+            return TendenciaIndicador.CRECIMIENTO
         else:
-            return TendenciaIndicador.RETROCESO, pendiente
+            return TendenciaIndicador.RETROCESO
     
     def detectar_anomalias(self, valores_mensuales: Dict[str, float]) -> List[Dict]:
         """
@@ -293,31 +750,98 @@ class IndicatorAnalyzer:
         - Z-score > 2.5 (valor atípicamente alto)
         - Z-score < -2.5 (valor atípicamente bajo)
         """
-        anomalias = []
+        meses, valores = self._valores_validos(valores_mensuales)
         
-        valores = [v for v in valores_mensuales.values() if pd.notna(v)]
+        if valores.size < 3:
+            return []  # No suficientes datos para detectar anomalías
         
-        if len(valores) < 3:
-            return anomalias  # No suficientes datos para detectar anomalías
+        media, _, desviacion, _, _ = _kernel_estadisticas(valores)
         
-        media = np.mean(valores)
-        desviacion = np.std(valores)
+        return self._anomalias_desde_valores(meses, valores_mensuales, valores, media, desviacion)
+    
+    def _valores_validos(self, valores_mensuales: Dict[str, float]) -> Tuple[List[str], np.ndarray]:
+        """
+        Extrae las claves y los valores no nulos del indicador, en el orden del diccionario.
         
-        if desviacion == 0:
-            return anomalias  # No hay variabilidad
+        Args:
+            valores_mensuales (Dict[str, float]): Valores por mes
+            
+        Returns:
+            Tuple[List[str], np.ndarray]: (claves con dato, valores float64)
+        """
+        meses = [mes for mes, valor in valores_mensuales.items() if not _es_nulo(valor)]
+        valores = np.fromiter((valores_mensuales[mes] for mes in meses), dtype=np.float64, count=len(meses))
+        return meses, valores
+    
+    def _desglosar_valores(
+        self,
+        valores_mensuales: Dict[str, float]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, int]:
+        """
+        Recorre una sola vez los valores del indicador y arma todas sus vistas.
+        
+        Args:
+            valores_mensuales (Dict[str, float]): Valores por mes
+            
+        Returns:
+            Tuple: (claves con dato, valores válidos en el orden del diccionario,
+            arreglo de 12 meses con NaN en los faltantes, máscara de bits de meses con datos)
+        """
+        meses = []
+        valores = []
+        mensual = np.full(len(self.meses_orden), np.nan)
+        mascara = 0
         
         for mes, valor in valores_mensuales.items():
-            if pd.notna(valor):
-                z_score = (valor - media) / desviacion
-                
-                if abs(z_score) > 2.5:
-                    anomalias.append({
-                        'mes': mes,
-                        'valor': valor,
-                        'z_score': z_score,
-                        'tipo': 'Alto' if z_score > 0 else 'Bajo',
-                        'desviacion_porcentual': ((valor - media) / media * 100)
-                    })
+            if _es_nulo(valor):
+                continue
+            meses.append(mes)
+            valores.append(valor)
+            i = self._mes_idx.get(mes)
+            if i is not None:
+                mensual[i] = valor
+                mascara |= 1 << i
+        
+        return meses, np.array(valores, dtype=np.float64), mensual, mascara
+    
+    def _anomalias_desde_valores(
+        self,
+        meses: List[str],
+        valores_mensuales: Dict[str, float],
+        valores: np.ndarray,
+        media: float,
+        desviacion: float
+    ) -> List[Dict]:
+        """
+        Arma la lista de anomalías a partir de los valores válidos y sus estadísticas.
+        
+        Args:
+            meses (List[str]): Claves con dato (ver _valores_validos)
+            valores_mensuales (Dict[str, float]): Valores por mes originales
+            valores (np.ndarray): Valores válidos
+            media (float): Promedio de los valores
+            desviacion (float): Desviación estándar de los valores
+            
+        Returns:
+            List[Dict]: Lista de anomalías detectadas con detalles
+        """
+        anomalias = []
+        
+        if valores.size < 3 or desviacion == 0:
+            return anomalias  # Pocos datos o sin variabilidad
+        
+        # Z-scores de todos los valores a la vez; solo se arma el detalle de los atípicos
+        desvios = valores - media
+        z_scores = desvios / desviacion
+        for j in np.flatnonzero(np.abs(z_scores) > 2.5):
+            z_score = z_scores[j]
+            anomalias.append({
+                'mes': meses[j],
+                'valor': valores_mensuales[meses[j]],
+                'z_score': z_score,
+                'tipo': 'Alto' if z_score > 0 else 'Bajo',
+                'desviacion_porcentual': (desvios[j] / media * 100)
+            })
         
         return anomalias
     
@@ -331,101 +855,133 @@ class IndicatorAnalyzer:
         Returns:
             Dict: Diccionario con estadísticas calculadas
         """
-        valores = [v for v in valores_mensuales.values() if pd.notna(v)]
-        
-        if not valores:
-            return {
-                'promedio': np.nan,
-                'mediana': np.nan,
-                'desviacion_estandar': np.nan,
-                'minimo': np.nan,
-                'maximo': np.nan,
-                'rango': np.nan,
-                'coeficiente_variacion': np.nan,
-                'total_periodos': 0
-            }
-        
-        promedio = np.mean(valores)
+        _, valores = self._valores_validos(valores_mensuales)
         
-        return {
-            'promedio': promedio,
-            'mediana': np.median(valores),
-            'desviacion_estandar': np.std(valores),
-            'minimo': np.min(valores),
-            'maximo': np.max(valores),
-            'rango': np.max(valores) - np.min(valores),
-            'coeficiente_variacion': (np.std(valores) / promedio * 100) if promedio != 0 else 0,
-            'total_periodos': len(valores)
-        }
+        if not valores.size:
+            return _dict_estadisticas(0)
+        
+        return _dict_estadisticas(valores.size, *_kernel_estadisticas(valores))
     
-    def generar_analisis_completo(self, indicador: Dict) -> Dict:
+    def generar_analisis_completo(
+        self,
+        indicador: Dict,
+        ultima_actualizacion: Optional[str] = None,
+        incluir_interpretacion: bool = True
+    ) -> Dict:
         """
         Genera un análisis completo de un indicador individual.
         
         Args:
             indicador (Dict): Diccionario con datos del indicador
+            ultima_actualizacion (str, optional): Fecha y hora del análisis; si no se
+                indica se toma la actual (los lotes la calculan una sola vez)
+            incluir_interpretacion (bool): Si es False se omite el texto de
+                interpretación (clave 'interpretacion')
             
         Returns:
             Dict: Análisis completo con todas las métricas
         """
         valores_mensuales = indicador.get('valores_mensuales', {})
         
-        # Clasificar periodicidad
-        periodicidad = self.clasificar_periodicidad(valores_mensuales)
+        # Un solo recorrido del diccionario alimenta todas las métricas
+        meses, valores, mensual, mascara = self._desglosar_valores(valores_mensuales)
         
-        # Analizar tendencia
-        tendencia, pendiente = self.analizar_tendencia(valores_mensuales)
+        # Clasificar periodicidad
+        periodicidad = _periodicidad_desde_mascara(mascara, valores.size)
         
-        # Calcular estadísticas
-        estadisticas = self.calcular_estadisticas(valores_mensuales)
+        # Analizar tendencia; la serie ordenada también da el último valor mensual
+        serie = mensual[~np.isnan(mensual)]
+        tendencia, pendiente = self._tendencia_desde_serie(serie)
         
-        # Detectar anomalías
-        anomalias = self.detectar_anomalias(valores_mensuales)
+        # Estadísticas y anomalías: un solo paso por el núcleo numérico, cuyo
+        # promedio y desviación sirven también para los Z-scores
+        if valores.size:
+            promedio, mediana, desviacion, minimo, maximo = _kernel_estadisticas(valores)
+            estadisticas = _dict_estadisticas(valores.size, promedio, mediana, desviacion, minimo, maximo)
+            anomalias = self._anomalias_desde_valores(meses, valores_mensuales, valores, promedio, desviacion)
+        else:
+            estadisticas = _dict_estadisticas(0)
+            anomalias = []
         
-        # Calcular semáforo (usando el último valor disponible o el promedio)
-        ultimo_valor = None
-        for mes in reversed(self.meses_orden):
-            if mes in valores_mensuales and pd.notna(valores_mensuales[mes]):
-                ultimo_valor = valores_mensuales[mes]
-                break
-        
-        # Si no hay último valor, usar el promedio
-        if ultimo_valor is None and valores_mensuales:
-            valores_lista = [v for v in valores_mensuales.values() if pd.notna(v)]
-            if valores_lista:
-                ultimo_valor = np.mean(valores_lista)
-        
-        semaforo = self.calcular_semaforo(
-            ultimo_valor if ultimo_valor is not None else np.nan,
-            indicador.get('meta', np.nan),
-            indicador.get('nivel_satisfactorio', np.nan),
-            indicador.get('nivel_critico', np.nan),
-            indicador.get('nivel_obtenido', np.nan)
+        return self._componer_analisis(
+            indicador, periodicidad, tendencia, pendiente, estadisticas, anomalias,
+            float(serie[-1]) if serie.size else None, ultima_actualizacion,
+            incluir_interpretacion=incluir_interpretacion
         )
+    
+    def _componer_analisis(
+        self,
+        indicador: Dict,
+        periodicidad: Periodicidad,
+        tendencia: TendenciaIndicador,
+        pendiente: float,
+        estadisticas: Dict,
+        anomalias: List[Dict],
+        ultimo_valor_mes: Optional[float] = None,
+        ultima_actualizacion: Optional[str] = None,
+        semaforo: Optional[EstadoSemaforo] = None,
+        incluir_interpretacion: bool = True
+    ) -> Dict:
+        """
+        Completa el análisis (semáforo e interpretación) a partir de las métricas ya calculadas.
         
-        # Generar interpretación textual
-        interpretacion = self._generar_interpretacion(
-            indicador['nombre'],
-            periodicidad,
-            tendencia,
-            semaforo,
-            estadisticas,
-            anomalias
-        )
+        Args:
+            indicador (Dict): Diccionario con datos del indicador
+            periodicidad, tendencia, pendiente, estadisticas, anomalias: Métricas calculadas
+            ultimo_valor_mes (float, optional): Último valor mensual válido (None si no hay)
+            ultima_actualizacion (str, optional): Fecha y hora del análisis (por defecto, la actual)
+            semaforo (EstadoSemaforo, optional): Semáforo ya calculado (ver calcular_semaforo_lote)
+            incluir_interpretacion (bool): Si es False no se genera la interpretación
+            
+        Returns:
+            Dict: Análisis completo con todas las métricas
+        """
+        # Calcular semáforo (usando el último valor disponible o el promedio)
+        if semaforo is None:
+            if 'ultimo_valor' in indicador:
+                # Calculado una sola vez por el cargador
+                ultimo_valor = indicador['ultimo_valor'] if not _es_nulo(indicador['ultimo_valor']) else None
+            else:
+                ultimo_valor = ultimo_valor_mes
+            
+            # Si no hay último valor, usar el promedio de todos los valores
+            if ultimo_valor is None and estadisticas['total_periodos'] > 0:
+                ultimo_valor = estadisticas['promedio']
+            
+            semaforo = self.calcular_semaforo(
+                ultimo_valor if ultimo_valor is not None else np.nan,
+                indicador.get('meta', np.nan),
+                indicador.get('nivel_satisfactorio', np.nan),
+                indicador.get('nivel_critico', np.nan),
+                indicador.get('nivel_obtenido', np.nan)
+            )
         
-        return {
+        analisis = {
             'indicador_id': indicador.get('id'),
             'nombre': indicador.get('nombre'),
-            'periodicidad': periodicidad.value,
-            'tendencia': tendencia.value,
+            'periodicidad': _VALOR_ENUM[periodicidad],
+            'tendencia': _VALOR_ENUM[tendencia],
             'pendiente': pendiente,
-            'semaforo': semaforo.value,
+            'semaforo': _VALOR_ENUM[semaforo],
             'estadisticas': estadisticas,
             'anomalias': anomalias,
-            'total_anomalias': len(anomalias),
-            'interpretacion': interpretacion,
-            'ultima_actualizacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'total_anomalias': len(anomalias)
         }
+        
+        # Generar interpretación textual
+        if incluir_interpretacion:
+            analisis['interpretacion'] = self._generar_interpretacion(
+                indicador['nombre'],
+                periodicidad,
+                tendencia,
+                semaforo,
+                estadisticas,
+                anomalias
+            )
+        
+        analisis['ultima_actualizacion'] = ultima_actualizacion or _marca_tiempo()
+        
+        return analisis
     
     def _generar_interpretacion(
         self,
@@ -442,31 +998,18 @@ class IndicatorAnalyzer:
         Returns:
             str: Texto de interpretación para el usuario
         """
-        partes = []
-        
-        # Introducción
-        partes.append(f"El indicador '{nombre}' presenta periodicidad {periodicidad.value.lower()}.")
-        
-        # Tendencia
-        if tendencia == TendenciaIndicador.CRECIMIENTO:
-            partes.append("Se observa una tendencia de crecimiento positivo en los valores registrados.")
-        elif tendencia == TendenciaIndicador.RETROCESO:
-            partes.append("Se identifica una tendencia de retroceso que requiere atención.")
-        elif tendencia == TendenciaIndicador.ESTABILIDAD:
-            partes.append("Los valores se mantienen estables a lo largo del período analizado.")
-        elif tendencia == TendenciaIndicador.VOLATIL:
-            partes.append("Se presenta alta variabilidad en los valores, indicando comportamiento volátil.")
-        
-        # Semáforo
-        if semaforo == EstadoSemaforo.VERDE:
-            partes.append("El estado actual es SATISFACTORIO, cumpliendo con las metas establecidas.")
-        elif semaforo == EstadoSemaforo.AMARILLO:
-            partes.append("El estado actual es ACEPTABLE, pero requiere seguimiento para evitar deterioro.")
-        elif semaforo == EstadoSemaforo.ROJO:
-            partes.append("El estado actual es CRÍTICO, no cumpliendo con los niveles mínimos esperados.")
+        partes = [
+            f"El indicador '{nombre}' presenta periodicidad {_PERIODICIDAD_MINUSCULA[periodicidad]}."
+        ]
+        
+        # Tendencia y semáforo: frases fijas por estado
+        if tendencia in _TEXTO_TENDENCIA:
+            partes.append(_TEXTO_TENDENCIA[tendencia])
+        if semaforo in _TEXTO_SEMAFORO:
+            partes.append(_TEXTO_SEMAFORO[semaforo])
         
         # Estadísticas
-        if pd.notna(estadisticas['promedio']):
+        if not _es_nulo(estadisticas['promedio']):
             partes.append(f"El promedio de los valores es {estadisticas['promedio']:.2f}%.")
         
         # Anomalías
@@ -476,29 +1019,224 @@ class IndicatorAnalyzer:
         return " ".join(partes)
 
 
-def analizar_todos_indicadores(indicadores_list: List[Dict]) -> List[Dict]:
+def _matrices_lote(
+    indicadores_list: List[Dict],
+    mes_idx: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray, List[List[str]], List[bool]]:
+    """
+    Apila los valores de todos los indicadores en dos matrices rellenas con NaN.
+    
+    Args:
+        indicadores_list (List[Dict]): Lista de indicadores
+        mes_idx (Dict[str, int]): Posición (0-11) de cada mes
+        
+    Returns:
+        Tuple: (matriz (N, 12) alineada con los meses, matriz (N, K) con todos los
+        valores en el orden del diccionario, claves de cada fila, filas convertidas)
+    """
+    diccionarios = [indicador.get('valores_mensuales') or {} for indicador in indicadores_list]
+    ancho = max((len(valores) for valores in diccionarios), default=0)
+    
+    mensual = np.full((len(diccionarios), len(mes_idx)), np.nan)
+    todos = np.full((len(diccionarios), max(ancho, 1)), np.nan)
+    claves = []
+    convertidas = []
+    
+    # Coordenadas (fila, columna en todos, columna del mes) de cada valor mensual
+    filas = []
+    columnas = []
+    meses = []
+    
+    for i, valores in enumerate(diccionarios):
+        claves.append(list(valores))
+        try:
+            todos[i, :len(valores)] = list(valores.values())
+        except (TypeError, ValueError):
+            # Valores no numéricos: el indicador se analiza por la vía individual
+            todos[i] = np.nan
+            convertidas.append(False)
+            continue
+        convertidas.append(True)
+        for k, mes in enumerate(valores):
+            j = mes_idx.get(mes)
+            if j is not None:
+                filas.append(i)
+                columnas.append(k)
+                meses.append(j)
+    
+    # La matriz mensual se llena de una vez a partir de la matriz completa
+    mensual[filas, meses] = todos[filas, columnas]
+    
+    return mensual, todos, claves, convertidas
+
+
+def _semaforos_lote(
+    indicadores_list: List[Dict],
+    ultimo_mes: np.ndarray,
+    conteo: np.ndarray,
+    promedio: np.ndarray
+) -> Optional[np.ndarray]:
+    """
+    Calcula el semáforo de todo el lote con calcular_semaforo_lote.
+    
+    Usa el último valor del cargador si existe (o el último mes con dato) y,
+    si falta, el promedio de todos los valores, igual que _componer_analisis.
+    
+    Args:
+        indicadores_list (List[Dict]): Lista de indicadores
+        ultimo_mes (np.ndarray): Último valor mensual de cada fila (NaN si no hay)
+        conteo, promedio (np.ndarray): Resultados de _kernel_lote_estadisticas
+        
+    Returns:
+        Optional[np.ndarray]: Semáforos por indicador, o None si algún campo no es numérico
+    """
+    try:
+        valor = np.array([
+            indicador['ultimo_valor'] if 'ultimo_valor' in indicador else ultimo_mes[i]
+            for i, indicador in enumerate(indicadores_list)
+        ], dtype=np.float64)
+        campos = [
+            np.array([indicador.get(campo, np.nan) for indicador in indicadores_list], dtype=np.float64)
+            for campo in ('meta', 'nivel_satisfactorio', 'nivel_critico', 'nivel_obtenido')
+        ]
+    except (TypeError, ValueError):
+        return None
+    
+    valor = np.where(np.isnan(valor) & (conteo > 0), promedio, valor)
+    
+    return calcular_semaforo_lote(valor, *campos)
+
+
+def analizar_todos_indicadores(indicadores_list: List[Dict], incluir_interpretacion: bool = True) -> List[Dict]:
     """
     Analiza una lista completa de indicadores.
     
+    Las métricas numéricas (estadísticas, tendencia, anomalías y periodicidad)
+    se calculan para todos los indicadores a la vez sobre matrices NumPy; el
+    resultado es el mismo que llamar a generar_analisis_completo uno por uno.
+    
     Args:
         indicadores_list (List[Dict]): Lista de indicadores a analizar
+        incluir_interpretacion (bool): Si es False se omite el texto de interpretación,
+            útil cuando el consumidor no lo muestra (p. ej. el informe PDF)
         
     Returns:
         List[Dict]: Lista de análisis completos
     """
     analyzer = IndicatorAnalyzer()
     resultados = []
+    errores = []
+    
+    logger.info("Iniciando análisis de %d indicadores...", len(indicadores_list))
+    
+    # Todos los análisis del lote comparten la misma marca de tiempo
+    ultima_actualizacion = _marca_tiempo()
+    
+    mensual, todos, claves, convertidas = _matrices_lote(indicadores_list, analyzer._mes_idx)
     
-    logger.info(f"Iniciando análisis de {len(indicadores_list)} indicadores...")
+    # Reducciones por fila sobre todos los valores y sobre la serie mensual
+    conteo, promedio, mediana, desviacion, minimo, maximo = _kernel_lote_estadisticas(todos)
+    conteo_mes, pendiente, desviacion_mes, promedio_mes = _kernel_lote_tendencia(mensual)
     
-    for indicador in indicadores_list:
+    # Anomalías de todo el lote en columnas; por indicador solo se toma su tramo
+    anomalias_lote = _kernel_lote_anomalias(todos, conteo, promedio, desviacion)
+    fin_anomalias = np.cumsum(np.bincount(anomalias_lote['fila'], minlength=len(indicadores_list))).tolist()
+    anomalias_lote = anomalias_lote.tolist()
+    
+    mascara_mes = ~np.isnan(mensual)
+    mascaras = (mascara_mes << np.arange(mascara_mes.shape[1])).sum(axis=1).tolist()
+    ultimos = np.where(mascara_mes.any(axis=1), mascara_mes.shape[1] - 1 - mascara_mes[:, ::-1].argmax(axis=1), -1)
+    ultimo_mes = np.where(ultimos >= 0, mensual[np.arange(len(ultimos)), ultimos], np.nan)
+    
+    semaforos = _semaforos_lote(indicadores_list, ultimo_mes, conteo, promedio)
+    
+    for i, indicador in enumerate(indicadores_list):
         try:
-            analisis = analyzer.generar_analisis_completo(indicador)
-            resultados.append(analisis)
+            if not convertidas[i]:
+                resultados.append(analyzer.generar_analisis_completo(
+                    indicador, ultima_actualizacion, incluir_interpretacion
+                ))
+                continue
+            
+            periodicidad = _periodicidad_desde_mascara(mascaras[i], conteo[i])
+            
+            if conteo_mes[i] < 2:
+                tendencia, pendiente_i = TendenciaIndicador.INSUFICIENTE, 0.0
+            else:
+                pendiente_i = pendiente[i]
+                tendencia = analyzer._clasificar_tendencia(pendiente_i, desviacion_mes[i], promedio_mes[i])
+            
+            estadisticas = _dict_estadisticas(
+                int(conteo[i]), promedio[i], mediana[i], desviacion[i], minimo[i], maximo[i]
+            )
+            
+            inicio = fin_anomalias[i - 1] if i else 0
+            anomalias = [
+                {
+                    'mes': claves[i][columna],
+                    'valor': valor,
+                    'z_score': z_score,
+                    'tipo': 'Alto' if z_score > 0 else 'Bajo',
+                    'desviacion_porcentual': desviacion_porcentual
+                }
+                for _, columna, valor, z_score, desviacion_porcentual in anomalias_lote[inicio:fin_anomalias[i]]
+            ]
+            
+            ultimo_valor_mes = ultimo_mes[i] if ultimos[i] >= 0 else None
+            
+            resultados.append(analyzer._componer_analisis(
+                indicador, periodicidad, tendencia, pendiente_i, estadisticas, anomalias,
+                ultimo_valor_mes, ultima_actualizacion, semaforos[i] if semaforos is not None else None,
+                incluir_interpretacion
+            ))
         except Exception as e:
-            logger.error(f"Error al analizar indicador {indicador.get('nombre')}: {str(e)}")
+            errores.append((indicador.get('nombre'), e))
             continue
     
-    logger.info(f"Análisis completado: {len(resultados)} indicadores procesados")
+    # Un único registro con todos los errores del lote
+    if errores and logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            "Error al analizar %d indicadores:\n%s",
+            len(errores),
+            "\n".join(f"  - {nombre}: {error}" for nombre, error in errores)
+        )
+    
+    logger.info("Análisis completado: %d indicadores procesados", len(resultados))
+    
+    return resultados
+
+
+def analizar_todos_indicadores_parallel(
+    indicadores_list: List[Dict],
+    workers: Optional[int] = None
+) -> List[Dict]:
+    """
+    Analiza una lista de indicadores repartiéndola entre varios procesos.
+    
+    La lista se divide en bloques contiguos, uno por proceso, y cada bloque se
+    analiza con la vía vectorizada de analizar_todos_indicadores. Cada indicador
+    se analiza de forma independiente, por lo que el resultado es el mismo (y en
+    el mismo orden) que el de analizar_todos_indicadores.
+    
+    Args:
+        indicadores_list (List[Dict]): Lista de indicadores a analizar
+        workers (int, optional): Número de procesos (por defecto, núcleos disponibles)
+        
+    Returns:
+        List[Dict]: Lista de análisis completos
+    """
+    if not indicadores_list:
+        return []
+    
+    workers = min(workers or os.cpu_count() or 1, len(indicadores_list))
+    tamano = -(-len(indicadores_list) // workers)
+    bloques = [indicadores_list[i:i + tamano] for i in range(0, len(indicadores_list), tamano)]
+    
+    logger.info("Iniciando análisis paralelo de %d indicadores con %d procesos...", len(indicadores_list), workers)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        resultados = [analisis for bloque in executor.map(analizar_todos_indicadores, bloques) for analisis in bloque]
+    
+    logger.info("Análisis completado: %d indicadores procesados", len(resultados))
     
     return resultados
@@ -12,9 +12,12 @@ Funcionalidades:
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import chain, islice
 from pathlib import Path
 
 # Configurar logger
@@ -27,7 +30,12 @@ from data_processing.excel_loader import load_and_process_excel
 from data_processing.bateria_loader import load_and_process_bateria
 from analysis.indicator_analyzer import analizar_todos_indicadores
 from visualization.chart_generator import ChartGenerator
-from reporting.report_generator import generar_informe_pdf
+
+# Campos de los análisis que se guardan como categorías en la tabla de filtros
+COLUMNAS_CATEGORICAS = ('sector', 'periodicidad', 'semaforo', 'tendencia')
+
+# Segundos que se espera un reporte antes de dejarlo generándose en segundo plano
+ESPERA_REPORTE_SEGUNDOS = 2
 
 # Configuración de la página
 st.set_page_config(
@@ -37,8 +45,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Estilos CSS personalizados
-st.markdown("""
+# Estilos CSS personalizados (literal constante: no se arma de nuevo en cada ejecución)
+ESTILOS_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -81,14 +89,20 @@ st.markdown("""
         font-weight: bold;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(ESTILOS_CSS, unsafe_allow_html=True)
 
 
-@st.cache_data
-def cargar_datos(ruta_archivo):
+@st.cache_resource
+def cargar_datos(ruta_archivo, mtime):
     """
     Carga y procesa los datos del Excel (Tablero MIPG).
-    Utiliza cache de Streamlit para evitar recargas innecesarias.
+    Utiliza cache de Streamlit para evitar recargas innecesarias; la fecha de
+    modificación (mtime) forma parte de la clave, así un archivo editado se recarga.
+    
+    Se usa cache_resource porque los datos solo se leen: cada ejecución recibe
+    los mismos objetos en lugar de una copia deserializada.
     """
     try:
         df, indicadores, resumen = load_and_process_excel(ruta_archivo)
@@ -99,11 +113,12 @@ def cargar_datos(ruta_archivo):
         return None, None, None, None
 
 
-@st.cache_data
-def cargar_datos_bateria(ruta_archivo):
+@st.cache_resource
+def cargar_datos_bateria(ruta_archivo, mtime):
     """
     Carga y procesa los datos de la batería de indicadores sectoriales.
-    Utiliza cache de Streamlit para evitar recargas innecesarias.
+    Utiliza cache de Streamlit para evitar recargas innecesarias; la fecha de
+    modificación (mtime) forma parte de la clave, así un archivo editado se recarga.
     """
     try:
         sectores_df, indicadores_por_sector, resumen = load_and_process_bateria(ruta_archivo)
@@ -113,71 +128,200 @@ def cargar_datos_bateria(ruta_archivo):
         return None, None, None
 
 
-def analizar_indicadores_bateria(indicadores_list):
+def _normalizar_indicador_bateria(indicador):
+    """
+    Adapta un indicador de la batería sectorial a la estructura del analizador.
+    """
+    valores_mensuales = indicador.get('valores_mensuales', {})
+    
+    # Convertir nombre a string si es necesario
+    nombre = indicador.get('nombre', 'Sin nombre')
+    if not isinstance(nombre, str):
+        nombre = str(nombre)
+    
+    # Crear estructura compatible
+    return {
+        'id': indicador['id'],
+        'nombre': nombre,
+        'meta': indicador.get('meta_cuatrienio', np.nan),
+        'nivel_obtenido': indicador.get('meta_cuatrienio', np.nan),
+        'nivel_satisfactorio': np.nan,
+        'nivel_critico': np.nan,
+        'valores_mensuales': valores_mensuales,
+        'total_periodos': len(valores_mensuales),
+        'promedio': indicador.get('promedio', np.nan)
+    }
+
+
+def _analisis_basico_bateria(indicador, nombre):
+    """
+    Análisis mínimo para un indicador de la batería que no pudo analizarse.
+    """
+    return {
+        'id': indicador['id'],
+        'nombre': nombre,
+        'sector': indicador['sector'],
+        'periodicidad': 'Anual',
+        'semaforo': 'Gris',
+        'tendencia': 'Estable',
+        'promedio': indicador.get('promedio', 0),
+        'estadisticas': {
+            'promedio': indicador.get('promedio', 0),
+            'minimo': 0,
+            'maximo': 0
+        },
+        'interpretacion': f"Indicador del sector {indicador['sector']}: {nombre}",
+        'anomalias': []
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def analizar_indicadores_bateria(ruta_archivo, mtime):
     """
     Analiza indicadores de la batería sectorial usando el analizador completo.
     Normaliza la estructura para que sea compatible con el análisis estándar.
+    
+    El resultado queda en cache por ruta y fecha de modificación del archivo, de
+    modo que las interacciones con la página no repiten el análisis.
+    
+    Returns:
+        Tuple: (lista de indicadores, lista de análisis), o (None, None) si la
+        batería no pudo cargarse
     """
-    from analysis.indicator_analyzer import IndicatorAnalyzer
-    import numpy as np
+    sectores_df, indicadores_por_sector, _ = cargar_datos_bateria(ruta_archivo, mtime)
+    if not sectores_df:
+        return None, None
     
-    analyzer = IndicatorAnalyzer()
-    analisis_list = []
+    # Convertir a formato compatible (una sola lista con todos los sectores)
+    indicadores_list = list(chain.from_iterable(indicadores_por_sector.values()))
     
-    for indicador in indicadores_list:
-        # Normalizar estructura del indicador para el analizador
-        valores_mensuales = indicador.get('valores_mensuales', {})
-        
-        # Convertir nombre a string si es necesario
-        nombre = indicador.get('nombre', 'Sin nombre')
-        if not isinstance(nombre, str):
-            nombre = str(nombre)
-        
-        # Crear estructura compatible
-        indicador_normalizado = {
-            'id': indicador['id'],
-            'nombre': nombre,
-            'meta': indicador.get('meta_cuatrienio', np.nan),
-            'nivel_obtenido': indicador.get('meta_cuatrienio', np.nan),
-            'nivel_satisfactorio': np.nan,
-            'nivel_critico': np.nan,
-            'valores_mensuales': valores_mensuales,
-            'total_periodos': len(valores_mensuales),
-            'promedio': indicador.get('promedio', np.nan)
-        }
+    normalizados = [_normalizar_indicador_bateria(indicador) for indicador in indicadores_list]
+    
+    # Análisis vectorizado de todo el lote; los indicadores que fallan no
+    # aparecen en el resultado y reciben el análisis básico
+    analisis_por_id = {
+        analisis['indicador_id']: analisis
+        for analisis in analizar_todos_indicadores(normalizados)
+    }
+    
+    analisis_list = []
+    for indicador, normalizado in zip(indicadores_list, normalizados):
+        analisis = analisis_por_id.get(indicador['id'])
         
-        try:
-            # Usar el analizador completo
-            analisis = analyzer.generar_analisis_completo(indicador_normalizado)
+        if analisis is None:
+            analisis = _analisis_basico_bateria(indicador, normalizado['nombre'])
+        else:
             # Agregar información del sector
             analisis['sector'] = indicador['sector']
             analisis['codigo_sector'] = indicador.get('codigo_sector', '')
             analisis['nombre_sector'] = indicador.get('nombre_sector', '')
             analisis['objetivo'] = indicador.get('objetivo', '')
             analisis['unidad_medida'] = indicador.get('unidad_medida', '')
-        except Exception as e:
-            logger.error(f"Error al analizar indicador {nombre}: {e}")
-            # Fallback a análisis básico
-            analisis = {
-                'id': indicador['id'],
-                'nombre': nombre,
-                'sector': indicador['sector'],
-                'periodicidad': 'Anual',
-                'semaforo': 'Gris',
-                'tendencia': 'Estable',
-                'promedio': indicador.get('promedio', 0),
-                'estadisticas': {
-                    'promedio': indicador.get('promedio', 0),
-                    'minimo': 0,
-                    'maximo': 0
-                },
-                'interpretacion': f"Indicador del sector {indicador['sector']}: {nombre}",
-                'anomalias': []
-            }
         
         analisis_list.append(analisis)
     
-    return analisis_list
+    return indicadores_list, analisis_list
+
+
+def _mascara_categoria(columna, valor):
+    """
+    Retorna la máscara de las filas de una columna categórica iguales a valor.
+    
+    Compara los códigos enteros de la categoría en lugar de los textos; las
+    filas sin dato (código -1) nunca coinciden.
+    """
+    categorias = columna.cat.categories
+    if valor not in categorias:
+        return np.zeros(len(columna), dtype=bool)
+    return columna.cat.codes.to_numpy() == categorias.get_loc(valor)
+
+
+def _datos_filtro(analisis_list):
+    """
+    Arma la tabla de filtros y el arreglo de nombres para la búsqueda.
+    
+    Ambos se guardan en session_state junto a la lista de la que salieron y se
+    reutilizan mientras la lista sea la misma, sin hashearla en cada interacción.
+    
+    Returns:
+        Tuple: (tabla con los campos de los análisis, nombres en minúsculas como arreglo de texto)
+    """
+    origen, tabla, nombres = st.session_state.get('datos_filtro', (None, None, None))
+    if origen is not analisis_list:
+        tabla = pd.DataFrame(analisis_list, columns=['nombre', 'sector', 'periodicidad', 'semaforo', 'tendencia'])
+        # Columnas con pocos valores distintos como categorías: los filtros comparan códigos enteros
+        tabla = tabla.astype({columna: 'category' for columna in COLUMNAS_CATEGORICAS})
+        # Nombres en minúsculas para la búsqueda, calculados una sola vez
+        nombres = tabla['nombre'].fillna('').astype(str).str.lower().to_numpy(dtype=str)
+        st.session_state['datos_filtro'] = (analisis_list, tabla, nombres)
+    return tabla, nombres
+
+
+def tabla_analisis(analisis_list):
+    """
+    Retorna la tabla con los campos de los análisis usados para contar y filtrar.
+    """
+    return _datos_filtro(analisis_list)[0]
+
+
+@st.cache_resource
+def obtener_generador_graficos():
+    """Crea el generador de gráficos una sola vez y lo comparte entre ejecuciones."""
+    return ChartGenerator()
+
+
+@st.cache_resource(show_spinner=False)
+def figuras_inicio(clave_datos, _indicadores_list, _analisis_list):
+    """
+    Construye las figuras generales de la página de inicio.
+    
+    Streamlit no hashea los argumentos que empiezan con guion bajo: la clave del
+    cache es clave_datos (ruta y fecha de modificación del archivo cargado).
+    Con cache_resource cada ejecución recibe las mismas figuras ya validadas, en
+    lugar de reconstruirlas desde su copia serializada; solo se leen.
+    
+    Returns:
+        Tuple: (semaforización, comparativo, tendencias)
+    """
+    generator = obtener_generador_graficos()
+    return (
+        generator.grafico_semaforizacion_general(_analisis_list),
+        generator.grafico_comparativo_indicadores(_indicadores_list, _analisis_list, top_n=10),
+        generator.grafico_tendencias_multiple(_indicadores_list, max_indicadores=5)
+    )
+
+
+@st.cache_data(show_spinner=False)
+def opciones_filtros(clave_datos, _indicadores_list, _analisis_list):
+    """
+    Calcula las opciones de los filtros de la barra lateral.
+    
+    Como en figuras_inicio, la clave del cache es clave_datos (ruta y fecha de
+    modificación del archivo); las listas no se hashean.
+    
+    Returns:
+        Dict: Sectores (None si los indicadores no tienen sector), periodicidades y tendencias
+    """
+    tabla = pd.DataFrame({
+        'periodicidad': [a.get('periodicidad', 'Indeterminada') for a in _analisis_list],
+        'tendencia': [a.get('tendencia', 'Insuficiente') for a in _analisis_list]
+    })
+    
+    sectores = None
+    if any('sector' in ind for ind in _indicadores_list):
+        sectores = sorted(pd.unique(pd.Series([ind.get('sector', 'Sin sector') for ind in _indicadores_list])).tolist())
+    
+    return {
+        'sectores': sectores,
+        'periodicidades': sorted(tabla['periodicidad'].unique().tolist()),
+        'tendencias': sorted(tabla['tendencia'].unique().tolist())
+    }
+
+
+@st.cache_resource
+def obtener_ejecutor_reportes():
+    """Crea el pool de hilos que genera los reportes PDF sin bloquear la página."""
+    return ThreadPoolExecutor(max_workers=2)
 
 
 def mostrar_header():
@@ -194,9 +338,10 @@ def mostrar_metricas_generales(analisis_list):
     total_indicadores = len(analisis_list)
     
     # Contar por semáforo
-    verdes = sum(1 for a in analisis_list if a.get('semaforo') == 'Verde')
-    amarillos = sum(1 for a in analisis_list if a.get('semaforo') == 'Amarillo')
-    rojos = sum(1 for a in analisis_list if a.get('semaforo') == 'Rojo')
+    conteo = tabla_analisis(analisis_list)['semaforo'].value_counts()
+    verdes = int(conteo.get('Verde', 0))
+    amarillos = int(conteo.get('Amarillo', 0))
+    rojos = int(conteo.get('Rojo', 0))
     
     # Calcular porcentajes
     pct_verde = (verdes / total_indicadores * 100) if total_indicadores > 0 else 0
@@ -217,26 +362,37 @@ def mostrar_metricas_generales(analisis_list):
 def filtrar_indicadores(analisis_list, periodicidad, semaforo, tendencia, busqueda):
     """
     Aplica filtros a la lista de análisis de indicadores.
+    
+    Todas las condiciones se combinan en una sola máscara booleana sobre la
+    tabla de análisis.
+    
+    Returns:
+        np.ndarray: Posiciones (en analisis_list) de los análisis que cumplen los filtros
     """
-    resultados = analisis_list.copy()
+    # Sin filtros activos se conservan todas las posiciones, sin armar la máscara
+    if periodicidad == "Todas" and semaforo == "Todos" and tendencia == "Todas" and not busqueda:
+        return np.arange(len(analisis_list))
+    
+    tabla, nombres = _datos_filtro(analisis_list)
+    mascara = np.ones(len(tabla), dtype=bool)
     
     # Filtro por periodicidad
     if periodicidad != "Todas":
-        resultados = [a for a in resultados if a.get('periodicidad') == periodicidad]
+        mascara &= _mascara_categoria(tabla['periodicidad'], periodicidad)
     
     # Filtro por semáforo
     if semaforo != "Todos":
-        resultados = [a for a in resultados if a.get('semaforo') == semaforo]
+        mascara &= _mascara_categoria(tabla['semaforo'], semaforo)
     
     # Filtro por tendencia
     if tendencia != "Todas":
-        resultados = [a for a in resultados if a.get('tendencia') == tendencia]
+        mascara &= _mascara_categoria(tabla['tendencia'], tendencia)
     
     # Filtro por búsqueda de texto
     if busqueda:
-        resultados = [a for a in resultados if busqueda.lower() in a.get('nombre', '').lower()]
+        mascara &= np.char.find(nombres, busqueda.lower()) >= 0
     
-    return resultados
+    return np.flatnonzero(mascara)
 
 
 def mostrar_detalle_indicador(indicador, analisis):
@@ -274,7 +430,7 @@ def mostrar_detalle_indicador(indicador, analisis):
     st.markdown("---")
     
     # Gráfico de tendencia
-    generator = ChartGenerator()
+    generator = obtener_generador_graficos()
     fig = generator.grafico_tendencia_indicador(indicador, analisis, mostrar_meta=True)
     
     if fig:
@@ -309,15 +465,21 @@ def mostrar_detalle_indicador(indicador, analisis):
     with st.expander("📅 Ver Valores por Período"):
         valores = indicador.get('valores_mensuales', {})
         if valores:
-            df_valores = pd.DataFrame([
-                {'Período': mes, 'Valor': f"{valor:.2f}%"}
-                for mes, valor in valores.items()
-            ])
+            # Construcción por columnas, sin un diccionario por fila
+            df_valores = pd.DataFrame({
+                'Período': list(valores),
+                'Valor': [f"{valor:.2f}%" for valor in valores.values()]
+            })
             st.dataframe(df_valores, use_container_width=True)
 
 
-def pagina_inicio(df, indicadores_list, analisis_list):
-    """Página principal del dashboard."""
+def pagina_inicio(clave_datos, indicadores_list, analisis_list):
+    """
+    Página principal del dashboard.
+    
+    Args:
+        clave_datos (Tuple): Ruta y fecha de modificación del archivo, clave del cache de figuras
+    """
     mostrar_header()
     
     # Métricas generales
@@ -330,44 +492,44 @@ def pagina_inicio(df, indicadores_list, analisis_list):
     
     tab1, tab2, tab3 = st.tabs(["🎯 Semaforización", "📈 Comparativo", "📉 Tendencias"])
     
-    generator = ChartGenerator()
+    fig_semaforo, fig_comparativo, fig_tendencias = figuras_inicio(clave_datos, indicadores_list, analisis_list)
     
     with tab1:
-        fig_semaforo = generator.grafico_semaforizacion_general(analisis_list)
         if fig_semaforo:
             st.plotly_chart(fig_semaforo, use_container_width=True)
     
     with tab2:
-        fig_comparativo = generator.grafico_comparativo_indicadores(indicadores_list, analisis_list, top_n=10)
         if fig_comparativo:
             st.plotly_chart(fig_comparativo, use_container_width=True)
     
     with tab3:
-        fig_tendencias = generator.grafico_tendencias_multiple(indicadores_list, max_indicadores=5)
         if fig_tendencias:
             st.plotly_chart(fig_tendencias, use_container_width=True)
 
 
-def pagina_indicadores(indicadores_list, analisis_list):
-    """Página de exploración de indicadores individuales."""
+def pagina_indicadores(clave_datos, indicadores_list, analisis_list):
+    """
+    Página de exploración de indicadores individuales.
+    
+    Args:
+        clave_datos (Tuple): Ruta y fecha de modificación del archivo, clave del cache de opciones
+    """
     st.title("🔍 Explorar Indicadores")
     
     # Sidebar con filtros
     st.sidebar.markdown("## 🔧 Filtros")
     
-    # Verificar si hay indicadores con sectores (batería sectorial)
-    tiene_sectores = any('sector' in ind for ind in indicadores_list)
+    # Obtener opciones únicas (en cache mientras no cambie el archivo)
+    opciones = opciones_filtros(clave_datos, indicadores_list, analisis_list)
     
     # Filtro por sector (solo para batería sectorial)
     filtro_sector = "Todos"
-    if tiene_sectores:
-        sectores = sorted(list(set([ind.get('sector', 'Sin sector') for ind in indicadores_list])))
-        filtro_sector = st.sidebar.selectbox("Sector", ["Todos"] + sectores)
+    if opciones['sectores'] is not None:
+        filtro_sector = st.sidebar.selectbox("Sector", ["Todos"] + opciones['sectores'])
     
-    # Obtener opciones únicas
-    periodicidades = sorted(list(set([a.get('periodicidad', 'Indeterminada') for a in analisis_list])))
+    periodicidades = opciones['periodicidades']
     semaforos = ['Todos', 'Verde', 'Amarillo', 'Rojo', 'Gris']
-    tendencias = sorted(list(set([a.get('tendencia', 'Insuficiente') for a in analisis_list])))
+    tendencias = opciones['tendencias']
     
     # Filtros
     filtro_periodicidad = st.sidebar.selectbox("Periodicidad", ["Todas"] + periodicidades)
@@ -376,7 +538,7 @@ def pagina_indicadores(indicadores_list, analisis_list):
     filtro_busqueda = st.sidebar.text_input("🔍 Buscar indicador", "")
     
     # Aplicar filtros
-    analisis_filtrados = filtrar_indicadores(
+    posiciones = filtrar_indicadores(
         analisis_list,
         filtro_periodicidad,
         filtro_semaforo,
@@ -386,35 +548,35 @@ def pagina_indicadores(indicadores_list, analisis_list):
     
     # Aplicar filtro de sector si aplica
     if filtro_sector != "Todos":
-        analisis_filtrados = [a for a in analisis_filtrados if a.get('sector', '') == filtro_sector]
+        del_sector = _mascara_categoria(tabla_analisis(analisis_list)['sector'], filtro_sector)
+        posiciones = posiciones[del_sector[posiciones]]
+    
+    analisis_filtrados = [analisis_list[i] for i in posiciones]
     
-    indicadores_filtrados_idx = []
+    # Obtener indicadores correspondientes (índice por id; ante ids repetidos gana el primero)
+    indicadores_por_id = {}
+    for ind in indicadores_list:
+        indicadores_por_id.setdefault(ind.get('id'), ind)
     
-    # Obtener indicadores correspondientes
-    indicadores_filtrados = []
-    for anal in analisis_filtrados:
-        idx = anal.get('indicador_id')
-        for ind in indicadores_list:
-            if ind.get('id') == idx:
-                indicadores_filtrados.append(ind)
-                break
+    # Pares (indicador, análisis) alineados por posición
+    pares_filtrados = [
+        (indicadores_por_id[anal.get('indicador_id')], anal)
+        for anal in analisis_filtrados
+        if anal.get('indicador_id') in indicadores_por_id
+    ]
     
-    st.info(f"📋 Se encontraron **{len(indicadores_filtrados)}** indicadores que cumplen los criterios")
+    st.info(f"📋 Se encontraron **{len(pares_filtrados)}** indicadores que cumplen los criterios")
     
-    # Lista de indicadores
-    if indicadores_filtrados:
-        nombres_indicadores = [ind['nombre'] for ind in indicadores_filtrados]
-        indicador_seleccionado = st.selectbox(
+    # Lista de indicadores: el selector devuelve la posición del par elegido
+    if pares_filtrados:
+        posicion = st.selectbox(
             "Seleccione un indicador para ver detalles:",
-            nombres_indicadores
+            range(len(pares_filtrados)),
+            format_func=lambda i: pares_filtrados[i][0]['nombre']
         )
         
-        # Encontrar el indicador y su análisis
-        for ind, anal in zip(indicadores_filtrados, analisis_filtrados):
-            if ind['nombre'] == indicador_seleccionado:
-                st.markdown("---")
-                mostrar_detalle_indicador(ind, anal)
-                break
+        st.markdown("---")
+        mostrar_detalle_indicador(*pares_filtrados[posicion])
     else:
         st.warning("No se encontraron indicadores con los filtros aplicados")
 
@@ -454,49 +616,87 @@ def pagina_reportes(indicadores_list, analisis_list):
         top_n_indicadores = st.slider("Número máximo de indicadores", 5, len(indicadores_list), 20)
     
     if st.button("🎯 Generar Reporte PDF", type="primary"):
-        with st.spinner("Generando reporte..."):
-            try:
-                # Filtrar indicadores según criterios
-                indicadores_reporte = []
-                analisis_reporte = []
-                
-                for ind, anal in zip(indicadores_list, analisis_list):
-                    if anal.get('semaforo') in semaforo_reporte:
-                        indicadores_reporte.append(ind)
-                        analisis_reporte.append(anal)
-                
-                # Limitar cantidad
-                indicadores_reporte = indicadores_reporte[:top_n_indicadores]
-                analisis_reporte = analisis_reporte[:top_n_indicadores]
-                
-                # Generar PDF en memoria
-                from datetime import datetime
-                pdf_buffer = generar_informe_pdf(
-                    indicadores_reporte,
-                    analisis_reporte,
-                    titulo="Informe de Indicadores MIPG - Alcaldía de Filandia",
-                    incluir_graficos=incluir_graficos,
-                    incluir_estadisticas=incluir_estadisticas
-                )
-                
-                # Crear nombre de archivo con fecha
-                fecha_actual = datetime.now().strftime("%Y%m%d_%H%M%S")
-                nombre_descarga = f"{nombre_archivo}_{fecha_actual}.pdf"
-                
-                # Botón de descarga
-                st.download_button(
-                    label="📥 Descargar Reporte PDF",
-                    data=pdf_buffer,
-                    file_name=nombre_descarga,
-                    mime="application/pdf",
-                    type="primary"
-                )
-                
-                st.success(f"✅ Reporte generado exitosamente")
-                st.balloons()
-                
-            except Exception as e:
-                st.error(f"❌ Error al generar reporte: {str(e)}")
+        try:
+            # Filtrar indicadores según criterios, deteniéndose al llegar al límite
+            estados_reporte = set(semaforo_reporte)
+            seleccion = list(islice(
+                (
+                    (ind, anal) for ind, anal in zip(indicadores_list, analisis_list)
+                    if anal.get('semaforo') in estados_reporte
+                ),
+                top_n_indicadores
+            ))
+            indicadores_reporte = [ind for ind, _ in seleccion]
+            analisis_reporte = [anal for _, anal in seleccion]
+            
+            # Generar PDF en memoria en segundo plano (ReportLab solo se importa al generar un reporte)
+            from datetime import datetime
+            from reporting.report_generator import generar_informe_pdf
+            futuro = obtener_ejecutor_reportes().submit(
+                generar_informe_pdf,
+                indicadores_reporte,
+                analisis_reporte,
+                titulo="Informe de Indicadores MIPG - Alcaldía de Filandia",
+                incluir_graficos=incluir_graficos,
+                incluir_estadisticas=incluir_estadisticas
+            )
+            
+            # Crear nombre de archivo con fecha
+            fecha_actual = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_descarga = f"{nombre_archivo}_{fecha_actual}.pdf"
+            
+            st.session_state['reporte_pdf'] = {'futuro': futuro, 'nombre': nombre_descarga, 'mostrado': False}
+            
+            # Los reportes pequeños suelen terminar enseguida: se esperan un momento
+            with st.spinner("Generando reporte..."):
+                wait([futuro], timeout=ESPERA_REPORTE_SEGUNDOS)
+            
+        except Exception as e:
+            st.error(f"❌ Error al generar reporte: {str(e)}")
+    
+    mostrar_estado_reporte()
+
+
+def mostrar_estado_reporte():
+    """
+    Muestra el estado del último reporte enviado a generar en segundo plano:
+    aviso mientras se genera, botón de descarga cuando termina.
+    """
+    reporte = st.session_state.get('reporte_pdf')
+    if reporte is None:
+        return
+    
+    futuro = reporte['futuro']
+    if not futuro.done():
+        st.info("⏳ El reporte se está generando; puede seguir explorando los indicadores mientras tanto.")
+        st.button("🔄 Actualizar estado")
+        return
+    
+    try:
+        pdf_buffer = futuro.result()
+    except Exception as e:
+        del st.session_state['reporte_pdf']
+        st.error(f"❌ Error al generar reporte: {str(e)}")
+        return
+    
+    if pdf_buffer is None:
+        del st.session_state['reporte_pdf']
+        st.error("❌ No se pudo generar el reporte PDF")
+        return
+    
+    # Botón de descarga
+    st.download_button(
+        label="📥 Descargar Reporte PDF",
+        data=pdf_buffer.getvalue(),
+        file_name=reporte['nombre'],
+        mime="application/pdf",
+        type="primary"
+    )
+    
+    st.success(f"✅ Reporte generado exitosamente")
+    if not reporte['mostrado']:
+        reporte['mostrado'] = True
+        st.balloons()
 
 
 def main():
@@ -526,34 +726,39 @@ def main():
         st.info("Por favor, asegúrese de que el archivo Excel esté en el directorio raíz del proyecto.")
         return
     
-    # Convertir a string
+    # Convertir a string; la fecha de modificación invalida los datos en cache
     archivo_excel = str(archivo_path)
+    mtime = archivo_path.stat().st_mtime
+    
+    # Los datos cargados quedan en session_state mientras no cambie el archivo,
+    # así las ejecuciones siguientes no consultan (ni hashean) el cache
+    clave_datos = (archivo_excel, mtime)
+    
+    if st.session_state.get('clave_datos') != clave_datos:
+        # Cargar datos según el tipo de archivo
+        with st.spinner(f"Cargando {archivo_seleccionado}..."):
+            if "Batería" in archivo_seleccionado:
+                # Cargar batería de indicadores sectoriales
+                sectores_df, _, resumen_bateria = cargar_datos_bateria(archivo_excel, mtime)
+                
+                if not sectores_df:
+                    st.error("No se pudieron cargar los datos de la batería")
+                    return
+                
+                indicadores_list, analisis_list = analizar_indicadores_bateria(archivo_excel, mtime)
+                resumen = resumen_bateria
+            else:
+                # Cargar tablero MIPG
+                _, indicadores_list, analisis_list, resumen = cargar_datos(archivo_excel, mtime)
+        
+        if indicadores_list is None:
+            st.error("No se pudieron cargar los datos correctamente")
+            return
+        
+        st.session_state['datos'] = (indicadores_list, analisis_list, resumen)
+        st.session_state['clave_datos'] = clave_datos
     
-    # Cargar datos según el tipo de archivo
-    with st.spinner(f"Cargando {archivo_seleccionado}..."):
-        if "Batería" in archivo_seleccionado:
-            # Cargar batería de indicadores sectoriales
-            sectores_df, indicadores_por_sector, resumen_bateria = cargar_datos_bateria(archivo_excel)
-            
-            if not sectores_df:
-                st.error("No se pudieron cargar los datos de la batería")
-                return
-            
-            # Convertir a formato compatible
-            indicadores_list = []
-            for sector, inds in indicadores_por_sector.items():
-                indicadores_list.extend(inds)
-            
-            analisis_list = analizar_indicadores_bateria(indicadores_list)
-            df = pd.DataFrame(indicadores_list)
-            resumen = resumen_bateria
-        else:
-            # Cargar tablero MIPG
-            df, indicadores_list, analisis_list, resumen = cargar_datos(archivo_excel)
-    
-    if df is None or indicadores_list is None:
-        st.error("No se pudieron cargar los datos correctamente")
-        return
+    indicadores_list, analisis_list, resumen = st.session_state['datos']
     
     # Menú de navegación
     st.sidebar.title("🧭 Navegación")
@@ -576,9 +781,9 @@ def main():
     
     # Mostrar página seleccionada
     if pagina == "🏠 Inicio":
-        pagina_inicio(df, indicadores_list, analisis_list)
+        pagina_inicio(clave_datos, indicadores_list, analisis_list)
     elif pagina == "🔍 Explorar Indicadores":
-        pagina_indicadores(indicadores_list, analisis_list)
+        pagina_indicadores(clave_datos, indicadores_list, analisis_list)
     elif pagina == "📄 Generar Reportes":
         pagina_reportes(indicadores_list, analisis_list)
     elif pagina == "ℹ️ Acerca de":
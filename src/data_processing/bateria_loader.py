@@ -7,12 +7,51 @@ un sector diferente del plan de desarrollo.
 
 import pandas as pd
 import numpy as np
+from pandas.io.parsers import TextParser
 from typing import Dict, List, Tuple
 from datetime import datetime
 import logging
 
+from data_processing.excel_loader import find_header_row, open_excel_file
+
 logger = logging.getLogger(__name__)
 
+# Columnas descriptivas del indicador; las demás son valores por periodo
+COLUMNAS_METADATOS = frozenset({
+    'Código Sector', 'Sector', 'Código Objetivo Resultado',
+    'Objetivo de Resultado', 'Código Indicador de Resultado',
+    'Indicador de Resultado', 'Unidad de Medida', 'Meta Cuatrienio',
+    'Sector_Hoja'
+})
+
+
+def _bloque_numerico(df: pd.DataFrame, columnas: List) -> np.ndarray:
+    """
+    Arma la matriz de valores numéricos de las columnas indicadas.
+    
+    Las columnas numéricas se convierten en bloque; en las de tipo mixto solo
+    se toman las celdas que ya son números (los textos no se convierten).
+    
+    Args:
+        df: DataFrame del sector
+        columnas: Columnas de valores (resultados mensuales/anuales)
+        
+    Returns:
+        np.ndarray: Matriz filas x columnas con NaN donde no hay dato numérico
+    """
+    bloque = np.full((len(df), len(columnas)), np.nan)
+    
+    for j, col in enumerate(columnas):
+        serie = df[col]
+        if pd.api.types.is_numeric_dtype(serie.dtype):
+            bloque[:, j] = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            for i, valor in enumerate(serie.tolist()):
+                if isinstance(valor, (int, float)) and pd.notna(valor):
+                    bloque[i, j] = valor
+    
+    return bloque
+
 
 class BateriaIndicadoresLoader:
     """
@@ -22,6 +61,8 @@ class BateriaIndicadoresLoader:
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.sectores_data = {}
+        self._excel_file = None
+        self._indicadores_por_sector = None
         self.metadata = {
             'file_path': file_path,
             'load_timestamp': datetime.now(),
@@ -29,6 +70,17 @@ class BateriaIndicadoresLoader:
             'total_indicadores': 0
         }
     
+    def _get_excel_file(self) -> pd.ExcelFile:
+        """
+        Abre el libro Excel una sola vez y reutiliza el manejador en todas las hojas.
+        
+        Returns:
+            pd.ExcelFile: Libro abierto
+        """
+        if self._excel_file is None:
+            self._excel_file = open_excel_file(self.file_path)
+        return self._excel_file
+    
     def load_all_sectores(self) -> Dict[str, pd.DataFrame]:
         """
         Carga todas las hojas del archivo (excepto hojas vacías).
@@ -38,23 +90,27 @@ class BateriaIndicadoresLoader:
         """
         logger.info(f"Cargando batería de indicadores desde: {self.file_path}")
         
+        # Los indicadores extraídos antes dejan de corresponder a los datos
+        self._indicadores_por_sector = None
+        
         # Obtener lista de hojas
-        xl_file = pd.ExcelFile(self.file_path)
-        hojas = xl_file.sheet_names
+        hojas = self._get_excel_file().sheet_names
         
         # Excluir hojas vacías o irrelevantes
         hojas_validas = [h for h in hojas if h not in ['Hoja1', 'Sheet1', 'Sheet2']]
         
         logger.info(f"Se encontraron {len(hojas_validas)} sectores válidos")
         
+        # Las hojas se leen en serie sobre el mismo libro abierto: cada hoja toma
+        # milisegundos y un proceso aparte tendría que volver a abrir el libro
         for hoja in hojas_validas:
             try:
                 df = self._load_sector(hoja)
                 if df is not None and len(df) > 0:
                     self.sectores_data[hoja] = df
-                    logger.info(f"Sector '{hoja}' cargado: {len(df)} indicadores")
+                    logger.info("Sector '%s' cargado: %d indicadores", hoja, len(df))
             except Exception as e:
-                logger.error(f"Error al cargar sector '{hoja}': {e}")
+                logger.error("Error al cargar sector '%s': %s", hoja, e)
         
         self.metadata['total_sectores'] = len(self.sectores_data)
         self.metadata['total_indicadores'] = sum(len(df) for df in self.sectores_data.values())
@@ -71,38 +127,34 @@ class BateriaIndicadoresLoader:
         Returns:
             DataFrame procesado del sector
         """
-        # Leer sin encabezados para detectar estructura
+        # Leer sin encabezados para detectar estructura; los valores quedan sin
+        # convertir para poder interpretar el encabezado sin releer la hoja
         df_temp = pd.read_excel(
-            self.file_path,
+            self._get_excel_file(),
             sheet_name=sheet_name,
-            header=None
+            header=None,
+            dtype=object
         )
         
         # Buscar fila de encabezados (contiene "Código Sector")
-        header_row = None
-        for i in range(min(10, len(df_temp))):
-            row_values = df_temp.iloc[i].astype(str).tolist()
-            if any('Código Sector' in str(val) for val in row_values):
-                header_row = i
-                break
+        header_row = find_header_row(df_temp, marker='Código Sector')
         
         if header_row is None:
-            logger.warning(f"No se encontraron encabezados en hoja {sheet_name}")
+            logger.warning("No se encontraron encabezados en hoja %s", sheet_name)
             return None
         
-        # Leer con encabezados correctos
-        df = pd.read_excel(
-            self.file_path,
-            sheet_name=sheet_name,
-            header=header_row
-        )
+        # Interpretar desde la fila de encabezados con el mismo analizador que usa
+        # read_excel (nombres de columnas y tipos iguales a header=header_row)
+        filas = df_temp.iloc[header_row:].fillna('').values.tolist()
+        df = TextParser(filas, header=0).read()
         
         # Limpiar datos
-        df = df.dropna(how='all')  # Eliminar filas vacías
-        df = df.reset_index(drop=True)
+        # Eliminar filas vacías y renumerar en una sola selección
+        filas_con_datos = ~df.isna().to_numpy().all(axis=1)
+        df = df.iloc[filas_con_datos].reset_index(drop=True)
         
-        # Agregar columna de sector
-        df['Sector_Hoja'] = sheet_name
+        # Agregar columna de sector (un único valor por hoja: se guarda como categoría)
+        df['Sector_Hoja'] = pd.Series(sheet_name, index=df.index).astype('category')
         
         return df
     
@@ -113,6 +165,10 @@ class BateriaIndicadoresLoader:
         Returns:
             Dict: {nombre_sector: [lista_de_indicadores]}
         """
+        # La extracción se hace una sola vez por carga de sectores
+        if self._indicadores_por_sector is not None:
+            return self._indicadores_por_sector
+        
         logger.info("Extrayendo indicadores por sector...")
         
         indicadores_por_sector = {}
@@ -120,17 +176,18 @@ class BateriaIndicadoresLoader:
         for sector, df in self.sectores_data.items():
             indicadores = []
             
-            for idx, row in df.iterrows():
-                # Buscar columnas de valores numéricos (resultados mensuales/anuales)
-                valores_dict = {}
-                for col in df.columns:
-                    if col not in ['Código Sector', 'Sector', 'Código Objetivo Resultado', 
-                                   'Objetivo de Resultado', 'Código Indicador de Resultado',
-                                   'Indicador de Resultado', 'Unidad de Medida', 'Meta Cuatrienio',
-                                   'Sector_Hoja']:
-                        valor = row.get(col)
-                        if pd.notna(valor) and isinstance(valor, (int, float)):
-                            valores_dict[str(col)] = float(valor)
+            # Columnas de valores numéricos (resultados mensuales/anuales)
+            columnas_valores = [col for col in df.columns if col not in COLUMNAS_METADATOS]
+            
+            nombres_valores = np.array([str(col) for col in columnas_valores], dtype=object)
+            bloque = _bloque_numerico(df, columnas_valores)
+            
+            # Registros como diccionarios: evita construir una Series por fila
+            for fila, (idx, row) in enumerate(zip(df.index, df.to_dict('records'))):
+                valores_fila = bloque[fila]
+                con_dato = ~np.isnan(valores_fila)
+                presentes = valores_fila[con_dato]
+                valores_dict = dict(zip(nombres_valores[con_dato].tolist(), presentes.tolist()))
                 
                 indicador = {
                     'id': f"{sector}_{idx}",
@@ -147,7 +204,7 @@ class BateriaIndicadoresLoader:
                     'valores': valores_dict,
                     'valores_mensuales': valores_dict,  # Alias para compatibilidad con visualización
                     'total_periodos': len(valores_dict),
-                    'promedio': np.mean(list(valores_dict.values())) if valores_dict else np.nan
+                    'promedio': presentes.mean() if valores_dict else np.nan
                 }
                 
                 indicadores.append(indicador)
@@ -156,6 +213,7 @@ class BateriaIndicadoresLoader:
         
         logger.info(f"Extracción completada: {len(indicadores_por_sector)} sectores procesados")
         
+        self._indicadores_por_sector = indicadores_por_sector
         return indicadores_por_sector
     
     def get_all_indicadores_flat(self) -> List[Dict]:
@@ -17,9 +17,16 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
+import importlib.util
+import json
+import os
 import warnings
 import logging
 
+from utils.cache import cached_call, file_signature
+from utils.config import CACHE_DIR, MESES_ORDEN
+from utils.helpers import ultimo_valor_mensual
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +36,117 @@ logger = logging.getLogger(__name__)
 
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
+# Versión del formato de los resultados procesados que se guardan en caché (indicadores,
+# históricos). Forma parte de la clave: se incrementa cada vez que cambia la estructura
+# de los diccionarios de indicadores para que no se sirvan resultados de versiones anteriores
+_VERSION_CACHE = 2
+
+# python-calamine es opcional: si está instalado se usa como motor de lectura
+CALAMINE_DISPONIBLE = importlib.util.find_spec('python_calamine') is not None
+
+
+def open_excel_file(file_path: str, engine: Optional[str] = None) -> pd.ExcelFile:
+    """
+    Abre un libro Excel con calamine si está disponible, o con el motor indicado.
+    
+    Args:
+        file_path (str): Ruta al archivo Excel
+        engine (str, optional): Motor a usar cuando calamine no está disponible
+            (None deja que pandas lo elija según la extensión)
+        
+    Returns:
+        pd.ExcelFile: Libro abierto
+    """
+    if CALAMINE_DISPONIBLE:
+        try:
+            return pd.ExcelFile(file_path, engine='calamine')
+        except Exception as e:
+            # pandas < 2.2 no reconoce el motor, o calamine no pudo leer el archivo
+            logger.debug("No se pudo abrir con calamine, se usa %s: %s", engine or 'el motor por defecto', e)
+    return pd.ExcelFile(file_path, engine=engine)
+
+
+def find_header_row(df_raw: pd.DataFrame, marker: str = 'Nombre del Indicador',
+                    max_rows: int = 10) -> Optional[int]:
+    """
+    Busca la fila de encabezados en una hoja leída sin encabezados.
+    
+    Args:
+        df_raw (pd.DataFrame): Hoja leída con header=None
+        marker (str): Texto que identifica la fila de encabezados
+        max_rows (int): Número de filas iniciales a revisar
+        
+    Returns:
+        Optional[int]: Índice de la fila de encabezados, o None si no se encontró
+    """
+    # Una sola búsqueda sobre el bloque de filas iniciales
+    hits = _contains_text(df_raw.head(max_rows).to_numpy(), marker).any(axis=1)
+    return _first_position(hits)
+
+
+def _contains_text(values: np.ndarray, marker: str, upper: bool = False) -> np.ndarray:
+    """
+    Marca las celdas cuyo texto contiene marker.
+    
+    Args:
+        values (np.ndarray): Celdas de la hoja (los vacíos se leen como 'nan')
+        marker (str): Texto a buscar
+        upper (bool): Si True, compara contra el texto en mayúsculas
+        
+    Returns:
+        np.ndarray: Máscara booleana con la misma forma que values
+    """
+    texto = values.astype(str)
+    if upper:
+        texto = np.char.upper(texto)
+    return np.char.find(texto, marker) >= 0
+
+
+def _first_position(mask: np.ndarray) -> Optional[int]:
+    """Posición del primer True de una máscara, o None si no hay ninguno."""
+    posiciones = np.flatnonzero(mask)
+    return int(posiciones[0]) if len(posiciones) else None
+
+
+def _header_row_cache_path(file_path: str, sheet_name) -> str:
+    """Ruta del archivo JSON con la fila de encabezados de una hoja del libro."""
+    return os.path.join(CACHE_DIR, f"encabezados_{file_signature(file_path)}_{sheet_name}.json")
+
+
+def load_header_row(file_path: str, sheet_name=0) -> Optional[int]:
+    """
+    Obtiene la fila de encabezados guardada para el libro, si el archivo no ha cambiado.
+    
+    Args:
+        file_path (str): Ruta al archivo Excel
+        sheet_name (str|int): Nombre o índice de la hoja
+        
+    Returns:
+        Optional[int]: Fila de encabezados guardada, o None si no existe
+    """
+    try:
+        with open(_header_row_cache_path(file_path, sheet_name), encoding='utf-8') as f:
+            return int(json.load(f)['header_row'])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_header_row(file_path: str, header_row: int, sheet_name=0) -> None:
+    """
+    Guarda la fila de encabezados detectada para evitar buscarla en próximas lecturas.
+    
+    Args:
+        file_path (str): Ruta al archivo Excel
+        header_row (int): Índice de la fila de encabezados
+        sheet_name (str|int): Nombre o índice de la hoja
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_header_row_cache_path(file_path, sheet_name), 'w', encoding='utf-8') as f:
+            json.dump({'header_row': int(header_row), 'mtime': os.path.getmtime(file_path)}, f)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la fila de encabezados: {e}")
+
 
 class ExcelDataLoader:
     """
@@ -55,6 +173,8 @@ class ExcelDataLoader:
         self.file_path = file_path
         self.df_raw = None
         self.df_processed = None
+        self._excel_file = None
+        self._historicos = {}
         self.metadata = {
             'file_path': file_path,
             'load_timestamp': datetime.now(),
@@ -65,6 +185,47 @@ class ExcelDataLoader:
         
         logger.info(f"Inicializando ExcelDataLoader para archivo: {file_path}")
     
+    def _get_excel_file(self) -> pd.ExcelFile:
+        """
+        Abre el libro Excel una sola vez y reutiliza el manejador en lecturas posteriores.
+        
+        Returns:
+            pd.ExcelFile: Libro abierto (calamine si está instalado, si no xlrd)
+        """
+        if self._excel_file is None:
+            self._excel_file = open_excel_file(self.file_path, engine='xlrd')
+        return self._excel_file
+    
+    def _read_sheet(self, sheet_name, header: Optional[int] = None) -> pd.DataFrame:
+        """
+        Lee una hoja del libro, usando una instantánea en disco si el archivo no ha cambiado.
+        
+        La primera lectura se hace con xlrd y se guarda en caché; las siguientes
+        ejecuciones cargan la instantánea sin volver a interpretar el .xls.
+        
+        Args:
+            sheet_name (str|int): Nombre o índice de la hoja
+            header (int, optional): Fila de encabezados (None para leer sin encabezados)
+            
+        Returns:
+            pd.DataFrame: Contenido de la hoja
+        """
+        key = f"hoja_{file_signature(self.file_path)}_{sheet_name}_{header}"
+        return cached_call(
+            key,
+            lambda: self._get_excel_file().parse(sheet_name=sheet_name, header=header)
+        )
+    
+    def _sheet_names(self) -> List[str]:
+        """
+        Obtiene los nombres de las hojas del libro, usando caché en disco.
+        
+        Returns:
+            List[str]: Nombres de las hojas
+        """
+        key = f"hojas_{file_signature(self.file_path)}"
+        return cached_call(key, lambda: list(self._get_excel_file().sheet_names))
+    
     def load_data(self, sheet_name: str = 0) -> pd.DataFrame:
         """
         Carga los datos del archivo Excel.
@@ -82,34 +243,25 @@ class ExcelDataLoader:
         try:
             logger.info(f"Cargando datos desde: {self.file_path}")
             
-            # Leer primero sin encabezados para detectar la estructura
-            df_temp = pd.read_excel(
-                self.file_path,
-                sheet_name=sheet_name,
-                header=None,
-                engine='xlrd'
-            )
-            
-            # Buscar la fila que contiene "Nombre del Indicador"
-            header_row = None
-            for i in range(min(10, len(df_temp))):
-                row_values = df_temp.iloc[i].astype(str).tolist()
-                if any('Nombre del Indicador' in str(val) for val in row_values):
-                    header_row = i
-                    logger.info(f"Encabezados encontrados en fila {i}")
-                    break
+            # Reutilizar la fila de encabezados detectada en una ejecución anterior
+            header_row = load_header_row(self.file_path, sheet_name)
             
             if header_row is None:
-                header_row = 0
-                logger.warning("No se encontró fila de encabezados, usando fila 0")
+                # Leer solo las primeras filas, sin encabezados, para detectar la estructura
+                df_temp = self._get_excel_file().parse(sheet_name=sheet_name, header=None, nrows=10)
+                
+                # Buscar la fila que contiene "Nombre del Indicador"
+                header_row = find_header_row(df_temp)
+                
+                if header_row is None:
+                    header_row = 0
+                    logger.warning("No se encontró fila de encabezados, usando fila 0")
+                else:
+                    logger.info(f"Encabezados encontrados en fila {header_row}")
+                    save_header_row(self.file_path, header_row, sheet_name)
             
             # Volver a leer con el encabezado correcto
-            self.df_raw = pd.read_excel(
-                self.file_path,
-                sheet_name=sheet_name,
-                header=header_row,
-                engine='xlrd'
-            )
+            self.df_raw = self._read_sheet(sheet_name, header=header_row)
             
             # Si hay una segunda fila de encabezados (sub-encabezados de semaforización)
             # la procesaremos en el método de limpieza
@@ -196,7 +348,7 @@ class ExcelDataLoader:
             df = df.iloc[1:].reset_index(drop=True)
         
         # Eliminar filas completamente vacías
-        df = df.dropna(how='all')
+        df = df.iloc[~df.isna().to_numpy().all(axis=1)]
         
         # Limpiar nombres de columnas
         df.columns = [str(col).strip() if col else col for col in df.columns]
@@ -235,30 +387,27 @@ class ExcelDataLoader:
         
         existing_months = [col for col in month_columns if col in df.columns]
         
-        # Limpiar valores en columnas de meses
-        for col in existing_months:
-            # Reemplazar valores especiales
-            df[col] = df[col].replace(['#DIV/0!', '#DIV/0', 'NA', 'N/A', 'na', ''], np.nan)
+        # Columnas numéricas a limpiar: meses, Meta y semaforización
+        semaforo_cols = ['Nivel Obtenido', 'Nivel Satisfactorio', 'Nivel Crítico']
+        numeric_cols = existing_months + [col for col in ['Meta'] + semaforo_cols if col in df.columns]
+        
+        # Las columnas que ya llegan como números no necesitan la limpieza de texto
+        # (convertirlas a string y de vuelta da los mismos valores)
+        text_cols = [
+            col for col in numeric_cols
+            if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col])
+        ]
+        
+        if text_cols:
+            # Reemplazar valores especiales en todo el bloque
+            # (los que no aplican a Meta/semaforización se anulan igual al convertir)
+            block = df[text_cols].replace(['#DIV/0!', '#DIV/0', 'NA', 'N/A', 'na', ''], np.nan)
             
             # Convertir a string y limpiar porcentajes
-            df[col] = df[col].astype(str).str.replace('%', '').str.strip()
+            block = block.astype(str).apply(lambda s: s.str.replace('%', '', regex=False).str.strip())
             
             # Convertir a numérico
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Limpiar columna Meta
-        if 'Meta' in df.columns:
-            df['Meta'] = df['Meta'].replace(['NA', 'N/A', ''], np.nan)
-            df['Meta'] = df['Meta'].astype(str).str.replace('%', '').str.strip()
-            df['Meta'] = pd.to_numeric(df['Meta'], errors='coerce')
-        
-        # Limpiar columnas de semaforización
-        semaforo_cols = ['Nivel Obtenido', 'Nivel Satisfactorio', 'Nivel Crítico']
-        for col in semaforo_cols:
-            if col in df.columns:
-                df[col] = df[col].replace(['NA', 'N/A', ''], np.nan)
-                df[col] = df[col].astype(str).str.replace('%', '').str.strip()
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            df[text_cols] = block.apply(pd.to_numeric, errors='coerce')
         
         self.df_processed = df
         self.metadata['valid_indicators'] = len(df)
@@ -278,56 +427,78 @@ class ExcelDataLoader:
         Returns:
             Dict: Diccionario con datos históricos por trimestre/periodo
         """
-        try:
-            df_sheet = pd.read_excel(
-                self.file_path,
-                sheet_name=sheet_name,
-                header=None,
-                engine='xlrd'
-            )
-            
-            # Buscar la fila "RESULTADOS VIGENCIA"
-            resultados_row = None
-            for i in range(len(df_sheet)):
-                if pd.notna(df_sheet.iloc[i, 1]) and 'RESULTADOS VIGENCIA' in str(df_sheet.iloc[i, 1]):
-                    resultados_row = i
-                    break
-            
-            if resultados_row is None:
-                return {}
-            
-            # La siguiente fila tiene los encabezados de periodos
-            periodos_row = resultados_row + 1
-            resultado_row = None
-            
-            # Buscar la fila con "RESULTADO"
-            for i in range(periodos_row, min(periodos_row + 10, len(df_sheet))):
-                if pd.notna(df_sheet.iloc[i, 0]) and 'RESULTADO' in str(df_sheet.iloc[i, 0]).upper():
-                    resultado_row = i
-                    break
-            
-            if resultado_row is None:
-                return {}
-            
-            # Extraer periodos y valores
-            historico = {}
-            
-            # Leer encabezados de periodos y valores
-            for col in range(1, df_sheet.shape[1]):
-                periodo = df_sheet.iloc[periodos_row, col]
-                if pd.notna(periodo) and str(periodo) not in ['Promedio', 'NaN', 'nan', '']:
-                    valor = df_sheet.iloc[resultado_row, col]
-                    if pd.notna(valor):
-                        try:
-                            historico[str(periodo)] = float(valor)
-                        except (ValueError, TypeError):
-                            pass
-            
-            return historico
+        if sheet_name not in self._historicos:
+            self._prefetch_historicos([sheet_name])
+        return dict(self._historicos[sheet_name])
+    
+    def _prefetch_historicos(self, hojas: List[str]) -> None:
+        """
+        Extrae de una vez el histórico de varias hojas y lo guarda en memoria.
+        
+        El libro se abre una sola vez para todas las hojas y cada histórico ya
+        extraído se guarda en disco por libro y hoja (no la hoja completa).
+        
+        Args:
+            hojas (List[str]): Nombres de las hojas de indicadores
+        """
+        firma = file_signature(self.file_path)
+        
+        for hoja in hojas:
+            if hoja in self._historicos:
+                continue
+            try:
+                self._historicos[hoja] = cached_call(
+                    f"historico_v{_VERSION_CACHE}_{firma}_{hoja}",
+                    lambda: self._historico_from_df(self._get_excel_file().parse(sheet_name=hoja, header=None))
+                )
+            except Exception as e:
+                logger.debug("No se pudo extraer histórico de %s: %s", hoja, e)
+                self._historicos[hoja] = {}
+    
+    @staticmethod
+    def _historico_from_df(df_sheet: pd.DataFrame) -> Dict:
+        """
+        Extrae los valores por periodo de la hoja individual de un indicador.
+        
+        Args:
+            df_sheet (pd.DataFrame): Hoja leída sin encabezados
             
-        except Exception as e:
-            logger.debug(f"No se pudo extraer histórico de {sheet_name}: {e}")
+        Returns:
+            Dict: Diccionario {periodo: valor}, vacío si la hoja no tiene la sección de resultados
+        """
+        # Buscar la fila "RESULTADOS VIGENCIA"
+        resultados_row = _first_position(_contains_text(df_sheet.iloc[:, 1].to_numpy(), 'RESULTADOS VIGENCIA'))
+        
+        if resultados_row is None:
+            return {}
+        
+        # La siguiente fila tiene los encabezados de periodos
+        periodos_row = resultados_row + 1
+        
+        # Buscar la fila con "RESULTADO"
+        resultado_row = _first_position(
+            _contains_text(df_sheet.iloc[periodos_row:periodos_row + 10, 0].to_numpy(), 'RESULTADO', upper=True)
+        )
+        
+        if resultado_row is None:
             return {}
+        resultado_row += periodos_row
+        
+        # Extraer periodos y valores
+        historico = {}
+        
+        # Leer encabezados de periodos y valores
+        for col in range(1, df_sheet.shape[1]):
+            periodo = df_sheet.iloc[periodos_row, col]
+            if pd.notna(periodo) and str(periodo) not in ['Promedio', 'NaN', 'nan', '']:
+                valor = df_sheet.iloc[resultado_row, col]
+                if pd.notna(valor):
+                    try:
+                        historico[str(periodo)] = float(valor)
+                    except (ValueError, TypeError):
+                        pass
+        
+        return historico
     
     def extract_indicators_data(self, incluir_historico: bool = True) -> List[Dict]:
         """
@@ -355,48 +526,81 @@ class ExcelDataLoader:
         hojas_disponibles = []
         if incluir_historico:
             try:
-                xl_file = pd.ExcelFile(self.file_path, engine='xlrd')
-                hojas_disponibles = [h for h in xl_file.sheet_names if h != 'CONSOLIDADO']
+                hojas_disponibles = [h for h in self._sheet_names() if h != 'CONSOLIDADO']
                 logger.info(f"Extrayendo histórico de {len(hojas_disponibles)} hojas individuales")
             except Exception as e:
                 logger.warning(f"No se pudieron listar las hojas: {e}")
                 incluir_historico = False
         
-        for idx, row in self.df_processed.iterrows():
+        df = self.df_processed
+        n_filas = len(df)
+        
+        def columna(nombre, defecto=np.nan) -> List:
+            """Valores de una columna como lista (o el valor por defecto si no existe)."""
+            return df[nombre].tolist() if nombre in df.columns else [defecto] * n_filas
+        
+        # Columnas resueltas una sola vez; cada fila se lee por posición
+        numeros = columna('#', None)
+        nombres = columna('Nombre del Indicador', 'Sin nombre')
+        metas = columna('Meta')
+        niveles_obtenidos = columna('Nivel Obtenido')
+        niveles_satisfactorios = columna('Nivel Satisfactorio')
+        niveles_criticos = columna('Nivel Crítico')
+        
+        # Bloque de meses (año actual) con NaN donde no hay dato
+        bloque_meses = df[existing_months].to_numpy(dtype=np.float64, na_value=np.nan)
+        nombres_meses = np.array(existing_months, dtype=object)
+        
+        numeros = [int(numero) if numero is not None else idx + 1
+                   for numero, idx in zip(numeros, df.index)]
+        
+        # Históricos de todas las hojas referenciadas, con el libro abierto una vez
+        if incluir_historico and hojas_disponibles:
+            self._prefetch_historicos(list(dict.fromkeys(
+                hojas_disponibles[numero - 1] for numero in numeros
+                if 0 < numero <= len(hojas_disponibles)
+            )))
+        
+        for i, idx in enumerate(df.index):
+            numero = numeros[i]
+            
             # Extraer valores mensuales del consolidado (año actual)
-            monthly_values = {}
-            for month in existing_months:
-                value = row.get(month, np.nan)
-                if pd.notna(value):
-                    monthly_values[month] = float(value)
+            valores_fila = bloque_meses[i]
+            con_dato = ~np.isnan(valores_fila)
+            presentes = valores_fila[con_dato]
+            monthly_values = dict(zip(nombres_meses[con_dato].tolist(), presentes.tolist()))
             
             # Intentar extraer histórico de hoja individual
             historico = {}
             if incluir_historico and hojas_disponibles:
-                num_indicador = int(row.get('#', idx + 1))
-                if 0 < num_indicador <= len(hojas_disponibles):
-                    hoja_nombre = hojas_disponibles[num_indicador - 1]
+                if 0 < numero <= len(hojas_disponibles):
+                    hoja_nombre = hojas_disponibles[numero - 1]
                     historico = self.extract_historico_from_sheet(hoja_nombre)
                     if historico:
-                        logger.debug(f"Indicador {num_indicador}: {len(historico)} periodos históricos")
+                        logger.debug("Indicador %d: %d periodos históricos", numero, len(historico))
             
             # Combinar valores actuales y históricos
             valores_completos = {**historico, **monthly_values}
             
+            # Último mes con dato (se calcula una vez aquí para todos los consumidores)
+            ultimo_mes, ultimo_valor = ultimo_valor_mensual(valores_completos)
+            
             # Crear diccionario de indicador
             indicator = {
                 'id': idx,
-                'numero': int(row.get('#', idx + 1)),
-                'nombre': row.get('Nombre del Indicador', 'Sin nombre'),
-                'meta': row.get('Meta', np.nan),
-                'nivel_obtenido': row.get('Nivel Obtenido', np.nan),
-                'nivel_satisfactorio': row.get('Nivel Satisfactorio', np.nan),
-                'nivel_critico': row.get('Nivel Crítico', np.nan),
+                'numero': numero,
+                'nombre': nombres[i],
+                'meta': metas[i],
+                'nivel_obtenido': niveles_obtenidos[i],
+                'nivel_satisfactorio': niveles_satisfactorios[i],
+                'nivel_critico': niveles_criticos[i],
                 'valores_mensuales': valores_completos,  # Histórico + año actual
                 'historico': historico,  # Solo histórico (para referencia)
                 'valores_actuales': monthly_values,  # Solo año actual (para referencia)
                 'total_periodos': len(valores_completos),
-                'promedio': np.mean(list(monthly_values.values())) if monthly_values else np.nan
+                'promedio': presentes.mean() if monthly_values else np.nan,
+                'ultimo_mes': ultimo_mes,
+                'ultimo_valor': ultimo_valor if ultimo_valor is not None else np.nan
             }
             
             indicators_data.append(indicator)
@@ -456,3 +660,49 @@ def load_and_process_excel(file_path: str) -> Tuple[pd.DataFrame, List[Dict], Di
     summary = loader.get_summary()
     
     return df_clean, indicators, summary
+
+
+def indicadores_to_dataframe(indicators: List[Dict]) -> pd.DataFrame:
+    """
+    Convierte la lista de indicadores en un DataFrame columnar.
+    
+    Permite filtrar, contar y formatear indicadores con operaciones vectorizadas
+    en lugar de recorrer la lista de diccionarios campo por campo.
+    
+    Args:
+        indicators (List[Dict]): Lista de indicadores (ver extract_indicators_data)
+        
+    Returns:
+        pd.DataFrame: Una fila por indicador con columnas nombre, meta, nivel_obtenido,
+        nivel_satisfactorio, nivel_critico, ultimo_valor y una columna por mes (Enero..Diciembre)
+    """
+    campos = ['nombre', 'meta', 'nivel_obtenido', 'nivel_satisfactorio', 'nivel_critico', 'ultimo_valor']
+    
+    data = {campo: [ind.get(campo, np.nan) for ind in indicators] for campo in campos}
+    for mes in MESES_ORDEN:
+        data[mes] = [ind.get('valores_mensuales', {}).get(mes, np.nan) for ind in indicators]
+    
+    df = pd.DataFrame(data)
+    numericas = campos[1:] + list(MESES_ORDEN)
+    df[numericas] = df[numericas].apply(pd.to_numeric, errors='coerce')
+    
+    return df
+
+
+def load_and_process_excel_cached(file_path: str, refresh: bool = False) -> Tuple[pd.DataFrame, List[Dict], Dict]:
+    """
+    Versión con caché en disco de load_and_process_excel.
+    
+    El resultado se guarda la primera vez y se reutiliza mientras el archivo
+    Excel no cambie (misma ruta, fecha de modificación y tamaño) ni cambie
+    _VERSION_CACHE.
+    
+    Args:
+        file_path (str): Ruta al archivo Excel
+        refresh (bool): Si True, vuelve a procesar el archivo y reemplaza el resultado guardado
+        
+    Returns:
+        Tuple[pd.DataFrame, List[Dict], Dict]: (dataframe_procesado, lista_indicadores, resumen)
+    """
+    key = f"excel_v{_VERSION_CACHE}_{file_signature(file_path)}"
+    return cached_call(key, lambda: load_and_process_excel(file_path), refresh=refresh)
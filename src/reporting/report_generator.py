@@ -12,7 +12,7 @@ Utiliza ReportLab para generación de PDFs estructurados.
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
 from reportlab.platypus import (
@@ -20,16 +20,278 @@ from reportlab.platypus import (
     PageBreak, Image, KeepTogether
 )
 from reportlab.pdfgen import canvas
+from collections import Counter
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from datetime import datetime
-import pandas as pd
+from functools import lru_cache
 import numpy as np
 from typing import Dict, List, Optional
 import logging
 import os
 from io import BytesIO
 
+from utils.helpers import get_month_name_es
+
 logger = logging.getLogger(__name__)
 
+# Formatos de las celdas de porcentaje (las celdas de las tablas son texto plano)
+_formato_porcentaje = '{:.1f}%'.format
+_formato_porcentaje_2d = '{:.2f}%'.format
+
+# Recomendaciones que se incluyen en todos los informes, después de las
+# que dependen de los datos
+_RECOMENDACIONES_GENERALES = (
+    "• <b>Actualización periódica:</b> Mantener la captura de datos actualizada "
+    "para garantizar el seguimiento efectivo de los indicadores.",
+    "• <b>Socialización de resultados:</b> Compartir este análisis con las áreas "
+    "responsables para promover la toma de decisiones basada en datos."
+)
+
+# Máximo de indicadores críticos que se listan en la tabla del informe
+_MAX_CRITICOS_TABLA = 10
+
+
+def _calcular_metricas(indicadores_list: List[Dict], analisis_list: List[Dict]) -> Dict:
+    """
+    Calcula en una sola pasada los conteos que usan las secciones del informe.
+    
+    Args:
+        indicadores_list (List[Dict]): Lista de indicadores
+        analisis_list (List[Dict]): Lista de análisis (alineada con indicadores_list)
+        
+    Returns:
+        Dict: total, conteos por semáforo, tendencia y periodicidad, el total de
+        indicadores críticos y los primeros pares (indicador, análisis) en estado
+        crítico (hasta _MAX_CRITICOS_TABLA)
+    """
+    semaforos = Counter()
+    tendencias = Counter()
+    periodicidades = Counter()
+    criticos = []
+    total_criticos = 0
+    
+    total_indicadores = len(indicadores_list)
+    for i, anal in enumerate(analisis_list):
+        semaforo = anal.get('semaforo')
+        semaforos[semaforo] += 1
+        tendencias[anal.get('tendencia', 'Insuficiente')] += 1
+        periodicidades[anal.get('periodicidad', 'Indeterminada')] += 1
+        if semaforo == 'Rojo' and i < total_indicadores:
+            total_criticos += 1
+            # Solo se guardan los que caben en la tabla
+            if total_criticos <= _MAX_CRITICOS_TABLA:
+                criticos.append((indicadores_list[i], anal))
+    
+    return {
+        'total': len(analisis_list),
+        'semaforos': semaforos,
+        'tendencias': tendencias,
+        'periodicidades': periodicidades,
+        'total_criticos': total_criticos,
+        'criticos': criticos
+    }
+
+
+# Fragmentos comunes de los estilos de tabla (el orden de los comandos se conserva)
+_COLOR_ENCABEZADO = colors.HexColor('#2E86AB')
+_COLOR_ENCABEZADO_CRITICO = colors.HexColor('#dc3545')
+_TEXTO_ENCABEZADO = ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke)
+_FUENTE_ENCABEZADO = ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold')
+_RELLENO_ENCABEZADO = ('BOTTOMPADDING', (0, 0), (-1, 0), 12)
+_CUADRICULA = ('GRID', (0, 0), (-1, -1), 1, colors.black)
+_FILAS_ALTERNAS = ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+
+_COMANDOS_TABLA = {
+    'resumen': (
+        ('BACKGROUND', (0, 0), (-1, 0), _COLOR_ENCABEZADO),
+        _TEXTO_ENCABEZADO,
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        _FUENTE_ENCABEZADO,
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        _RELLENO_ENCABEZADO,
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        _CUADRICULA,
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        _FILAS_ALTERNAS
+    ),
+    'periodicidad': (
+        ('BACKGROUND', (0, 0), (-1, 0), _COLOR_ENCABEZADO),
+        _TEXTO_ENCABEZADO,
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        _FUENTE_ENCABEZADO,
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        _RELLENO_ENCABEZADO,
+        _CUADRICULA,
+        _FILAS_ALTERNAS
+    ),
+    'tendencias': (
+        ('BACKGROUND', (0, 0), (-1, 0), _COLOR_ENCABEZADO),
+        _TEXTO_ENCABEZADO,
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+        _FUENTE_ENCABEZADO,
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        _RELLENO_ENCABEZADO,
+        _CUADRICULA,
+        _FILAS_ALTERNAS
+    ),
+    'criticos': (
+        ('BACKGROUND', (0, 0), (-1, 0), _COLOR_ENCABEZADO_CRITICO),
+        _TEXTO_ENCABEZADO,
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        _FUENTE_ENCABEZADO,
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        _RELLENO_ENCABEZADO,
+        _CUADRICULA,
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8d7da')])
+    )
+}
+
+
+@lru_cache(maxsize=None)
+def _estilo_tabla(tipo: str) -> TableStyle:
+    """
+    Construye una sola vez el TableStyle de cada tipo de tabla del informe.
+    Table.setStyle solo lee los comandos, así que el estilo se comparte.
+    
+    Args:
+        tipo (str): 'resumen', 'periodicidad', 'tendencias' o 'criticos'
+        
+    Returns:
+        TableStyle: Estilo compartido para ese tipo de tabla
+    """
+    return TableStyle(_COMANDOS_TABLA[tipo])
+
+
+@lru_cache(maxsize=1)
+def _hoja_estilos() -> StyleSheet1:
+    """
+    Construye una sola vez la hoja de estilos del informe (base de ReportLab más
+    los estilos personalizados). Los estilos solo se leen, así que todos los
+    generadores comparten la misma hoja.
+    
+    Returns:
+        StyleSheet1: Hoja de estilos con TituloCustom, SubtituloCustom,
+        SeccionCustom y JustificadoCustom
+    """
+    styles = getSampleStyleSheet()
+    
+    # Estilo de título principal
+    styles.add(ParagraphStyle(
+        name='TituloCustom',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2E86AB'),
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Estilo de subtítulo
+    styles.add(ParagraphStyle(
+        name='SubtituloCustom',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#555555'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica'
+    ))
+    
+    # Estilo de sección
+    styles.add(ParagraphStyle(
+        name='SeccionCustom',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2E86AB'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold',
+        borderWidth=1,
+        borderColor=colors.HexColor('#2E86AB'),
+        borderPadding=5,
+        backColor=colors.HexColor('#E8F4F8')
+    ))
+    
+    # Estilo de texto justificado
+    styles.add(ParagraphStyle(
+        name='JustificadoCustom',
+        parent=styles['BodyText'],
+        alignment=TA_JUSTIFY,
+        fontSize=11,
+        spaceAfter=10
+    ))
+    
+    return styles
+
+
+# Filas de datos por tabla antes de partirla (cabe en una página carta)
+_FILAS_POR_BLOQUE = 40
+
+
+def _tablas_por_bloques(datos_tabla: List[List], anchos: List[float], tipo: str, filas_por_bloque: int = _FILAS_POR_BLOQUE):
+    """
+    Genera una tabla por cada bloque de filas, repitiendo el encabezado. Así
+    ReportLab diagrama cada bloque por separado en lugar de partir una tabla
+    larga en cada salto de página.
+    
+    Args:
+        datos_tabla (List[List]): Encabezado seguido de las filas de datos
+        anchos (List[float]): Ancho de cada columna
+        tipo (str): Tipo de tabla para _estilo_tabla
+        filas_por_bloque (int): Máximo de filas de datos por tabla
+        
+    Yields:
+        Table: Tablas con el estilo del tipo indicado
+    """
+    encabezado, filas = datos_tabla[0], datos_tabla[1:]
+    estilo = _estilo_tabla(tipo)
+    
+    for inicio in range(0, max(len(filas), 1), filas_por_bloque):
+        tabla = Table([encabezado] + filas[inicio:inicio + filas_por_bloque], colWidths=anchos, repeatRows=1)
+        tabla.setStyle(estilo)
+        yield tabla
+
+
+@lru_cache(maxsize=256)
+def _fragmentos_parrafo(texto: str, nombre_estilo: str) -> tuple:
+    """
+    Analiza una sola vez el marcado de un párrafo del informe y guarda los
+    fragmentos resultantes por (texto, estilo). ReportLab escribe atributos en
+    los fragmentos al maquetar, así que estos sirven solo como plantilla:
+    _parrafo entrega a cada Paragraph sus propias copias.
+    
+    Args:
+        texto (str): Texto del párrafo (admite el marcado de ReportLab)
+        nombre_estilo (str): Nombre del estilo en _hoja_estilos()
+        
+    Returns:
+        tuple: (estilo, fragmentos plantilla, viñeta) para construir el Paragraph
+    """
+    parrafo = Paragraph(texto, _hoja_estilos()[nombre_estilo])
+    return parrafo.style, tuple(parrafo.frags), parrafo.bulletText
+
+
+def _parrafo(texto: str, nombre_estilo: str) -> Paragraph:
+    """
+    Crea un Paragraph nuevo con copias de los fragmentos ya analizados (sin
+    volver a pasar el parser y sin compartir fragmentos entre párrafos o hilos).
+    
+    Args:
+        texto (str): Texto del párrafo
+        nombre_estilo (str): Nombre del estilo en _hoja_estilos()
+        
+    Returns:
+        Paragraph: Párrafo listo para agregar al story
+    """
+    estilo, fragmentos, vineta = _fragmentos_parrafo(texto, nombre_estilo)
+    return Paragraph(texto, estilo, bulletText=vineta, frags=[copy(fragmento) for fragmento in fragmentos])
+
 
 class PDFReportGenerator:
     """
@@ -56,63 +318,15 @@ class PDFReportGenerator:
             rightMargin=0.75*inch,
             leftMargin=0.75*inch,
             topMargin=0.75*inch,
-            bottomMargin=0.75*inch
+            bottomMargin=0.75*inch,
+            # Salida determinista (mismo contenido -> mismos bytes) y streams comprimidos
+            invariant=1,
+            pageCompression=1
         )
-        self.story = []
-        self.styles = getSampleStyleSheet()
-        self._configurar_estilos()
+        self.styles = _hoja_estilos()
         
         logger.info(f"PDFReportGenerator inicializado")
     
-    def _configurar_estilos(self):
-        """Configura estilos personalizados para el documento."""
-        
-        # Estilo de título principal
-        self.styles.add(ParagraphStyle(
-            name='TituloCustom',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2E86AB'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Estilo de subtítulo
-        self.styles.add(ParagraphStyle(
-            name='SubtituloCustom',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#555555'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        ))
-        
-        # Estilo de sección
-        self.styles.add(ParagraphStyle(
-            name='SeccionCustom',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#2E86AB'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold',
-            borderWidth=1,
-            borderColor=colors.HexColor('#2E86AB'),
-            borderPadding=5,
-            backColor=colors.HexColor('#E8F4F8')
-        ))
-        
-        # Estilo de texto justificado
-        self.styles.add(ParagraphStyle(
-            name='JustificadoCustom',
-            parent=self.styles['BodyText'],
-            alignment=TA_JUSTIFY,
-            fontSize=11,
-            spaceAfter=10
-        ))
-    
     def agregar_portada(self, titulo: str, subtitulo: str, entidad: str, fecha: Optional[str] = None):
         """
         Agrega una portada al reporte.
@@ -122,34 +336,39 @@ class PDFReportGenerator:
             subtitulo (str): Subtítulo
             entidad (str): Nombre de la entidad
             fecha (str, optional): Fecha del reporte
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
         if fecha is None:
-            fecha = datetime.now().strftime('%d de %B de %Y')
+            # Mes en español sin depender del locale del sistema (%B)
+            hoy = datetime.now()
+            fecha = f"{hoy.day:02d} de {get_month_name_es(hoy.month).lower()} de {hoy.year}"
         
         # Espaciado superior
-        self.story.append(Spacer(1, 2*inch))
+        yield Spacer(1, 2*inch)
         
         # Título principal
-        titulo_p = Paragraph(titulo, self.styles['TituloCustom'])
-        self.story.append(titulo_p)
-        self.story.append(Spacer(1, 0.3*inch))
+        titulo_p = _parrafo(titulo, 'TituloCustom')
+        yield titulo_p
+        yield Spacer(1, 0.3*inch)
         
         # Subtítulo
-        subtitulo_p = Paragraph(subtitulo, self.styles['SubtituloCustom'])
-        self.story.append(subtitulo_p)
-        self.story.append(Spacer(1, 1.5*inch))
+        subtitulo_p = _parrafo(subtitulo, 'SubtituloCustom')
+        yield subtitulo_p
+        yield Spacer(1, 1.5*inch)
         
         # Información de la entidad
-        entidad_p = Paragraph(f"<b>{entidad}</b>", self.styles['SubtituloCustom'])
-        self.story.append(entidad_p)
-        self.story.append(Spacer(1, 0.2*inch))
+        entidad_p = _parrafo(f"<b>{entidad}</b>", 'SubtituloCustom')
+        yield entidad_p
+        yield Spacer(1, 0.2*inch)
         
         # Fecha
-        fecha_p = Paragraph(fecha, self.styles['SubtituloCustom'])
-        self.story.append(fecha_p)
+        fecha_p = _parrafo(fecha, 'SubtituloCustom')
+        yield fecha_p
         
         # Salto de página
-        self.story.append(PageBreak())
+        yield PageBreak()
     
     def agregar_seccion(self, titulo: str, contenido: str):
         """
@@ -158,22 +377,44 @@ class PDFReportGenerator:
         Args:
             titulo (str): Título de la sección
             contenido (str): Contenido en formato texto o HTML
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
-        titulo_p = Paragraph(titulo, self.styles['SeccionCustom'])
-        self.story.append(titulo_p)
+        titulo_p = _parrafo(titulo, 'SeccionCustom')
+        yield titulo_p
         
-        contenido_p = Paragraph(contenido, self.styles['JustificadoCustom'])
-        self.story.append(contenido_p)
-        self.story.append(Spacer(1, 0.2*inch))
+        contenido_p = _parrafo(contenido, 'JustificadoCustom')
+        yield contenido_p
+        yield Spacer(1, 0.2*inch)
+    
+    def _agregar_tabla(self, datos_tabla: List[List], anchos: List[float], tipo: str):
+        """
+        Agrega una tabla del informe con el estilo compartido de su tipo, partida
+        en bloques de una página, seguida del espacio estándar entre secciones.
+        
+        Args:
+            datos_tabla (List[List]): Encabezado seguido de las filas de datos
+            anchos (List[float]): Ancho de cada columna
+            tipo (str): Tipo de tabla para _estilo_tabla
+            
+        Yields:
+            Flowable: Tablas y espaciado final
+        """
+        yield from _tablas_por_bloques(datos_tabla, anchos, tipo)
+        yield Spacer(1, 0.3*inch)
     
-    def agregar_resumen_ejecutivo(self, analisis_list: List[Dict]):
+    def agregar_resumen_ejecutivo(self, metricas: Dict):
         """
         Agrega un resumen ejecutivo con métricas principales.
         
         Args:
-            analisis_list (List[Dict]): Lista de análisis de indicadores
+            metricas (Dict): Conteos del informe (ver _calcular_metricas)
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
-        self.agregar_seccion(
+        yield from self.agregar_seccion(
             "1. RESUMEN EJECUTIVO",
             "Este informe presenta el análisis integral de los indicadores institucionales bajo "
             "el marco del Modelo Integrado de Planeación y Gestión (MIPG). Se evaluaron los "
@@ -182,10 +423,10 @@ class PDFReportGenerator:
         )
         
         # Calcular métricas
-        total = len(analisis_list)
-        verdes = sum(1 for a in analisis_list if a.get('semaforo') == 'Verde')
-        amarillos = sum(1 for a in analisis_list if a.get('semaforo') == 'Amarillo')
-        rojos = sum(1 for a in analisis_list if a.get('semaforo') == 'Rojo')
+        total = metricas['total']
+        verdes = metricas['semaforos']['Verde']
+        amarillos = metricas['semaforos']['Amarillo']
+        rojos = metricas['semaforos']['Rojo']
         
         pct_verde = (verdes / total * 100) if total > 0 else 0
         pct_amarillo = (amarillos / total * 100) if total > 0 else 0
@@ -195,89 +436,59 @@ class PDFReportGenerator:
         datos_tabla = [
             ['MÉTRICA', 'VALOR', 'PORCENTAJE'],
             ['Total de Indicadores Evaluados', str(total), '100%'],
-            ['Indicadores en Estado Satisfactorio (Verde)', str(verdes), f'{pct_verde:.1f}%'],
-            ['Indicadores en Estado Alerta (Amarillo)', str(amarillos), f'{pct_amarillo:.1f}%'],
-            ['Indicadores en Estado Crítico (Rojo)', str(rojos), f'{pct_rojo:.1f}%']
+            ['Indicadores en Estado Satisfactorio (Verde)', str(verdes), _formato_porcentaje(pct_verde)],
+            ['Indicadores en Estado Alerta (Amarillo)', str(amarillos), _formato_porcentaje(pct_amarillo)],
+            ['Indicadores en Estado Crítico (Rojo)', str(rojos), _formato_porcentaje(pct_rojo)]
         ]
         
-        tabla = Table(datos_tabla, colWidths=[3.5*inch, 1.5*inch, 1.5*inch])
-        tabla.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
-        
-        self.story.append(tabla)
-        self.story.append(Spacer(1, 0.3*inch))
-    
-    def agregar_analisis_por_periodicidad(self, analisis_list: List[Dict]):
+        yield from self._agregar_tabla(datos_tabla, [3.5*inch, 1.5*inch, 1.5*inch], 'resumen')
+    
+    def agregar_analisis_por_periodicidad(self, metricas: Dict):
         """
         Agrega análisis de indicadores por periodicidad.
         
         Args:
-            analisis_list (List[Dict]): Lista de análisis
+            metricas (Dict): Conteos del informe (ver _calcular_metricas)
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
-        self.agregar_seccion(
+        yield from self.agregar_seccion(
             "2. ANÁLISIS POR PERIODICIDAD",
             "Los indicadores se clasifican según su frecuencia de medición, lo que permite "
             "identificar patrones de seguimiento y control institucional."
         )
         
-        # Contar por periodicidad
-        periodicidades = {}
-        for anal in analisis_list:
-            per = anal.get('periodicidad', 'Indeterminada')
-            periodicidades[per] = periodicidades.get(per, 0) + 1
+        periodicidades = metricas['periodicidades']
         
         # Crear tabla
         datos_tabla = [['PERIODICIDAD', 'CANTIDAD', 'PORCENTAJE']]
         
-        total = len(analisis_list)
-        for per, cant in sorted(periodicidades.items(), key=lambda x: x[1], reverse=True):
-            pct = (cant / total * 100) if total > 0 else 0
-            datos_tabla.append([per, str(cant), f'{pct:.1f}%'])
-        
-        tabla = Table(datos_tabla, colWidths=[3*inch, 2*inch, 2*inch])
-        tabla.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
-        
-        self.story.append(tabla)
-        self.story.append(Spacer(1, 0.3*inch))
-    
-    def agregar_analisis_tendencias(self, analisis_list: List[Dict]):
+        total = metricas['total']
+        datos_tabla.extend(
+            [per, str(cant), _formato_porcentaje((cant / total * 100) if total > 0 else 0)]
+            for per, cant in sorted(periodicidades.items(), key=lambda x: x[1], reverse=True)
+        )
+        
+        yield from self._agregar_tabla(datos_tabla, [3*inch, 2*inch, 2*inch], 'periodicidad')
+    
+    def agregar_analisis_tendencias(self, metricas: Dict):
         """
         Agrega análisis de tendencias de los indicadores.
         
         Args:
-            analisis_list (List[Dict]): Lista de análisis
+            metricas (Dict): Conteos del informe (ver _calcular_metricas)
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
-        self.agregar_seccion(
+        yield from self.agregar_seccion(
             "3. ANÁLISIS DE TENDENCIAS",
             "El análisis de tendencias permite identificar el comportamiento de los indicadores "
             "a lo largo del tiempo, detectando patrones de crecimiento, estabilidad o retroceso."
         )
         
-        # Contar por tendencia
-        tendencias = {}
-        for anal in analisis_list:
-            tend = anal.get('tendencia', 'Insuficiente')
-            tendencias[tend] = tendencias.get(tend, 0) + 1
+        tendencias = metricas['tendencias']
         
         # Crear tabla
         datos_tabla = [['TENDENCIA', 'CANTIDAD', 'INTERPRETACIÓN']]
@@ -294,92 +505,68 @@ class PDFReportGenerator:
             interp = interpretaciones.get(tend, 'N/A')
             datos_tabla.append([tend, str(cant), interp])
         
-        tabla = Table(datos_tabla, colWidths=[2*inch, 1.5*inch, 3.5*inch])
-        tabla.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
-        
-        self.story.append(tabla)
-        self.story.append(Spacer(1, 0.3*inch))
-    
-    def agregar_indicadores_criticos(self, indicadores_list: List[Dict], analisis_list: List[Dict]):
+        yield from self._agregar_tabla(datos_tabla, [2*inch, 1.5*inch, 3.5*inch], 'tendencias')
+    
+    def agregar_indicadores_criticos(self, metricas: Dict):
         """
         Agrega sección de indicadores en estado crítico.
         
         Args:
-            indicadores_list (List[Dict]): Lista de indicadores
-            analisis_list (List[Dict]): Lista de análisis
+            metricas (Dict): Conteos del informe (ver _calcular_metricas)
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
-        # Filtrar indicadores críticos
-        criticos = []
-        for ind, anal in zip(indicadores_list, analisis_list):
-            if anal.get('semaforo') == 'Rojo':
-                criticos.append((ind, anal))
-        
-        if not criticos:
-            self.agregar_seccion(
+        criticos = metricas['criticos']
+        
+        if not metricas['total_criticos']:
+            yield from self.agregar_seccion(
                 "4. INDICADORES CRÍTICOS",
                 "No se identificaron indicadores en estado crítico durante el período evaluado. "
                 "Esto representa un desempeño satisfactorio general de la gestión institucional."
             )
             return
         
-        self.agregar_seccion(
+        yield from self.agregar_seccion(
             "4. INDICADORES CRÍTICOS",
-            f"Se identificaron {len(criticos)} indicador(es) en estado crítico que requieren "
+            f"Se identificaron {metricas['total_criticos']} indicador(es) en estado crítico que requieren "
             "atención inmediata y acciones correctivas por parte de las áreas responsables."
         )
         
         # Tabla de indicadores críticos
         datos_tabla = [['INDICADOR', 'PROMEDIO', 'META', 'BRECHA']]
         
-        for ind, anal in criticos[:10]:  # Máximo 10
-            nombre = ind.get('nombre', 'Sin nombre')[:50]
-            stats = anal.get('estadisticas', {})
-            promedio = stats.get('promedio', 0)
-            meta = ind.get('meta', 0)
-            brecha = meta - promedio if pd.notna(meta) and pd.notna(promedio) else 0
-            
-            datos_tabla.append([
+        # Promedio, meta y brecha de las filas de la tabla como arreglos
+        nombres = [ind.get('nombre', 'Sin nombre')[:50] for ind, _ in criticos]
+        promedios = np.array([anal.get('estadisticas', {}).get('promedio', 0) for _, anal in criticos], dtype=float)
+        metas = np.array([ind.get('meta', 0) for ind, _ in criticos], dtype=float)
+        con_meta = ~np.isnan(metas)
+        brechas = np.where(con_meta & ~np.isnan(promedios), metas - promedios, 0.0)
+        
+        datos_tabla.extend(
+            [
                 nombre,
-                f"{promedio:.2f}%",
-                f"{meta:.2f}%" if pd.notna(meta) else "N/A",
-                f"{brecha:.2f}%"
-            ])
-        
-        tabla = Table(datos_tabla, colWidths=[3.5*inch, 1.2*inch, 1.2*inch, 1.1*inch])
-        tabla.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dc3545')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8d7da')])
-        ]))
-        
-        self.story.append(tabla)
-        self.story.append(Spacer(1, 0.3*inch))
-    
-    def agregar_recomendaciones(self, analisis_list: List[Dict]):
+                _formato_porcentaje_2d(promedio),
+                _formato_porcentaje_2d(meta) if tiene_meta else "N/A",
+                _formato_porcentaje_2d(brecha)
+            ]
+            for nombre, promedio, meta, tiene_meta, brecha
+            in zip(nombres, promedios, metas, con_meta, brechas)
+        )
+        
+        yield from self._agregar_tabla(datos_tabla, [3.5*inch, 1.2*inch, 1.2*inch, 1.1*inch], 'criticos')
+    
+    def agregar_recomendaciones(self, metricas: Dict):
         """
         Agrega sección de recomendaciones automáticas.
         
         Args:
-            analisis_list (List[Dict]): Lista de análisis
+            metricas (Dict): Conteos del informe (ver _calcular_metricas)
+            
+        Yields:
+            Flowable: Elementos de la sección, en orden
         """
-        self.agregar_seccion(
+        yield from self.agregar_seccion(
             "5. RECOMENDACIONES",
             "Con base en el análisis realizado, se presentan las siguientes recomendaciones:"
         )
@@ -388,9 +575,9 @@ class PDFReportGenerator:
         recomendaciones = []
         
         # Contar estados
-        rojos = sum(1 for a in analisis_list if a.get('semaforo') == 'Rojo')
-        amarillos = sum(1 for a in analisis_list if a.get('semaforo') == 'Amarillo')
-        retrocesos = sum(1 for a in analisis_list if a.get('tendencia') == 'Retroceso')
+        rojos = metricas['semaforos']['Rojo']
+        amarillos = metricas['semaforos']['Amarillo']
+        retrocesos = metricas['tendencias']['Retroceso']
         
         if rojos > 0:
             recomendaciones.append(
@@ -410,20 +597,10 @@ class PDFReportGenerator:
                 f"observado en {retrocesos} indicador(es) y definir acciones correctivas."
             )
         
-        recomendaciones.append(
-            "• <b>Actualización periódica:</b> Mantener la captura de datos actualizada "
-            "para garantizar el seguimiento efectivo de los indicadores."
-        )
-        
-        recomendaciones.append(
-            "• <b>Socialización de resultados:</b> Compartir este análisis con las áreas "
-            "responsables para promover la toma de decisiones basada en datos."
-        )
+        recomendaciones.extend(_RECOMENDACIONES_GENERALES)
         
         for rec in recomendaciones:
-            rec_p = Paragraph(rec, self.styles['JustificadoCustom'])
-            self.story.append(rec_p)
-            self.story.append(Spacer(1, 0.1*inch))
+            yield from (_parrafo(rec, 'JustificadoCustom'), Spacer(1, 0.1*inch))
     
     def generar_pdf(
         self,
@@ -444,22 +621,25 @@ class PDFReportGenerator:
         try:
             logger.info("Iniciando generación de PDF...")
             
-            # Portada
-            self.agregar_portada(
-                titulo=titulo,
-                subtitulo="Análisis Institucional de Indicadores",
-                entidad=entidad
-            )
+            # Contenido (los conteos se calculan una sola vez para todas las secciones)
+            metricas = _calcular_metricas(indicadores_list, analisis_list)
             
-            # Contenido
-            self.agregar_resumen_ejecutivo(analisis_list)
-            self.agregar_analisis_por_periodicidad(analisis_list)
-            self.agregar_analisis_tendencias(analisis_list)
-            self.agregar_indicadores_criticos(indicadores_list, analisis_list)
-            self.agregar_recomendaciones(analisis_list)
+            # Portada y secciones se encadenan en una sola lista para doc.build
+            story = list(chain(
+                self.agregar_portada(
+                    titulo=titulo,
+                    subtitulo="Análisis Institucional de Indicadores",
+                    entidad=entidad
+                ),
+                self.agregar_resumen_ejecutivo(metricas),
+                self.agregar_analisis_por_periodicidad(metricas),
+                self.agregar_analisis_tendencias(metricas),
+                self.agregar_indicadores_criticos(metricas),
+                self.agregar_recomendaciones(metricas)
+            ))
             
             # Construir PDF
-            self.doc.build(self.story)
+            self.doc.build(story)
             
             logger.info(f"PDF generado exitosamente: {self.output_path}")
             return True
@@ -469,6 +649,23 @@ class PDFReportGenerator:
             return False
 
 
+# Directorios de salida ya creados/verificados en este proceso
+_DIRECTORIOS_ASEGURADOS = set()
+
+
+def _asegurar_directorio(directorio: str):
+    """
+    Crea el directorio de salida solo la primera vez que se usa en el proceso.
+    
+    Args:
+        directorio (str): Directorio a crear (vacío = directorio actual)
+    """
+    if not directorio or directorio in _DIRECTORIOS_ASEGURADOS:
+        return
+    os.makedirs(directorio, exist_ok=True)
+    _DIRECTORIOS_ASEGURADOS.add(directorio)
+
+
 def generar_informe_pdf(
     indicadores_list: List[Dict],
     analisis_list: List[Dict],
@@ -477,7 +674,7 @@ def generar_informe_pdf(
     entidad: str = "Alcaldía de Filandia",
     incluir_graficos: bool = True,
     incluir_estadisticas: bool = True
-) -> BytesIO:
+) -> Optional[BytesIO]:
     """
     Función de conveniencia para generar un informe PDF completo en memoria.
     
@@ -491,24 +688,69 @@ def generar_informe_pdf(
         incluir_estadisticas (bool): Si incluir estadísticas detalladas
         
     Returns:
-        BytesIO: Buffer con el PDF generado en memoria
+        Optional[BytesIO]: Buffer con el PDF generado en memoria, o None si no se
+            pudo generar (en ese caso no se escribe output_path)
     """
     if titulo is None:
-        titulo = f"Informe de Indicadores MIPG - {datetime.now().strftime('%B %Y')}"
+        hoy = datetime.now()
+        titulo = f"Informe de Indicadores MIPG - {get_month_name_es(hoy.month)} {hoy.year}"
     
     # Crear PDF en memoria
     buffer = BytesIO()
     
     # Usar buffer en lugar de archivo
     generator = PDFReportGenerator(buffer)
-    generator.generar_pdf(indicadores_list, analisis_list, titulo, entidad)
+    if not generator.generar_pdf(indicadores_list, analisis_list, titulo, entidad):
+        return None
     
     # Si se especificó output_path, también guardar en disco
     if output_path:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        _asegurar_directorio(os.path.dirname(output_path))
         with open(output_path, 'wb') as f:
             f.write(buffer.getvalue())
     
     # Resetear posición del buffer
     buffer.seek(0)
     return buffer
+
+
+def _generar_informe_trabajo(trabajo: Dict) -> Optional[bytes]:
+    """
+    Genera un informe del lote dentro de un proceso trabajador.
+    
+    Args:
+        trabajo (Dict): Argumentos por nombre de generar_informe_pdf
+        
+    Returns:
+        Optional[bytes]: Contenido del PDF generado, o None si falló
+    """
+    buffer = generar_informe_pdf(**trabajo)
+    return buffer.getvalue() if buffer is not None else None
+
+
+def generar_informes_pdf_batch(trabajos: List[Dict], workers: Optional[int] = None) -> List[Optional[BytesIO]]:
+    """
+    Genera varios informes PDF repartiéndolos entre varios procesos.
+    
+    Cada trabajo es un diccionario con los argumentos por nombre de
+    generar_informe_pdf (indicadores_list, analisis_list, output_path, titulo,
+    entidad, ...). Los informes son independientes, así que el resultado es el
+    mismo (y en el mismo orden) que llamar a generar_informe_pdf uno por uno.
+    
+    Args:
+        trabajos (List[Dict]): Argumentos de cada informe (solo datos serializables)
+        workers (int, optional): Número de procesos (por defecto, núcleos disponibles)
+        
+    Returns:
+        List[Optional[BytesIO]]: Un buffer con el PDF generado por cada trabajo
+            (None en los que no se pudieron generar)
+    """
+    workers = min(workers or os.cpu_count() or 1, max(1, len(trabajos)))
+    
+    logger.info("Generando %d informes PDF con %d procesos...", len(trabajos), workers)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [
+            BytesIO(contenido) if contenido is not None else None
+            for contenido in executor.map(_generar_informe_trabajo, trabajos)
+        ]
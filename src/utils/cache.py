@@ -0,0 +1,84 @@
+"""
+Utilidades de caché en disco.
+
+Permite reutilizar resultados costosos (lectura de archivos Excel, análisis)
+entre ejecuciones, invalidándolos automáticamente cuando cambia el archivo de origen.
+"""
+
+import hashlib
+import os
+import pickle
+import logging
+from pathlib import Path
+from typing import Any, Callable
+
+from utils.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def file_signature(file_path: str) -> str:
+    """
+    Calcula una firma del archivo a partir de su ruta, fecha de modificación y tamaño.
+    
+    Args:
+        file_path (str): Ruta al archivo
+        
+    Returns:
+        str: Firma hexadecimal que cambia cuando el archivo es modificado
+    """
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_mtime}|{stat.st_size}"
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def payload_digest(*objetos: Any) -> str:
+    """
+    Calcula un hash del contenido de uno o varios objetos (listas, diccionarios, escalares).
+    
+    Se usa repr() en lugar de pickle porque pickle codifica también qué objetos
+    están compartidos, de modo que datos iguales podrían producir hashes distintos.
+    
+    Args:
+        *objetos: Objetos a incluir en el hash
+        
+    Returns:
+        str: Hash hexadecimal del contenido
+    """
+    payload = repr(objetos).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def cached_call(key: str, func: Callable[[], Any], refresh: bool = False) -> Any:
+    """
+    Ejecuta func() o retorna el resultado almacenado previamente en disco bajo key.
+    
+    Args:
+        key (str): Identificador único del resultado (se usa como nombre de archivo)
+        func (Callable): Función sin argumentos que calcula el resultado
+        refresh (bool): Si True, ignora el resultado guardado y lo recalcula
+        
+    Returns:
+        Any: Resultado de func(), leído de caché si estaba disponible
+    """
+    cache_file = Path(CACHE_DIR) / f"{key}.pkl"
+    
+    if not refresh and cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                resultado = pickle.load(f)
+            logger.debug("Resultado recuperado de caché: %s", cache_file.name)
+            return resultado
+        except Exception as e:
+            logger.warning(f"Caché inválida en {cache_file.name}, se recalcula: {e}")
+    
+    resultado = func()
+    
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logger.warning(f"No se pudo escribir la caché {cache_file.name}: {e}")
+    
+    return resultado
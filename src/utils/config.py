@@ -15,15 +15,19 @@ PROCESSED_DIR = DATA_DIR / 'processed'
 OUTPUT_DIR = BASE_DIR / 'output'
 REPORTS_DIR = OUTPUT_DIR / 'reports'
 CHARTS_DIR = OUTPUT_DIR / 'charts'
+CACHE_DIR = BASE_DIR / '.cache'
 
 # Archivo de entrada por defecto
 DEFAULT_EXCEL_FILE = "RE-SM-01 Tablero de Control de Indicadores 2025.xls"
 
 # Configuración de análisis
-MESES_ORDEN = [
+MESES_ORDEN = (
     'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
     'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
-]
+)
+
+# Meses del más reciente al más antiguo (búsqueda del último valor disponible)
+MESES_ORDEN_INVERSO = tuple(reversed(MESES_ORDEN))
 
 # Umbrales de análisis
 Z_SCORE_THRESHOLD = 2.5  # Para detección de anomalías
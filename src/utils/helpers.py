@@ -6,24 +6,59 @@ Funciones helper para operaciones comunes.
 
 import pandas as pd
 import numpy as np
-from typing import Any, Optional
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+import importlib.util
 import logging
+import re
+
+from utils.config import MESES_ORDEN, MESES_ORDEN_INVERSO
 
 logger = logging.getLogger(__name__)
 
+# Secuencias de espacios en blanco (mismos caracteres que str.split())
+_ESPACIOS_RE = re.compile(r'\s+')
+
+# xlsxwriter es opcional: si está instalado se usa para escribir Excel en modo streaming
+XLSXWRITER_DISPONIBLE = importlib.util.find_spec('xlsxwriter') is not None
+
+# Entradas por columna aceptadas por los helpers numéricos
+_TIPOS_ARREGLO = (np.ndarray, pd.Series)
+
+
+def _como_resultado(valores: np.ndarray, original: Any) -> Union[np.ndarray, pd.Series]:
+    """
+    Devuelve el resultado de una operación por columna con el tipo de la entrada.
+    
+    Args:
+        valores (np.ndarray): Resultado calculado
+        original: Entrada original (Series o ndarray)
+        
+    Returns:
+        Union[np.ndarray, pd.Series]: Series con el índice original o ndarray
+    """
+    if isinstance(original, pd.Series):
+        return pd.Series(valores, index=original.index, name=original.name)
+    return valores
+
 
 def format_percentage(value: float, decimals: int = 2) -> str:
     """
     Formatea un valor numérico como porcentaje.
     
     Args:
-        value (float): Valor a formatear
+        value (float): Valor a formatear (o ndarray/Series para una columna completa)
         decimals (int): Número de decimales
         
     Returns:
-        str: Valor formateado como porcentaje
+        str: Valor formateado como porcentaje (ndarray/Series de texto para columnas)
     """
+    if isinstance(value, _TIPOS_ARREGLO):
+        valores = np.asarray(value, dtype=float)
+        textos = np.char.mod(f'%.{decimals}f%%', valores)
+        return _como_resultado(np.where(np.isnan(valores), 'N/A', textos).astype(object), value)
+    
     if pd.isna(value):
         return "N/A"
     return f"{value:.{decimals}f}%"
@@ -39,8 +74,16 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
         default (float): Valor por defecto si denominador es cero
         
     Returns:
-        float: Resultado de la división o valor por defecto
+        float: Resultado de la división o valor por defecto. Si alguno de los
+        argumentos es ndarray/Series, se calcula elemento a elemento
     """
+    if isinstance(numerator, _TIPOS_ARREGLO) or isinstance(denominator, _TIPOS_ARREGLO):
+        num = np.asarray(numerator, dtype=float)
+        den = np.asarray(denominator, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resultado = np.where(np.isnan(num) | np.isnan(den) | (den == 0), default, num / den)
+        return _como_resultado(resultado, numerator if isinstance(numerator, pd.Series) else denominator)
+    
     if pd.isna(numerator) or pd.isna(denominator):
         return default
     
@@ -63,10 +106,8 @@ def clean_text(text: Any) -> str:
     if pd.isna(text):
         return ""
     
-    text = str(text).strip()
-    text = ' '.join(text.split())  # Eliminar espacios múltiples
-    
-    return text
+    # Eliminar espacios múltiples
+    return _ESPACIOS_RE.sub(' ', str(text)).strip()
 
 
 def validate_dataframe(df: pd.DataFrame, required_columns: list) -> tuple:
@@ -83,7 +124,8 @@ def validate_dataframe(df: pd.DataFrame, required_columns: list) -> tuple:
     if df is None or df.empty:
         return False, required_columns
     
-    missing = [col for col in required_columns if col not in df.columns]
+    columnas = set(df.columns)
+    missing = [col for col in required_columns if col not in columnas]
     
     return len(missing) == 0, missing
 
@@ -98,17 +140,45 @@ def get_month_name_es(month_number: int) -> str:
     Returns:
         str: Nombre del mes
     """
-    meses = [
-        'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
-        'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
-    ]
-    
     if 1 <= month_number <= 12:
-        return meses[month_number - 1]
+        return MESES_ORDEN[month_number - 1]
     
     return "Mes inválido"
 
 
+def ultimo_valor_mensual(valores_mensuales: Dict[str, float]) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Obtiene el último mes con dato válido y su valor.
+    
+    Args:
+        valores_mensuales (Dict[str, float]): Valores por mes
+        
+    Returns:
+        Tuple[Optional[str], Optional[float]]: (mes, valor) o (None, None) si no hay datos mensuales
+    """
+    if not valores_mensuales:
+        return None, None
+    
+    return next(
+        ((mes, valores_mensuales[mes]) for mes in MESES_ORDEN_INVERSO
+         if mes in valores_mensuales and pd.notna(valores_mensuales[mes])),
+        (None, None)
+    )
+
+
+def contar_semaforos(analisis_list: List[Dict]) -> Counter:
+    """
+    Cuenta los análisis por estado de semáforo en una sola pasada.
+    
+    Args:
+        analisis_list (List[Dict]): Lista de análisis de indicadores
+        
+    Returns:
+        Counter: Conteo por estado ('Verde', 'Amarillo', 'Rojo', 'Gris'); 0 si no aparece
+    """
+    return Counter(a.get('semaforo') for a in analisis_list)
+
+
 def create_output_filename(prefix: str, extension: str = 'xlsx') -> str:
     """
     Crea un nombre de archivo con timestamp.
@@ -120,7 +190,11 @@ def create_output_filename(prefix: str, extension: str = 'xlsx') -> str:
     Returns:
         str: Nombre del archivo con timestamp
     """
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    ahora = datetime.now()
+    timestamp = (
+        f"{ahora.year:04d}{ahora.month:02d}{ahora.day:02d}_"
+        f"{ahora.hour:02d}{ahora.minute:02d}{ahora.second:02d}"
+    )
     return f"{prefix}_{timestamp}.{extension}"
 
 
@@ -133,8 +207,20 @@ def calculate_percentage_change(old_value: float, new_value: float) -> float:
         new_value (float): Valor nuevo
         
     Returns:
-        float: Cambio porcentual
+        float: Cambio porcentual. Si alguno de los argumentos es ndarray/Series,
+        se calcula elemento a elemento
     """
+    if isinstance(old_value, _TIPOS_ARREGLO) or isinstance(new_value, _TIPOS_ARREGLO):
+        anterior = np.asarray(old_value, dtype=float)
+        nuevo = np.asarray(new_value, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cambio = np.where(
+                np.isnan(anterior) | np.isnan(nuevo) | (anterior == 0),
+                np.nan,
+                (nuevo - anterior) / anterior * 100
+            )
+        return _como_resultado(cambio, old_value if isinstance(old_value, pd.Series) else new_value)
+    
     if pd.isna(old_value) or pd.isna(new_value):
         return np.nan
     
@@ -144,6 +230,36 @@ def calculate_percentage_change(old_value: float, new_value: float) -> float:
     return ((new_value - old_value) / old_value) * 100
 
 
+# Clasificación de pendientes: los límites ±2.0 pertenecen al tramo moderado y
+# los límites ±0.5 también, por eso se cuentan con lados distintos de searchsorted
+_LIMITES_INCLUSIVOS = np.array([-2.0, 0.5])   # p == límite cae en el tramo superior
+_LIMITES_EXCLUSIVOS = np.array([-0.5, 2.0])   # p == límite cae en el tramo inferior
+_ETIQUETAS_TENDENCIA = np.array([
+    'Retroceso fuerte', 'Retroceso moderado', 'Estable',
+    'Crecimiento moderado', 'Crecimiento fuerte'
+], dtype=object)
+
+
+def describe_trends(pendientes: np.ndarray) -> np.ndarray:
+    """
+    Describe las tendencias de un arreglo de pendientes sin recorrerlo en Python.
+    
+    Args:
+        pendientes (np.ndarray): Pendientes a clasificar (NaN = sin datos)
+        
+    Returns:
+        np.ndarray: Descripción de la tendencia para cada pendiente
+    """
+    valores = np.asarray(pendientes, dtype=float)
+    tramo = (
+        np.searchsorted(_LIMITES_INCLUSIVOS, valores, side='right')
+        + np.searchsorted(_LIMITES_EXCLUSIVOS, valores, side='left')
+    )
+    etiquetas = _ETIQUETAS_TENDENCIA[tramo]
+    etiquetas[np.isnan(valores)] = 'Datos insuficientes'
+    return etiquetas
+
+
 def describe_trend(pendiente: float) -> str:
     """
     Describe una tendencia basándose en la pendiente.
@@ -157,18 +273,7 @@ def describe_trend(pendiente: float) -> str:
     if pd.isna(pendiente):
         return "Datos insuficientes"
     
-    if abs(pendiente) < 0.5:
-        return "Estable"
-    elif pendiente > 0:
-        if pendiente > 2.0:
-            return "Crecimiento fuerte"
-        else:
-            return "Crecimiento moderado"
-    else:
-        if pendiente < -2.0:
-            return "Retroceso fuerte"
-        else:
-            return "Retroceso moderado"
+    return describe_trends(np.array([pendiente], dtype=float))[0]
 
 
 def export_to_excel(data: pd.DataFrame, output_path: str, sheet_name: str = 'Datos') -> bool:
@@ -184,7 +289,16 @@ def export_to_excel(data: pd.DataFrame, output_path: str, sheet_name: str = 'Dat
         bool: True si se exportó exitosamente
     """
     try:
-        data.to_excel(output_path, sheet_name=sheet_name, index=False)
+        if XLSXWRITER_DISPONIBLE:
+            # constant_memory escribe fila por fila en disco en lugar de armar el libro en memoria
+            with pd.ExcelWriter(
+                output_path,
+                engine='xlsxwriter',
+                engine_kwargs={'options': {'constant_memory': True}}
+            ) as writer:
+                data.to_excel(writer, sheet_name=sheet_name, index=False)
+        else:
+            data.to_excel(output_path, sheet_name=sheet_name, index=False)
         logger.info(f"Datos exportados a: {output_path}")
         return True
     except Exception as e:
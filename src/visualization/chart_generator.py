@@ -11,15 +11,21 @@ Utiliza Plotly para gráficos interactivos y Matplotlib para exportación estát
 """
 
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
 import plotly.express as px
 from plotly.subplots import make_subplots
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +45,77 @@ COLORS_SEMAFORO = {
 # Paleta de colores profesional
 COLOR_PALETTE = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#6A994E']
 
+# Formatos de imagen estática (exportados con Kaleido)
+_FORMATOS_IMAGEN = frozenset({'png', 'jpg', 'jpeg', 'pdf', 'svg'})
+
+# A partir de cuántos puntos una serie se dibuja con WebGL (Scattergl) en vez de SVG
+_UMBRAL_WEBGL = 500
+
+# Layout común a todas las figuras (estilo de título y paleta); se valida una sola vez
+_BASE_LAYOUT = go.Layout(
+    title=dict(x=0.5, xanchor='center', font=dict(size=16, family='Arial Black')),
+    colorway=COLOR_PALETTE
+)
+
+# Propiedades fijas del layout de cada tipo de gráfico (el título u otros
+# valores que dependen de los datos se agregan en cada llamada)
+_LAYOUTS_GRAFICO = {
+    'tendencia': dict(
+        xaxis_title='Período',
+        yaxis_title='Valor (%)',
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=500
+    ),
+    'comparativo': dict(
+        xaxis_title='Valor Promedio (%)',
+        yaxis_title='Indicador',
+        showlegend=True,
+        legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02)
+    ),
+    'semaforizacion': dict(
+        title_text='Distribución de Estados de Semaforización',
+        height=500,
+        showlegend=True
+    ),
+    'tendencias_multiple': dict(
+        title_text='Tendencias Comparativas de Indicadores',
+        xaxis_title='Período',
+        yaxis_title='Valor (%)',
+        hovermode='x unified',
+        height=600,
+        showlegend=True,
+        legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02)
+    )
+}
+
+
+def _como_texto(nombre) -> str:
+    """
+    Convierte a texto un nombre que no lo es (p. ej. celdas numéricas o vacías del Excel).
+    
+    Args:
+        nombre: Nombre tal como viene en el indicador o el análisis
+        
+    Returns:
+        str: El mismo nombre si ya es texto; si no, su representación con str()
+    """
+    return nombre if isinstance(nombre, str) else str(nombre)
+
+
+def _textos_valores(valores: np.ndarray) -> np.ndarray:
+    """
+    Formatea los valores de las barras con 2 decimales, de una vez para todo el arreglo.
+    
+    Args:
+        valores (np.ndarray): Valores de las barras
+        
+    Returns:
+        np.ndarray: Textos ya formateados (vacíos donde no hay valor)
+    """
+    return np.where(np.isnan(valores), '', np.char.mod('%.2f', valores))
+
 
 class ChartGenerator:
     """
@@ -56,19 +133,70 @@ class ChartGenerator:
             theme (str): Tema de Plotly a utilizar
         """
         self.theme = theme
+        # Layout base con el tema ya resuelto, compartido por todas las figuras
+        self._base_layout = go.Layout(_BASE_LAYOUT, template=theme)
         self.meses_orden = [
             'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
             'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
         ]
+        # Meses como arreglo, para seleccionar con una máscara los que tienen dato
+        self._meses_arr = np.array(self.meses_orden, dtype=object)
+        self._meses_set = frozenset(self.meses_orden)
+        # Layouts por tipo de gráfico, validados la primera vez que se usan
+        self._layouts = {}
         logger.info("ChartGenerator inicializado")
     
+    def _layout(self, tipo: str) -> Dict:
+        """
+        Obtiene el layout base (tema y propiedades fijas) de un tipo de gráfico.
+        
+        Args:
+            tipo (str): Clave de _LAYOUTS_GRAFICO
+            
+        Returns:
+            Dict: Layout ya validado (como dict), que cada figura copia al construirse
+        """
+        layout = self._layouts.get(tipo)
+        if layout is None:
+            layout = self._layouts[tipo] = go.Layout(self._base_layout, **_LAYOUTS_GRAFICO[tipo]).to_plotly_json()
+        return layout
+    
+    def _extraer_serie(self, valores_mensuales: Dict) -> Tuple[List[str], np.ndarray]:
+        """
+        Ordena los períodos de un indicador y descarta los que no tienen dato.
+        
+        Si hay meses se usa el orden del calendario; si no (años u otros
+        períodos), el orden de las claves.
+        
+        Args:
+            valores_mensuales (Dict): Valores por período del indicador
+            
+        Returns:
+            Tuple[List[str], np.ndarray]: (etiquetas de los períodos con dato, valores)
+        """
+        # Detectar si son meses o años (u otros períodos)
+        es_mensual = not self._meses_set.isdisjoint(valores_mensuales)
+        
+        if es_mensual:
+            # Datos mensuales - arreglo fijo de 12 posiciones en orden de meses
+            valores = np.array([valores_mensuales.get(mes, np.nan) for mes in self.meses_orden], dtype=float)
+            con_dato = ~np.isnan(valores)
+            return self._meses_arr[con_dato].tolist(), valores[con_dato]
+        
+        # Datos anuales u otros - ordenar las claves
+        claves = sorted(valores_mensuales)
+        valores = np.array([valores_mensuales[periodo] for periodo in claves], dtype=float)
+        con_dato = ~np.isnan(valores)
+        return [str(periodo) for periodo, hay in zip(claves, con_dato) if hay], valores[con_dato]
+    
     def grafico_tendencia_indicador(
         self,
         indicador: Dict,
         analisis: Dict,
         mostrar_meta: bool = True,
-        titulo_personalizado: Optional[str] = None
-    ) -> go.Figure:
+        titulo_personalizado: Optional[str] = None,
+        como_dict: bool = False
+    ) -> Union[go.Figure, Dict]:
         """
         Genera gráfico de tendencia temporal para un indicador individual.
         
@@ -77,102 +205,61 @@ class ChartGenerator:
             analisis (Dict): Análisis del indicador
             mostrar_meta (bool): Si se debe mostrar línea de meta
             titulo_personalizado (str, optional): Título personalizado
+            como_dict (bool): Si es True devuelve fig.to_dict() en lugar de la figura,
+                para actualizar un gráfico ya dibujado con Plotly.react(el, data, layout)
             
         Returns:
-            go.Figure: Figura de Plotly con el gráfico
+            Union[go.Figure, Dict]: Figura de Plotly con el gráfico (o su dict si como_dict)
         """
         valores_mensuales = indicador.get('valores_mensuales', {})
+        nombre_ind = _como_texto(indicador.get('nombre', 'Indicador'))
         
         if not valores_mensuales:
-            nombre_ind = indicador.get('nombre', 'Indicador')
-            if not isinstance(nombre_ind, str):
-                nombre_ind = str(nombre_ind)
             logger.warning(f"No hay datos para graficar: {nombre_ind}")
             return None
         
-        # Detectar si son meses o años (u otros períodos)
-        periodos_disponibles = list(valores_mensuales.keys())
-        es_mensual = any(mes in periodos_disponibles for mes in self.meses_orden)
-        
-        # Preparar datos según el tipo
-        periodos = []
-        valores = []
-        
-        if es_mensual:
-            # Datos mensuales - usar orden de meses
-            for mes in self.meses_orden:
-                if mes in valores_mensuales and pd.notna(valores_mensuales[mes]):
-                    periodos.append(mes)
-                    valores.append(valores_mensuales[mes])
-        else:
-            # Datos anuales u otros - ordenar las claves
-            for periodo in sorted(periodos_disponibles):
-                if pd.notna(valores_mensuales[periodo]):
-                    periodos.append(str(periodo))
-                    valores.append(valores_mensuales[periodo])
+        periodos, valores = self._extraer_serie(valores_mensuales)
         
         if not periodos:
-            nombre_ind = indicador.get('nombre', 'Indicador')
-            if not isinstance(nombre_ind, str):
-                nombre_ind = str(nombre_ind)
             logger.warning(f"No hay datos válidos para graficar: {nombre_ind}")
             return None
         
-        # Crear figura
-        fig = go.Figure()
+        # Crear figura (layout ya validado y trazas armadas con datos propios del
+        # análisis: se omite la validación de esquema de Plotly en todo el módulo)
+        fig = go.Figure(layout=self._layout('tendencia'), _validate=False)
         
-        # Línea de tendencia principal
+        # Línea de tendencia principal (series muy largas con WebGL)
         color_linea = self._get_color_by_semaforo(analisis.get('semaforo', 'Gris'))
+        Traza = go.Scattergl if len(periodos) > _UMBRAL_WEBGL else go.Scatter
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(Traza(
             x=periodos,
             y=valores,
             mode='lines+markers',
             name='Valor Real',
             line=dict(color=color_linea, width=3),
             marker=dict(size=10, line=dict(width=2, color='white')),
-            hovertemplate='<b>%{x}</b><br>Valor: %{y:.2f}%<extra></extra>'
+            hovertemplate='<b>%{x}</b><br>Valor: %{y:.2f}%<extra></extra>',
+            _validate=False
         ))
         
         # Agregar línea de meta
         if mostrar_meta and pd.notna(indicador.get('meta')):
             meta = indicador.get('meta')
-            fig.add_trace(go.Scatter(
+            fig.add_trace(Traza(
                 x=periodos,
-                y=[meta] * len(periodos),
+                y=np.full(len(periodos), meta, dtype=float),
                 mode='lines',
                 name='Meta',
                 line=dict(color='#dc3545', width=2, dash='dash'),
-                hovertemplate='<b>Meta</b><br>%{y:.2f}%<extra></extra>'
+                hovertemplate='<b>Meta</b><br>%{y:.2f}%<extra></extra>',
+                _validate=False
             ))
         
         # Título y etiquetas
-        nombre_ind = indicador.get('nombre', 'Indicador')
-        if not isinstance(nombre_ind, str):
-            nombre_ind = str(nombre_ind)
         titulo = titulo_personalizado or f"{nombre_ind}"
         
-        fig.update_layout(
-            title={
-                'text': titulo,
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 16, 'family': 'Arial Black'}
-            },
-            xaxis_title='Período',
-            yaxis_title='Valor (%)',
-            template=self.theme,
-            hovermode='x unified',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            height=500
-        )
+        fig.update_layout(title_text=titulo)
         
         # Agregar anotación de periodicidad y tendencia
         fig.add_annotation(
@@ -186,15 +273,17 @@ class ChartGenerator:
             xanchor='center'
         )
         
-        return fig
+        return fig.to_dict() if como_dict else fig
     
     def grafico_comparativo_indicadores(
         self,
         indicadores_list: List[Dict],
         analisis_list: List[Dict],
         top_n: int = 10,
-        ordenar_por: str = 'promedio'
-    ) -> go.Figure:
+        ordenar_por: str = 'promedio',
+        tabla: Optional[pd.DataFrame] = None,
+        como_dict: bool = False
+    ) -> Union[go.Figure, Dict]:
         """
         Genera gráfico comparativo de múltiples indicadores.
         
@@ -203,104 +292,103 @@ class ChartGenerator:
             analisis_list (List[Dict]): Lista de análisis
             top_n (int): Cantidad de indicadores a mostrar
             ordenar_por (str): Criterio de ordenamiento
+            tabla (pd.DataFrame, optional): Tabla de construir_tabla_analisis ya
+                calculada para estas listas (si no se da, se arma con los top_n primeros)
+            como_dict (bool): Si es True devuelve fig.to_dict() en lugar de la figura,
+                para actualizar un gráfico ya dibujado con Plotly.react(el, data, layout)
             
         Returns:
-            go.Figure: Gráfico comparativo
+            Union[go.Figure, Dict]: Gráfico comparativo (o su dict si como_dict)
         """
-        # Preparar datos
-        datos_comp = []
-        
-        for ind, anal in zip(indicadores_list[:top_n], analisis_list[:top_n]):
-            estadisticas = anal.get('estadisticas', {})
-            
-            # Obtener nombre y convertir a string si es necesario
-            nombre = ind.get('nombre', 'Sin nombre')
-            if not isinstance(nombre, str):
-                nombre = str(nombre)
-            
-            datos_comp.append({
-                'nombre': nombre[:50],  # Truncar nombres largos
-                'promedio': estadisticas.get('promedio', 0),
-                'meta': ind.get('meta', 0),
-                'semaforo': anal.get('semaforo', 'Gris')
-            })
+        if tabla is None:
+            tabla = construir_tabla_analisis(indicadores_list[:top_n], analisis_list[:top_n])
         
-        df_comp = pd.DataFrame(datos_comp)
+        # Solo las posiciones que tienen indicador y análisis
+        seleccion = tabla.iloc[:top_n]
+        seleccion = seleccion[seleccion['con_indicador'].to_numpy()]
         
-        if df_comp.empty:
+        if seleccion.empty:
             logger.warning("No hay datos para comparar")
             return None
         
-        # Ordenar
+        # Truncar nombres largos (la tabla ya los trae como texto)
+        nombres = seleccion['nombre_indicador'].str.slice(0, 50).tolist()
+        
+        promedios = seleccion['promedio'].to_numpy(dtype=float)
+        metas = seleccion['meta'].to_numpy(dtype=float)
+        # Color de las barras por estado (los estados desconocidos van en gris)
+        colors = seleccion['semaforo'].map(COLORS_SEMAFORO).fillna(COLORS_SEMAFORO['Gris']).to_numpy()
+        
+        # Ordenar: solo se reordenan los arreglos que reciben las trazas
         if ordenar_por == 'promedio':
-            df_comp = df_comp.sort_values('promedio', ascending=True)
+            orden = np.argsort(promedios, kind='stable')
+            nombres = [nombres[i] for i in orden]
+            promedios = promedios[orden]
+            metas = metas[orden]
+            colors = colors[orden]
         
         # Crear figura
-        fig = go.Figure()
+        fig = go.Figure(layout=self._layout('comparativo'), _validate=False)
         
         # Barras de promedio
-        colors = [COLORS_SEMAFORO.get(s, '#6c757d') for s in df_comp['semaforo']]
-        
         fig.add_trace(go.Bar(
-            y=df_comp['nombre'],
-            x=df_comp['promedio'],
+            y=nombres,
+            x=promedios,
             orientation='h',
             name='Promedio Real',
-            marker=dict(color=colors),
-            text=df_comp['promedio'].round(2),
+            marker=dict(color=colors.tolist()),
+            text=_textos_valores(promedios),
             textposition='outside',
-            hovertemplate='<b>%{y}</b><br>Promedio: %{x:.2f}%<extra></extra>'
+            hovertemplate='<b>%{y}</b><br>Promedio: %{x:.2f}%<extra></extra>',
+            _validate=False
         ))
         
         # Línea de referencia de meta
         fig.add_trace(go.Scatter(
-            y=df_comp['nombre'],
-            x=df_comp['meta'],
+            y=nombres,
+            x=metas,
             mode='markers',
             name='Meta',
             marker=dict(symbol='diamond', size=12, color='red'),
-            hovertemplate='<b>%{y}</b><br>Meta: %{x:.2f}%<extra></extra>'
+            hovertemplate='<b>%{y}</b><br>Meta: %{x:.2f}%<extra></extra>',
+            _validate=False
         ))
         
         fig.update_layout(
-            title={
-                'text': f'Comparativo de Indicadores (Top {top_n})',
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 16, 'family': 'Arial Black'}
-            },
-            xaxis_title='Valor Promedio (%)',
-            yaxis_title='Indicador',
-            template=self.theme,
-            height=max(400, top_n * 50),
-            showlegend=True,
-            legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02)
+            title_text=f'Comparativo de Indicadores (Top {top_n})',
+            height=max(400, top_n * 50)
         )
         
-        return fig
+        return fig.to_dict() if como_dict else fig
     
     def grafico_semaforizacion_general(
         self,
-        analisis_list: List[Dict]
-    ) -> go.Figure:
+        analisis_list: List[Dict],
+        tabla: Optional[pd.DataFrame] = None,
+        como_dict: bool = False
+    ) -> Union[go.Figure, Dict]:
         """
         Genera gráfico de distribución de estados de semaforización.
         
         Args:
             analisis_list (List[Dict]): Lista de análisis de indicadores
+            tabla (pd.DataFrame, optional): Tabla de construir_tabla_analisis ya
+                calculada para esta lista
+            como_dict (bool): Si es True devuelve fig.to_dict() en lugar de la figura,
+                para actualizar un gráfico ya dibujado con Plotly.react(el, data, layout)
             
         Returns:
-            go.Figure: Gráfico de pastel con distribución
+            Union[go.Figure, Dict]: Gráfico de pastel con distribución (o su dict si como_dict)
         """
-        # Contar estados de semáforo
-        conteo_semaforo = {}
-        for anal in analisis_list:
-            semaforo = anal.get('semaforo', 'Gris')
-            conteo_semaforo[semaforo] = conteo_semaforo.get(semaforo, 0) + 1
+        # Contar estados de semáforo (en orden de primera aparición)
+        if tabla is not None:
+            conteo_semaforo = Counter(tabla['semaforo'].tolist())
+        else:
+            conteo_semaforo = Counter(anal.get('semaforo', 'Gris') for anal in analisis_list)
         
         # Preparar datos
-        labels = list(conteo_semaforo.keys())
-        values = list(conteo_semaforo.values())
+        labels = list(conteo_semaforo)
+        values = np.fromiter(conteo_semaforo.values(), dtype=np.int64, count=len(conteo_semaforo))
         colors = [COLORS_SEMAFORO.get(label, '#6c757d') for label in labels]
         
         # Crear gráfico de pastel
@@ -310,159 +398,115 @@ class ChartGenerator:
             marker=dict(colors=colors, line=dict(color='white', width=2)),
             hovertemplate='<b>%{label}</b><br>Cantidad: %{value}<br>Porcentaje: %{percent}<extra></extra>',
             textinfo='label+percent',
-            textfont_size=13
-        )])
+            textfont_size=13,
+            _validate=False
+        )], layout=self._layout('semaforizacion'), _validate=False)
         
-        fig.update_layout(
-            title={
-                'text': 'Distribución de Estados de Semaforización',
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 16, 'family': 'Arial Black'}
-            },
-            template=self.theme,
-            height=500,
-            showlegend=True
-        )
-        
-        return fig
+        return fig.to_dict() if como_dict else fig
     
     def grafico_tendencias_multiple(
         self,
         indicadores_list: List[Dict],
-        max_indicadores: int = 5
-    ) -> go.Figure:
+        max_indicadores: int = 5,
+        como_dict: bool = False
+    ) -> Union[go.Figure, Dict]:
         """
         Genera gráfico con múltiples líneas de tendencia.
         
         Args:
             indicadores_list (List[Dict]): Lista de indicadores
-            max_indicadores (int): Máximo de líneas a graficar
+            max_indicadores (int): Máximo de líneas a graficar (solo cuentan los
+                indicadores con datos)
+            como_dict (bool): Si es True devuelve fig.to_dict() en lugar de la figura,
+                para actualizar un gráfico ya dibujado con Plotly.react(el, data, layout)
             
         Returns:
-            go.Figure: Gráfico con múltiples tendencias
+            Union[go.Figure, Dict]: Gráfico con múltiples tendencias (o su dict si como_dict)
         """
-        fig = go.Figure()
+        fig = go.Figure(layout=self._layout('tendencias_multiple'), _validate=False)
+        
+        # Series con al menos un período con dato; los indicadores vacíos se
+        # saltan sin ocupar una de las max_indicadores líneas
+        series = (
+            (indicador, self._extraer_serie(indicador['valores_mensuales']))
+            for indicador in indicadores_list
+            if indicador.get('valores_mensuales')
+        )
+        series = ((indicador, serie) for indicador, serie in series if serie[0])
         
-        for i, indicador in enumerate(indicadores_list[:max_indicadores]):
-            valores_mensuales = indicador.get('valores_mensuales', {})
-            
-            if not valores_mensuales:
-                continue
-            
-            # Detectar tipo de períodos
-            periodos_disponibles = list(valores_mensuales.keys())
-            es_mensual = any(mes in periodos_disponibles for mes in self.meses_orden)
-            
-            # Preparar datos
-            periodos = []
-            valores = []
-            
-            if es_mensual:
-                for mes in self.meses_orden:
-                    if mes in valores_mensuales and pd.notna(valores_mensuales[mes]):
-                        periodos.append(mes)
-                        valores.append(valores_mensuales[mes])
-            else:
-                for periodo in sorted(periodos_disponibles):
-                    if pd.notna(valores_mensuales[periodo]):
-                        periodos.append(str(periodo))
-                        valores.append(valores_mensuales[periodo])
-            
-            if not periodos:
-                continue
-            
+        for i, (indicador, (periodos, valores)) in enumerate(islice(series, max_indicadores)):
             # Agregar línea
             color = COLOR_PALETTE[i % len(COLOR_PALETTE)]
-            nombre = indicador.get('nombre', f'Indicador {i+1}')
-            if not isinstance(nombre, str):
-                nombre = str(nombre)
-            nombre = nombre[:40]
+            nombre = _como_texto(indicador.get('nombre', f'Indicador {i+1}'))[:40]
             
-            fig.add_trace(go.Scatter(
+            # Series muy largas con WebGL
+            Traza = go.Scattergl if len(periodos) > _UMBRAL_WEBGL else go.Scatter
+            fig.add_trace(Traza(
                 x=periodos,
                 y=valores,
                 mode='lines+markers',
                 name=nombre,
                 line=dict(color=color, width=2),
                 marker=dict(size=6),
-                hovertemplate=f'<b>{nombre}</b><br>%{{x}}: %{{y:.2f}}%<extra></extra>'
+                hovertemplate=f'<b>{nombre}</b><br>%{{x}}: %{{y:.2f}}%<extra></extra>',
+                _validate=False
             ))
         
-        fig.update_layout(
-            title={
-                'text': 'Tendencias Comparativas de Indicadores',
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 16, 'family': 'Arial Black'}
-            },
-            xaxis_title='Período',
-            yaxis_title='Valor (%)',
-            template=self.theme,
-            hovermode='x unified',
-            height=600,
-            showlegend=True,
-            legend=dict(
-                orientation="v",
-                yanchor="top",
-                y=1,
-                xanchor="left",
-                x=1.02
-            )
-        )
-        
-        return fig
+        return fig.to_dict() if como_dict else fig
     
     def grafico_estadisticas_generales(
         self,
         analisis_list: List[Dict],
-        top_n: int = 15
-    ) -> go.Figure:
+        top_n: int = 15,
+        tabla: Optional[pd.DataFrame] = None,
+        como_dict: bool = False
+    ) -> Union[go.Figure, Dict]:
         """
         Genera gráfico de caja (boxplot) con estadísticas de indicadores.
         
         Args:
             analisis_list (List[Dict]): Lista de análisis
             top_n (int): Número de indicadores a mostrar
+            tabla (pd.DataFrame, optional): Tabla de construir_tabla_analisis ya
+                calculada para esta lista (si no se da, se arma con los top_n primeros)
+            como_dict (bool): Si es True devuelve fig.to_dict() en lugar de la figura,
+                para actualizar un gráfico ya dibujado con Plotly.react(el, data, layout)
             
         Returns:
-            go.Figure: Gráfico de estadísticas
+            Union[go.Figure, Dict]: Gráfico de estadísticas (o su dict si como_dict)
         """
-        # Preparar datos
-        datos = []
-        
-        for anal in analisis_list[:top_n]:
-            estadisticas = anal.get('estadisticas', {})
-            if estadisticas.get('total_periodos', 0) > 0:
-                datos.append({
-                    'nombre': anal.get('nombre', 'Sin nombre')[:30],
-                    'promedio': estadisticas.get('promedio', 0),
-                    'minimo': estadisticas.get('minimo', 0),
-                    'maximo': estadisticas.get('maximo', 0),
-                    'desviacion': estadisticas.get('desviacion_estandar', 0)
-                })
+        if tabla is None:
+            tabla = construir_tabla_analisis([], analisis_list[:top_n])
         
-        df = pd.DataFrame(datos)
+        # Preparar datos: indicadores con al menos un período
+        df = tabla.iloc[:top_n]
+        df = df[df['total_periodos'].to_numpy() > 0]
         
         if df.empty:
             return None
         
+        # Columnas como arreglos para las trazas (las etiquetas quedan como lista)
+        nombres = df['nombre'].str.slice(0, 30).tolist()
+        promedios = df['promedio'].to_numpy(dtype=float)
+        
         # Crear subplots
         fig = make_subplots(
             rows=1, cols=2,
             subplot_titles=('Promedios por Indicador', 'Rango (Mín-Máx) por Indicador')
         )
+        fig.update_layout(self._base_layout)
         
         # Gráfico de promedios
         fig.add_trace(
             go.Bar(
-                y=df['nombre'],
-                x=df['promedio'],
+                y=nombres,
+                x=promedios,
                 orientation='h',
                 name='Promedio',
                 marker=dict(color='#2E86AB'),
-                text=df['promedio'].round(2),
-                textposition='outside'
+                text=_textos_valores(promedios),
+                textposition='outside',
+                _validate=False
             ),
             row=1, col=1
         )
@@ -470,39 +514,35 @@ class ChartGenerator:
         # Gráfico de rangos
         fig.add_trace(
             go.Scatter(
-                y=df['nombre'],
-                x=df['minimo'],
+                y=nombres,
+                x=df['minimo'].to_numpy(dtype=float),
                 mode='markers',
                 name='Mínimo',
-                marker=dict(symbol='triangle-left', size=10, color='#C73E1D')
+                marker=dict(symbol='triangle-left', size=10, color='#C73E1D'),
+                _validate=False
             ),
             row=1, col=2
         )
         
         fig.add_trace(
             go.Scatter(
-                y=df['nombre'],
-                x=df['maximo'],
+                y=nombres,
+                x=df['maximo'].to_numpy(dtype=float),
                 mode='markers',
                 name='Máximo',
-                marker=dict(symbol='triangle-right', size=10, color='#6A994E')
+                marker=dict(symbol='triangle-right', size=10, color='#6A994E'),
+                _validate=False
             ),
             row=1, col=2
         )
         
         fig.update_layout(
-            title={
-                'text': 'Estadísticas Generales de Indicadores',
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 16, 'family': 'Arial Black'}
-            },
-            template=self.theme,
+            title_text='Estadísticas Generales de Indicadores',
             height=max(500, top_n * 40),
             showlegend=True
         )
         
-        return fig
+        return fig.to_dict() if como_dict else fig
     
     def _get_color_by_semaforo(self, semaforo: str) -> str:
         """
@@ -516,7 +556,13 @@ class ChartGenerator:
         """
         return COLORS_SEMAFORO.get(semaforo, '#6c757d')
     
-    def guardar_grafico(self, fig: go.Figure, ruta_salida: str, formato: str = 'html'):
+    def guardar_grafico(
+        self,
+        fig: go.Figure,
+        ruta_salida: str,
+        formato: str = 'html',
+        incluir_plotlyjs: str = 'cdn'
+    ):
         """
         Guarda un gráfico en el formato especificado.
         
@@ -524,16 +570,15 @@ class ChartGenerator:
             fig (go.Figure): Figura de Plotly a guardar
             ruta_salida (str): Ruta donde guardar el archivo
             formato (str): Formato de salida ('html', 'png', 'pdf', 'svg')
+            incluir_plotlyjs (str): Origen de plotly.js en HTML: 'cdn' o 'directory'
+                (plotly.min.js junto al archivo, sin conexión)
         """
         try:
             if formato == 'html':
-                fig.write_html(ruta_salida)
-            elif formato in ['png', 'jpg', 'jpeg']:
-                fig.write_image(ruta_salida, format=formato)
-            elif formato == 'pdf':
-                fig.write_image(ruta_salida, format='pdf')
-            elif formato == 'svg':
-                fig.write_image(ruta_salida, format='svg')
+                # plotly.js no se incrusta (~3 MB por archivo); la figura ya fue validada al construirse
+                fig.write_html(ruta_salida, include_plotlyjs=incluir_plotlyjs, full_html=True, validate=False)
+            elif formato in _FORMATOS_IMAGEN:
+                fig.write_image(ruta_salida, format=formato, validate=False)
             else:
                 logger.warning(f"Formato no soportado: {formato}")
                 return
@@ -544,6 +589,141 @@ class ChartGenerator:
             logger.error(f"Error al guardar gráfico: {str(e)}")
 
 
+def construir_tabla_analisis(
+    indicadores_list: List[Dict],
+    analisis_list: List[Dict]
+) -> pd.DataFrame:
+    """
+    Reúne en una sola pasada las columnas de los análisis que usan los gráficos
+    generales (semaforización, comparativo y estadísticas).
+    
+    Hay una fila por análisis, en el mismo orden. Como en el gráfico comparativo,
+    el indicador de cada fila es el de la misma posición en indicadores_list;
+    con_indicador es False en las filas que no tienen uno. Los nombres quedan
+    convertidos a texto, así que los gráficos no necesitan volver a revisarlos.
+    
+    Args:
+        indicadores_list (List[Dict]): Lista de indicadores
+        analisis_list (List[Dict]): Lista de análisis
+        
+    Returns:
+        pd.DataFrame: Columnas nombre, semaforo, promedio, minimo, maximo,
+            desviacion, total_periodos, nombre_indicador, meta y con_indicador
+    """
+    n_pares = min(len(indicadores_list), len(analisis_list))
+    estadisticas = [anal.get('estadisticas', {}) for anal in analisis_list]
+    relleno = [None] * (len(analisis_list) - n_pares)
+    
+    return pd.DataFrame({
+        'nombre': pd.Series([_como_texto(anal.get('nombre', 'Sin nombre')) for anal in analisis_list], dtype=object),
+        'semaforo': pd.Series([anal.get('semaforo', 'Gris') for anal in analisis_list], dtype=object),
+        'promedio': np.array([est.get('promedio', 0) for est in estadisticas], dtype=float),
+        'minimo': np.array([est.get('minimo', 0) for est in estadisticas], dtype=float),
+        'maximo': np.array([est.get('maximo', 0) for est in estadisticas], dtype=float),
+        'desviacion': np.array([est.get('desviacion_estandar', 0) for est in estadisticas], dtype=float),
+        'total_periodos': np.array([est.get('total_periodos', 0) for est in estadisticas], dtype=float),
+        'nombre_indicador': pd.Series(
+            [_como_texto(ind.get('nombre', 'Sin nombre')) for ind in indicadores_list[:n_pares]] + relleno, dtype=object
+        ),
+        'meta': np.array([ind.get('meta', 0) for ind in indicadores_list[:n_pares]] + relleno, dtype=float),
+        'con_indicador': np.arange(len(analisis_list)) < n_pares
+    })
+
+
+def guardar_graficos_concurrente(
+    generator: ChartGenerator,
+    graficos: List[Tuple[go.Figure, str]],
+    max_workers: int = 4,
+    incluir_plotlyjs: str = 'cdn'
+) -> None:
+    """
+    Guarda varios gráficos a la vez usando un pool de hilos.
+    
+    Args:
+        generator (ChartGenerator): Generador usado para guardar cada figura
+        graficos (List[Tuple[go.Figure, str]]): Pares (figura, ruta_salida)
+        max_workers (int): Número máximo de hilos
+        incluir_plotlyjs (str): Origen de plotly.js en los HTML (ver guardar_grafico)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = [
+            executor.submit(generator.guardar_grafico, fig, ruta, 'html', incluir_plotlyjs)
+            for fig, ruta in graficos
+        ]
+        for futuro in futuros:
+            futuro.result()
+
+
+def guardar_imagenes_lote(
+    graficos: List[Tuple[go.Figure, str]],
+    formato: str = 'png'
+) -> None:
+    """
+    Exporta varios gráficos como imagen (png, jpg, pdf, svg) de una sola vez.
+    
+    Con Kaleido 1.x todas las figuras se exportan con pio.write_images, que
+    reutiliza un único navegador en lugar de iniciar uno por figura. Con
+    versiones anteriores se exportan una a una (Kaleido 0.x ya mantiene su
+    proceso abierto entre llamadas).
+    
+    Args:
+        graficos (List[Tuple[go.Figure, str]]): Pares (figura, ruta_salida)
+        formato (str): Formato de salida ('png', 'jpg', 'jpeg', 'pdf', 'svg')
+    """
+    if formato not in _FORMATOS_IMAGEN:
+        logger.warning("Formato no soportado: %s", formato)
+        return
+    if not graficos:
+        return
+    
+    figuras = [fig for fig, _ in graficos]
+    rutas = [ruta for _, ruta in graficos]
+    
+    try:
+        if hasattr(pio, 'write_images'):
+            pio.write_images(figuras, rutas, format=formato, validate=False)
+        else:
+            for fig, ruta in graficos:
+                fig.write_image(ruta, format=formato, validate=False)
+        logger.info("Se exportaron %d gráficos en formato %s", len(rutas), formato)
+    except Exception as e:
+        logger.error("Error al exportar gráficos: %s", e)
+
+
+def _escribir_plotlyjs(directorio: str) -> None:
+    """
+    Copia plotly.min.js al directorio si aún no está. Se hace antes de guardar
+    los HTML en paralelo para que los hilos no escriban el mismo archivo a la vez.
+    
+    Args:
+        directorio (str): Directorio de salida de los gráficos
+    """
+    ruta_bundle = os.path.join(directorio, 'plotly.min.js')
+    if not os.path.exists(ruta_bundle):
+        with open(ruta_bundle, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+
+# Gráficos del tablero: (clave, archivo, construcción a partir del generador, los
+# datos y la tabla de construir_tabla_analisis compartida por los gráficos generales)
+_GRAFICOS_TABLERO = (
+    # 1. Gráfico de semaforización general
+    ('semaforizacion_general', 'semaforizacion_general.html',
+     lambda generator, indicadores, analisis, tabla: generator.grafico_semaforizacion_general(analisis, tabla=tabla)),
+    # 2. Gráfico comparativo
+    ('comparativo', 'comparativo_indicadores.html',
+     lambda generator, indicadores, analisis, tabla: generator.grafico_comparativo_indicadores(
+         indicadores, analisis, top_n=10, tabla=tabla)),
+    # 3. Tendencias múltiples
+    ('tendencias_multiples', 'tendencias_multiples.html',
+     lambda generator, indicadores, analisis, tabla: generator.grafico_tendencias_multiple(indicadores, max_indicadores=5)),
+    # 4. Estadísticas generales
+    ('estadisticas', 'estadisticas_generales.html',
+     lambda generator, indicadores, analisis, tabla: generator.grafico_estadisticas_generales(
+         analisis, top_n=15, tabla=tabla))
+)
+
+
 def generar_todos_graficos(
     indicadores_list: List[Dict],
     analisis_list: List[Dict],
@@ -560,44 +740,115 @@ def generar_todos_graficos(
     Returns:
         Dict[str, str]: Diccionario con rutas de gráficos generados
     """
-    import os
-    
     generator = ChartGenerator()
-    rutas = {}
+    tareas = []  # (clave, figura, ruta)
     
     # Crear directorio si no existe
     os.makedirs(directorio_salida, exist_ok=True)
     
     logger.info(f"Generando gráficos en: {directorio_salida}")
     
-    # 1. Gráfico de semaforización general
-    fig_semaforo = generator.grafico_semaforizacion_general(analisis_list)
-    if fig_semaforo:
-        ruta = os.path.join(directorio_salida, 'semaforizacion_general.html')
-        generator.guardar_grafico(fig_semaforo, ruta)
-        rutas['semaforizacion_general'] = ruta
+    # Columnas de los análisis extraídas una sola vez para todos los gráficos
+    tabla = construir_tabla_analisis(indicadores_list, analisis_list)
     
-    # 2. Gráfico comparativo
-    fig_comp = generator.grafico_comparativo_indicadores(indicadores_list, analisis_list, top_n=10)
-    if fig_comp:
-        ruta = os.path.join(directorio_salida, 'comparativo_indicadores.html')
-        generator.guardar_grafico(fig_comp, ruta)
-        rutas['comparativo'] = ruta
+    for clave, archivo, construir in _GRAFICOS_TABLERO:
+        fig = construir(generator, indicadores_list, analisis_list, tabla)
+        if fig:
+            tareas.append((clave, fig, os.path.join(directorio_salida, archivo)))
     
-    # 3. Tendencias múltiples
-    fig_tend = generator.grafico_tendencias_multiple(indicadores_list, max_indicadores=5)
-    if fig_tend:
-        ruta = os.path.join(directorio_salida, 'tendencias_multiples.html')
-        generator.guardar_grafico(fig_tend, ruta)
-        rutas['tendencias_multiples'] = ruta
+    # plotly.min.js se escribe una sola vez en el directorio y todos los HTML lo
+    # comparten (funcionan sin conexión y el navegador lo guarda en caché)
+    _escribir_plotlyjs(directorio_salida)
     
-    # 4. Estadísticas generales
-    fig_stats = generator.grafico_estadisticas_generales(analisis_list, top_n=15)
-    if fig_stats:
-        ruta = os.path.join(directorio_salida, 'estadisticas_generales.html')
-        generator.guardar_grafico(fig_stats, ruta)
-        rutas['estadisticas'] = ruta
+    # Guardar en paralelo: la serialización de una figura se solapa con la escritura de otra
+    guardar_graficos_concurrente(
+        generator,
+        [(fig, ruta) for _, fig, ruta in tareas],
+        incluir_plotlyjs='directory'
+    )
+    
+    rutas = {clave: ruta for clave, _, ruta in tareas}
     
     logger.info(f"Se generaron {len(rutas)} gráficos")
     
     return rutas
+
+
+def _generar_grafico_tablero(
+    indice: int,
+    indicadores_list: List[Dict],
+    analisis_list: List[Dict],
+    tabla: pd.DataFrame,
+    directorio_salida: str
+) -> Optional[str]:
+    """
+    Construye y guarda un gráfico del tablero dentro de un proceso trabajador.
+    
+    Args:
+        indice (int): Posición del gráfico en _GRAFICOS_TABLERO
+        indicadores_list (List[Dict]): Lista de indicadores
+        analisis_list (List[Dict]): Lista de análisis
+        tabla (pd.DataFrame): Tabla de construir_tabla_analisis de las listas
+        directorio_salida (str): Directorio donde guardar el gráfico
+        
+    Returns:
+        Optional[str]: Ruta del archivo guardado, o None si no hubo datos
+    """
+    _, archivo, construir = _GRAFICOS_TABLERO[indice]
+    generator = ChartGenerator()
+    
+    fig = construir(generator, indicadores_list, analisis_list, tabla)
+    if not fig:
+        return None
+    
+    ruta = os.path.join(directorio_salida, archivo)
+    generator.guardar_grafico(fig, ruta, incluir_plotlyjs='directory')
+    return ruta
+
+
+def generar_todos_graficos_parallel(
+    indicadores_list: List[Dict],
+    analisis_list: List[Dict],
+    directorio_salida: str,
+    workers: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Genera todos los gráficos del tablero repartiéndolos entre varios procesos.
+    
+    Cada proceso construye y guarda su propio gráfico y solo devuelve la ruta,
+    así que las figuras no viajan entre procesos. Los archivos y el resultado
+    son los mismos que los de generar_todos_graficos.
+    
+    Args:
+        indicadores_list (List[Dict]): Lista de indicadores
+        analisis_list (List[Dict]): Lista de análisis
+        directorio_salida (str): Directorio donde guardar los gráficos
+        workers (int, optional): Número de procesos (por defecto, núcleos disponibles)
+        
+    Returns:
+        Dict[str, str]: Diccionario con rutas de gráficos generados
+    """
+    workers = min(workers or os.cpu_count() or 1, len(_GRAFICOS_TABLERO))
+    
+    os.makedirs(directorio_salida, exist_ok=True)
+    _escribir_plotlyjs(directorio_salida)
+    
+    logger.info("Generando gráficos en: %s (%d procesos)", directorio_salida, workers)
+    
+    # La tabla compartida se arma una vez aquí y viaja a cada proceso
+    tabla = construir_tabla_analisis(indicadores_list, analisis_list)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = [
+            executor.submit(_generar_grafico_tablero, indice, indicadores_list, analisis_list, tabla, directorio_salida)
+            for indice in range(len(_GRAFICOS_TABLERO))
+        ]
+        rutas = {
+            clave: ruta
+            for (clave, _, _), ruta in zip(_GRAFICOS_TABLERO, (futuro.result() for futuro in futuros))
+            if ruta
+        }
+    
+    logger.info("Se generaron %d gráficos", len(rutas))
+    
+    return rutas